@@ -0,0 +1,40 @@
+"""add member_performance_summary table
+
+Revision ID: 20261017100000
+Revises: 20260306203000
+Create Date: 2026-10-17 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = '20261017100000'
+down_revision = '20260306203000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """创建会员业绩聚合表（由 PerformanceService 增量刷新）"""
+    op.create_table(
+        'member_performance_summary',
+        sa.Column('member_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('export_amount', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('total_investment', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('patent_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('latest_revenue', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['member_id'], ['members.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('member_id'),
+    )
+    op.create_index('idx_member_perf_summary_investment', 'member_performance_summary', ['total_investment'])
+    op.create_index('idx_member_perf_summary_patents', 'member_performance_summary', ['patent_count'])
+
+
+def downgrade() -> None:
+    """删除会员业绩聚合表"""
+    op.drop_index('idx_member_perf_summary_patents', table_name='member_performance_summary')
+    op.drop_index('idx_member_perf_summary_investment', table_name='member_performance_summary')
+    op.drop_table('member_performance_summary')
@@ -0,0 +1,83 @@
+"""add member_statistics view
+
+Revision ID: 20261017110000
+Revises: 20261017100000
+Create Date: 2026-10-17 11:00:00
+
+"""
+from alembic import op
+
+
+revision = '20261017110000'
+down_revision = '20261017100000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """创建企业统计视图：members + 业绩聚合，供统计报表在数据库层筛选/排序/分页
+
+    - security_invoker: 以调用者权限执行，保持与直接查询 members 相同的 RLS 语义
+    - 不包含 password_hash / reset_token 等敏感字段
+    - 没有业绩聚合记录的会员按 0 处理
+    """
+    op.execute("""
+        CREATE OR REPLACE VIEW member_statistics
+        WITH (security_invoker = true) AS
+        SELECT
+            m.id,
+            m.business_number,
+            m.company_name,
+            m.email,
+            m.status,
+            m.approval_status,
+            m.industry,
+            m.revenue,
+            m.employee_count,
+            m.founding_date,
+            m.region,
+            m.address,
+            m.representative,
+            m.representative_birth_date,
+            m.representative_gender,
+            m.representative_phone,
+            m.legal_number,
+            m.phone,
+            m.website,
+            m.logo_url,
+            m.contact_person_name,
+            m.contact_person_department,
+            m.contact_person_position,
+            m.contact_person_phone,
+            m.main_business,
+            m.description,
+            m.cooperation_fields,
+            m.startup_type,
+            m.startup_stage,
+            m.ksic_major,
+            m.ksic_sub,
+            m.category,
+            m.business_field,
+            m.main_industry_ksic_major,
+            m.main_industry_ksic_codes,
+            m.gangwon_industry,
+            m.future_tech,
+            m.participation_programs,
+            m.investment_status,
+            m.deleted_at,
+            m.created_at,
+            m.updated_at,
+            COALESCE(s.export_amount, 0) AS export_amount,
+            COALESCE(s.total_investment, 0) AS total_investment,
+            COALESCE(s.patent_count, 0) AS patent_count,
+            COALESCE(s.latest_revenue, 0) AS latest_revenue
+        FROM members m
+        LEFT JOIN member_performance_summary s ON s.member_id = m.id
+    """)
+    # 刷新 PostgREST schema cache，使视图可以通过 Supabase API 访问
+    op.execute("NOTIFY pgrst, 'reload schema'")
+
+
+def downgrade() -> None:
+    """删除企业统计视图"""
+    op.execute("DROP VIEW IF EXISTS member_statistics")
@@ -0,0 +1,121 @@
+"""add indexed tag arrays for member JSON-text tag columns
+
+Revision ID: 20261017120000
+Revises: 20261017110000
+Create Date: 2026-10-17 12:00:00
+
+"""
+from alembic import op
+
+
+revision = '20261017120000'
+down_revision = '20261017110000'
+branch_labels = None
+depends_on = None
+
+
+# JSON 文本列 -> 生成的 text[] 列
+TAG_COLUMNS = {
+    'participation_programs': 'participation_programs_tags',
+    'cooperation_fields': 'cooperation_fields_tags',
+    'main_industry_ksic_codes': 'main_industry_ksic_codes_tags',
+}
+
+# member_statistics 视图中的 members 字段（与 20261017110000 保持一致）
+VIEW_MEMBER_COLUMNS = [
+    'id', 'business_number', 'company_name', 'email', 'status', 'approval_status',
+    'industry', 'revenue', 'employee_count', 'founding_date', 'region', 'address',
+    'representative', 'representative_birth_date', 'representative_gender',
+    'representative_phone', 'legal_number', 'phone', 'website', 'logo_url',
+    'contact_person_name', 'contact_person_department', 'contact_person_position',
+    'contact_person_phone', 'main_business', 'description', 'cooperation_fields',
+    'startup_type', 'startup_stage', 'ksic_major', 'ksic_sub', 'category',
+    'business_field', 'main_industry_ksic_major', 'main_industry_ksic_codes',
+    'gangwon_industry', 'future_tech', 'participation_programs', 'investment_status',
+    'deleted_at', 'created_at', 'updated_at',
+]
+
+
+def _create_statistics_view(tag_columns) -> None:
+    """创建 member_statistics 视图（tag 数组列追加在末尾）"""
+    member_columns = ",\n            ".join(f"m.{col}" for col in VIEW_MEMBER_COLUMNS)
+    tag_select = "".join(f",\n            m.{col}" for col in tag_columns)
+    op.execute(f"""
+        CREATE OR REPLACE VIEW member_statistics
+        WITH (security_invoker = true) AS
+        SELECT
+            {member_columns},
+            COALESCE(s.export_amount, 0) AS export_amount,
+            COALESCE(s.total_investment, 0) AS total_investment,
+            COALESCE(s.patent_count, 0) AS patent_count,
+            COALESCE(s.latest_revenue, 0) AS latest_revenue{tag_select}
+        FROM members m
+        LEFT JOIN member_performance_summary s ON s.member_id = m.id
+    """)
+
+
+def upgrade() -> None:
+    """为标签类 JSON 文本列增加 text[] 生成列和 GIN 索引
+
+    原列仍以 JSON 数组字符串存储（API 和前端契约不变），数据库自动维护
+    对应的 text[] 列，统计筛选改用数组重叠/包含操作符，可以走 GIN 索引，
+    也不会再出现 like '*tag*' 的子串误匹配。
+    """
+    # 兼容历史数据的多种格式：JSON 数组字符串、逗号分隔字符串、单个值
+    op.execute("""
+        CREATE OR REPLACE FUNCTION parse_tag_list(value text)
+        RETURNS text[]
+        LANGUAGE plpgsql
+        IMMUTABLE
+        AS $$
+        BEGIN
+            IF value IS NULL OR btrim(value) = '' THEN
+                RETURN '{}'::text[];
+            END IF;
+            IF left(btrim(value), 1) = '[' THEN
+                BEGIN
+                    RETURN COALESCE(
+                        ARRAY(SELECT jsonb_array_elements_text(value::jsonb)),
+                        '{}'::text[]
+                    );
+                EXCEPTION WHEN others THEN
+                    -- JSON 格式错误时按普通字符串处理
+                    NULL;
+                END;
+            END IF;
+            RETURN COALESCE(
+                ARRAY(
+                    SELECT btrim(item)
+                    FROM unnest(string_to_array(value, ',')) AS item
+                    WHERE btrim(item) <> ''
+                ),
+                '{}'::text[]
+            );
+        END;
+        $$
+    """)
+
+    for source, target in TAG_COLUMNS.items():
+        op.execute(f"""
+            ALTER TABLE members
+            ADD COLUMN IF NOT EXISTS {target} text[]
+            GENERATED ALWAYS AS (parse_tag_list({source})) STORED
+        """)
+        op.execute(f"CREATE INDEX IF NOT EXISTS idx_members_{target} ON members USING GIN ({target})")
+
+    _create_statistics_view(TAG_COLUMNS.values())
+    # 刷新 PostgREST schema cache
+    op.execute("NOTIFY pgrst, 'reload schema'")
+
+
+def downgrade() -> None:
+    """移除 tag 数组列，恢复原视图"""
+    # CREATE OR REPLACE VIEW 不能删除列，需要先删除视图
+    op.execute("DROP VIEW IF EXISTS member_statistics")
+    _create_statistics_view([])
+
+    for target in TAG_COLUMNS.values():
+        op.execute(f"DROP INDEX IF EXISTS idx_members_{target}")
+        op.execute(f"ALTER TABLE members DROP COLUMN IF EXISTS {target}")
+    op.execute("DROP FUNCTION IF EXISTS parse_tag_list(text)")
+    op.execute("NOTIFY pgrst, 'reload schema'")
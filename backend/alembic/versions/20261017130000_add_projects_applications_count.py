@@ -0,0 +1,136 @@
+"""add denormalized projects.applications_count maintained by trigger
+
+Revision ID: 20261017130000
+Revises: 20261017120000
+Create Date: 2026-10-17 13:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261017130000'
+down_revision = '20261017120000'
+branch_labels = None
+depends_on = None
+
+
+def _restrict_execute(signature: str, backend: bool = False) -> None:
+    """撤销 PUBLIC / anon / authenticated 的执行权限（PostgREST 不再将其暴露为 /rpc），
+    backend=True 时只授权给后端使用的 service_role"""
+    op.execute(f"""
+        DO $$
+        DECLARE
+            r text;
+        BEGIN
+            REVOKE EXECUTE ON FUNCTION {signature} FROM PUBLIC;
+            FOREACH r IN ARRAY ARRAY['anon', 'authenticated'] LOOP
+                IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = r) THEN
+                    EXECUTE format('REVOKE EXECUTE ON FUNCTION {signature} FROM %I', r);
+                END IF;
+            END LOOP;
+            IF {'true' if backend else 'false'} AND EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'service_role') THEN
+                GRANT EXECUTE ON FUNCTION {signature} TO service_role;
+            END IF;
+        END
+        $$
+    """)
+
+
+def upgrade() -> None:
+    """projects.applications_count：未删除的申请数，由触发器在写入时维护
+
+    - INSERT / DELETE 以及 project_id、deleted_at 变化时增减计数，
+      与申请写入处于同一事务
+    - refresh_project_applications_count() 用于回填和修复计数
+    """
+    op.add_column(
+        'projects',
+        sa.Column('applications_count', sa.Integer(), nullable=False, server_default='0')
+    )
+
+    # 修复/回填函数：p_project_id 为空时重算全部项目，返回实际被修正的项目数
+    op.execute("""
+        CREATE OR REPLACE FUNCTION refresh_project_applications_count(p_project_id uuid DEFAULT NULL)
+        RETURNS integer
+        LANGUAGE plpgsql
+        SECURITY DEFINER
+        SET search_path = public
+        AS $$
+        DECLARE
+            fixed integer;
+        BEGIN
+            UPDATE projects p
+            SET applications_count = c.cnt
+            FROM (
+                SELECT pr.id, COUNT(pa.id)::integer AS cnt
+                FROM projects pr
+                LEFT JOIN project_applications pa
+                    ON pa.project_id = pr.id AND pa.deleted_at IS NULL
+                WHERE p_project_id IS NULL OR pr.id = p_project_id
+                GROUP BY pr.id
+            ) c
+            WHERE p.id = c.id AND p.applications_count IS DISTINCT FROM c.cnt;
+
+            GET DIAGNOSTICS fixed = ROW_COUNT;
+            RETURN fixed;
+        END;
+        $$
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION project_applications_count_trigger()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        SECURITY DEFINER
+        SET search_path = public
+        AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.deleted_at IS NULL THEN
+                UPDATE projects
+                SET applications_count = GREATEST(applications_count - 1, 0)
+                WHERE id = OLD.project_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.deleted_at IS NULL THEN
+                UPDATE projects
+                SET applications_count = applications_count + 1
+                WHERE id = NEW.project_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$
+    """)
+
+    op.execute("""
+        CREATE TRIGGER trg_project_applications_count_insert_delete
+        AFTER INSERT OR DELETE ON project_applications
+        FOR EACH ROW EXECUTE FUNCTION project_applications_count_trigger()
+    """)
+    # 状态等其他字段更新不影响计数，只在 project_id / deleted_at 变化时触发
+    op.execute("""
+        CREATE TRIGGER trg_project_applications_count_update
+        AFTER UPDATE OF project_id, deleted_at ON project_applications
+        FOR EACH ROW
+        WHEN (OLD.project_id IS DISTINCT FROM NEW.project_id
+              OR OLD.deleted_at IS DISTINCT FROM NEW.deleted_at)
+        EXECUTE FUNCTION project_applications_count_trigger()
+    """)
+
+    # 只有后端（service_role）可以调用修复函数，触发器函数不对 API 暴露
+    _restrict_execute('refresh_project_applications_count(uuid)', backend=True)
+    _restrict_execute('project_applications_count_trigger()')
+
+    # 回填现有数据
+    op.execute("SELECT refresh_project_applications_count()")
+    # 刷新 PostgREST schema cache
+    op.execute("NOTIFY pgrst, 'reload schema'")
+
+
+def downgrade() -> None:
+    """删除触发器、函数和计数列"""
+    op.execute("DROP TRIGGER IF EXISTS trg_project_applications_count_update ON project_applications")
+    op.execute("DROP TRIGGER IF EXISTS trg_project_applications_count_insert_delete ON project_applications")
+    op.execute("DROP FUNCTION IF EXISTS project_applications_count_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_project_applications_count(uuid)")
+    op.drop_column('projects', 'applications_count')
+    op.execute("NOTIFY pgrst, 'reload schema'")
@@ -0,0 +1,154 @@
+"""add get_dashboard_performance_stats() for server-side dashboard aggregation
+
+Revision ID: 20261017140000
+Revises: 20261017130000
+Create Date: 2026-10-17 14:00:00
+
+"""
+from alembic import op
+
+
+revision = '20261017140000'
+down_revision = '20261017130000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """仪表板业绩汇总改为数据库聚合
+
+    与原 DashboardService 的 Python 逻辑保持一致：
+    - 销售额：salesRevenue / revenue / totalSales / sales 中第一个“真值”字段，数值才计入
+    - 雇佣：newHires / employment / employeeCount / newEmployees 同上，取整
+    - 知识产权：intellectualProperty / ip 中第一个“真值”字段，数组取长度、数值取整
+    - 图表：按 (year, quarter) 分组，会员数为去重的 member_id
+    """
+    # 与 Python `a or b or c` 相同的取值规则：null/false/0/""/[]/{} 视为假值
+    op.execute("""
+        CREATE OR REPLACE FUNCTION jsonb_first_truthy(data jsonb, keys text[])
+        RETURNS jsonb
+        LANGUAGE plpgsql
+        IMMUTABLE
+        AS $$
+        DECLARE
+            k text;
+            v jsonb;
+        BEGIN
+            IF data IS NULL OR jsonb_typeof(data) <> 'object' THEN
+                RETURN NULL;
+            END IF;
+            FOREACH k IN ARRAY keys LOOP
+                v := data -> k;
+                IF v IS NULL THEN
+                    CONTINUE;
+                END IF;
+                CASE jsonb_typeof(v)
+                    WHEN 'boolean' THEN
+                        IF v = 'true'::jsonb THEN RETURN v; END IF;
+                    WHEN 'number' THEN
+                        IF (v #>> '{}')::numeric <> 0 THEN RETURN v; END IF;
+                    WHEN 'string' THEN
+                        IF (v #>> '{}') <> '' THEN RETURN v; END IF;
+                    WHEN 'array' THEN
+                        IF jsonb_array_length(v) > 0 THEN RETURN v; END IF;
+                    WHEN 'object' THEN
+                        IF v <> '{}'::jsonb THEN RETURN v; END IF;
+                    ELSE
+                        NULL;
+                END CASE;
+            END LOOP;
+            RETURN NULL;
+        END;
+        $$
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION get_dashboard_performance_stats(
+            p_year integer DEFAULT NULL,
+            p_quarter integer DEFAULT NULL
+        )
+        RETURNS jsonb
+        LANGUAGE sql
+        STABLE
+        AS $$
+            WITH picked AS (
+                SELECT
+                    year,
+                    quarter,
+                    member_id,
+                    CASE WHEN type = 'sales' THEN jsonb_first_truthy(
+                        data_json, ARRAY['salesRevenue', 'revenue', 'totalSales', 'sales']
+                    ) END AS sales_value,
+                    CASE WHEN type = 'support' THEN jsonb_first_truthy(
+                        data_json, ARRAY['newHires', 'employment', 'employeeCount', 'newEmployees']
+                    ) END AS employment_value,
+                    CASE WHEN type = 'ip' THEN jsonb_first_truthy(
+                        data_json, ARRAY['intellectualProperty', 'ip']
+                    ) END AS ip_value
+                FROM performance_records
+                WHERE status = 'approved'
+                  AND deleted_at IS NULL
+                  AND (p_year IS NULL OR year = p_year)
+                  AND (p_quarter IS NULL OR quarter = p_quarter)
+            ),
+            records AS (
+                SELECT
+                    year,
+                    quarter,
+                    member_id,
+                    CASE WHEN jsonb_typeof(sales_value) = 'number'
+                        THEN (sales_value #>> '{}')::numeric ELSE 0 END AS sales,
+                    CASE WHEN jsonb_typeof(employment_value) = 'number'
+                        THEN trunc((employment_value #>> '{}')::numeric) ELSE 0 END AS employment,
+                    CASE jsonb_typeof(ip_value)
+                        WHEN 'array' THEN jsonb_array_length(ip_value)
+                        WHEN 'number' THEN trunc((ip_value #>> '{}')::numeric)
+                        ELSE 0 END AS ip
+                FROM picked
+            ),
+            periods AS (
+                SELECT
+                    year,
+                    quarter,
+                    COUNT(DISTINCT member_id) AS members,
+                    SUM(sales) AS sales,
+                    SUM(employment) AS employment
+                FROM records
+                GROUP BY year, quarter
+            )
+            SELECT jsonb_build_object(
+                'total_sales', (SELECT COALESCE(SUM(sales), 0) FROM records),
+                'total_employment', (SELECT COALESCE(SUM(employment), 0) FROM records),
+                'total_ip', (SELECT COALESCE(SUM(ip), 0) FROM records),
+                'series', COALESCE(
+                    (SELECT jsonb_agg(
+                        jsonb_build_object(
+                            'year', year,
+                            'quarter', quarter,
+                            'members', members,
+                            'sales', sales,
+                            'employment', employment
+                        ) ORDER BY year, COALESCE(quarter, 999)
+                    ) FROM periods),
+                    '[]'::jsonb
+                )
+            )
+        $$
+    """)
+
+    # 已批准记录按期间定位
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_performance_records_approved_period
+        ON performance_records (year, quarter)
+        WHERE status = 'approved' AND deleted_at IS NULL
+    """)
+    # 刷新 PostgREST schema cache，使 RPC 可以通过 Supabase API 调用
+    op.execute("NOTIFY pgrst, 'reload schema'")
+
+
+def downgrade() -> None:
+    """删除仪表板聚合函数"""
+    op.execute("DROP INDEX IF EXISTS idx_performance_records_approved_period")
+    op.execute("DROP FUNCTION IF EXISTS get_dashboard_performance_stats(integer, integer)")
+    op.execute("DROP FUNCTION IF EXISTS jsonb_first_truthy(jsonb, text[])")
+    op.execute("NOTIFY pgrst, 'reload schema'")
@@ -0,0 +1,260 @@
+"""add message_unread_counts maintained by trigger
+
+Revision ID: 20261017150000
+Revises: 20261017140000
+Create Date: 2026-10-17 15:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261017150000'
+down_revision = '20261017140000'
+branch_labels = None
+depends_on = None
+
+
+def _restrict_execute(signature: str, backend: bool = False) -> None:
+    """撤销 PUBLIC / anon / authenticated 的执行权限（PostgREST 不再将其暴露为 /rpc），
+    backend=True 时只授权给后端使用的 service_role"""
+    op.execute(f"""
+        DO $$
+        DECLARE
+            r text;
+        BEGIN
+            REVOKE EXECUTE ON FUNCTION {signature} FROM PUBLIC;
+            FOREACH r IN ARRAY ARRAY['anon', 'authenticated'] LOOP
+                IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = r) THEN
+                    EXECUTE format('REVOKE EXECUTE ON FUNCTION {signature} FROM %I', r);
+                END IF;
+            END LOOP;
+            IF {'true' if backend else 'false'} AND EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'service_role') THEN
+                GRANT EXECUTE ON FUNCTION {signature} TO service_role;
+            END IF;
+        END
+        $$
+    """)
+
+
+def upgrade() -> None:
+    """message_unread_counts：每个收件方一行未读数，由 messages 触发器在写入时维护
+
+    计数口径与原 get_unread_count 的多次查询一致：
+    - <user_id>：发给该用户的未读直接消息 + 该会员所发起线程中管理员的未读回复
+    - admin:threads：所有线程中会员发送的未读消息（管理员共享）
+
+    - INSERT / DELETE 以及 is_read、类型、线程、发送方、收件人变化时增减计数，
+      与消息写入处于同一事务；触发器只维护计数，不修改 messages
+    - refresh_message_unread_counts() 用于回填和修复计数
+    """
+    op.create_table(
+        'message_unread_counts',
+        sa.Column('owner_key', sa.String(64), nullable=False),
+        sa.Column('unread_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('owner_key'),
+    )
+
+    # 一条消息计入哪些计数行（直接消息的收件人、线程回复的对方）
+    # 只由触发器调用（以触发器函数所有者身份执行），不需要 SECURITY DEFINER
+    op.execute("""
+        CREATE OR REPLACE FUNCTION message_unread_keys(
+            p_message_type text, p_thread_id uuid, p_sender_type text, p_recipient_id uuid
+        )
+        RETURNS text[]
+        LANGUAGE plpgsql
+        STABLE
+        SET search_path = public
+        AS $$
+        DECLARE
+            keys text[] := '{}';
+            owner_id uuid;
+        BEGIN
+            IF p_message_type = 'direct' AND p_recipient_id IS NOT NULL THEN
+                keys := keys || p_recipient_id::text;
+            END IF;
+            IF p_thread_id IS NOT NULL THEN
+                IF p_sender_type = 'member' THEN
+                    keys := keys || 'admin:threads'::text;
+                ELSIF p_sender_type = 'admin' THEN
+                    SELECT sender_id INTO owner_id
+                    FROM messages
+                    WHERE id = p_thread_id AND thread_id IS NULL AND message_type = 'thread';
+                    IF owner_id IS NOT NULL THEN
+                        keys := keys || owner_id::text;
+                    END IF;
+                END IF;
+            END IF;
+            RETURN keys;
+        END;
+        $$
+    """)
+
+    # 修复/回填函数：按消息表重算全部计数，返回实际被修正的行数
+    op.execute("""
+        CREATE OR REPLACE FUNCTION refresh_message_unread_counts()
+        RETURNS integer
+        LANGUAGE plpgsql
+        SECURITY DEFINER
+        SET search_path = public
+        AS $$
+        DECLARE
+            fixed integer;
+            zeroed integer;
+        BEGIN
+            CREATE TEMP TABLE _unread ON COMMIT DROP AS
+            SELECT owner_key, SUM(cnt)::integer AS cnt
+            FROM (
+                SELECT m.recipient_id::text AS owner_key, COUNT(*) AS cnt
+                FROM messages m
+                WHERE m.message_type = 'direct' AND m.recipient_id IS NOT NULL AND NOT m.is_read
+                GROUP BY m.recipient_id
+                UNION ALL
+                SELECT 'admin:threads', COUNT(*)
+                FROM messages m
+                WHERE m.thread_id IS NOT NULL AND m.sender_type = 'member' AND NOT m.is_read
+                UNION ALL
+                SELECT t.sender_id::text, COUNT(*)
+                FROM messages m
+                JOIN messages t
+                    ON t.id = m.thread_id AND t.thread_id IS NULL AND t.message_type = 'thread'
+                WHERE m.sender_type = 'admin' AND NOT m.is_read AND t.sender_id IS NOT NULL
+                GROUP BY t.sender_id
+            ) c
+            GROUP BY owner_key;
+
+            INSERT INTO message_unread_counts AS u (owner_key, unread_count)
+            SELECT owner_key, cnt FROM _unread
+            ON CONFLICT (owner_key) DO UPDATE
+            SET unread_count = EXCLUDED.unread_count, updated_at = now()
+            WHERE u.unread_count IS DISTINCT FROM EXCLUDED.unread_count;
+            GET DIAGNOSTICS fixed = ROW_COUNT;
+
+            UPDATE message_unread_counts u
+            SET unread_count = 0, updated_at = now()
+            WHERE u.unread_count <> 0
+              AND NOT EXISTS (SELECT 1 FROM _unread c WHERE c.owner_key = u.owner_key);
+            GET DIAGNOSTICS zeroed = ROW_COUNT;
+
+            DROP TABLE _unread;
+            RETURN fixed + zeroed;
+        END;
+        $$
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION message_unread_counts_trigger()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        SECURITY DEFINER
+        SET search_path = public
+        AS $$
+        DECLARE
+            k text;
+        BEGIN
+            -- 不截断到 0：计数为负说明存在漂移，需要 refresh_message_unread_counts() 修复
+            IF TG_OP = 'UPDATE' AND NOT OLD.is_read THEN
+                FOREACH k IN ARRAY message_unread_keys(OLD.message_type, OLD.thread_id, OLD.sender_type, OLD.recipient_id) LOOP
+                    UPDATE message_unread_counts
+                    SET unread_count = unread_count - 1, updated_at = now()
+                    WHERE owner_key = k;
+                END LOOP;
+            END IF;
+            IF NOT NEW.is_read THEN
+                FOREACH k IN ARRAY message_unread_keys(NEW.message_type, NEW.thread_id, NEW.sender_type, NEW.recipient_id) LOOP
+                    INSERT INTO message_unread_counts AS u (owner_key, unread_count)
+                    VALUES (k, 1)
+                    ON CONFLICT (owner_key) DO UPDATE
+                    SET unread_count = u.unread_count + 1, updated_at = now();
+                END LOOP;
+            END IF;
+            RETURN NULL;
+        END;
+        $$
+    """)
+
+    # 删除在 BEFORE 触发器中扣减：此时线程根消息仍然存在，管理员回复能找到所属会员。
+    # 删除线程根消息时回复保留（messages.thread_id 没有外键级联），但不再属于任何会员，
+    # 按原多次查询的口径从该会员的计数中扣除这些未读管理员回复；之后这些回复的
+    # 已读/删除找不到所属会员，不会重复扣减。同一语句中先于根消息删除的回复
+    # 已由自身的触发器扣减，不会被再次统计。
+    op.execute("""
+        CREATE OR REPLACE FUNCTION message_unread_counts_delete_trigger()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        SECURITY DEFINER
+        SET search_path = public
+        AS $$
+        DECLARE
+            k text;
+            orphaned integer;
+        BEGIN
+            IF OLD.thread_id IS NULL AND OLD.message_type = 'thread' AND OLD.sender_id IS NOT NULL THEN
+                SELECT COUNT(*) INTO orphaned
+                FROM messages
+                WHERE thread_id = OLD.id AND sender_type = 'admin' AND NOT is_read;
+                IF orphaned > 0 THEN
+                    UPDATE message_unread_counts
+                    SET unread_count = unread_count - orphaned, updated_at = now()
+                    WHERE owner_key = OLD.sender_id::text;
+                END IF;
+            END IF;
+            IF NOT OLD.is_read THEN
+                FOREACH k IN ARRAY message_unread_keys(OLD.message_type, OLD.thread_id, OLD.sender_type, OLD.recipient_id) LOOP
+                    UPDATE message_unread_counts
+                    SET unread_count = unread_count - 1, updated_at = now()
+                    WHERE owner_key = k;
+                END LOOP;
+            END IF;
+            RETURN OLD;
+        END;
+        $$
+    """)
+
+    op.execute("""
+        CREATE TRIGGER trg_message_unread_counts_insert
+        AFTER INSERT ON messages
+        FOR EACH ROW EXECUTE FUNCTION message_unread_counts_trigger()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_message_unread_counts_delete
+        BEFORE DELETE ON messages
+        FOR EACH ROW EXECUTE FUNCTION message_unread_counts_delete_trigger()
+    """)
+    # 内容、read_at 等其他字段更新不影响计数
+    op.execute("""
+        CREATE TRIGGER trg_message_unread_counts_update
+        AFTER UPDATE OF is_read, message_type, thread_id, sender_type, recipient_id ON messages
+        FOR EACH ROW
+        WHEN (OLD.is_read IS DISTINCT FROM NEW.is_read
+              OR OLD.message_type IS DISTINCT FROM NEW.message_type
+              OR OLD.thread_id IS DISTINCT FROM NEW.thread_id
+              OR OLD.sender_type IS DISTINCT FROM NEW.sender_type
+              OR OLD.recipient_id IS DISTINCT FROM NEW.recipient_id)
+        EXECUTE FUNCTION message_unread_counts_trigger()
+    """)
+
+    # 只有后端（service_role）可以调用修复函数，其余函数不对 API 暴露
+    _restrict_execute('message_unread_keys(text, uuid, text, uuid)')
+    _restrict_execute('refresh_message_unread_counts()', backend=True)
+    _restrict_execute('message_unread_counts_trigger()')
+    _restrict_execute('message_unread_counts_delete_trigger()')
+
+    # 回填现有数据
+    op.execute("SELECT refresh_message_unread_counts()")
+    # 刷新 PostgREST schema cache
+    op.execute("NOTIFY pgrst, 'reload schema'")
+
+
+def downgrade() -> None:
+    """删除触发器、函数和计数表"""
+    op.execute("DROP TRIGGER IF EXISTS trg_message_unread_counts_update ON messages")
+    op.execute("DROP TRIGGER IF EXISTS trg_message_unread_counts_delete ON messages")
+    op.execute("DROP TRIGGER IF EXISTS trg_message_unread_counts_insert ON messages")
+    op.execute("DROP FUNCTION IF EXISTS message_unread_counts_delete_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS message_unread_counts_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_message_unread_counts()")
+    op.execute("DROP FUNCTION IF EXISTS message_unread_keys(text, uuid, text, uuid)")
+    op.drop_table('message_unread_counts')
+    op.execute("NOTIFY pgrst, 'reload schema'")
@@ -0,0 +1,92 @@
+"""
+文件日志写入吞吐基准 (FileLogWriter)
+
+将日志写入临时目录（不影响 backend/logs），分别测量：
+    1. 纯写入线程吞吐：预先格式化好的行直接入队
+    2. 端到端吞吐：AppLogCreate schema -> write() -> 文件
+
+    cd backend
+    uv run python scripts/benchmark_file_log_writer.py --lines 200000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# 加载环境变量（必须在导入 settings 之前）
+env_path = os.path.join(os.path.dirname(__file__), '..', '.env.local')
+load_dotenv(env_path)
+
+
+def run_writer_only(writer, target: Path, lines: int) -> float:
+    """纯写入线程吞吐（行/秒）"""
+    entry = '{"timestamp": "2025-01-01 00:00:00.000", "level": "INFO", "message": "' + "x" * 120 + '"}'
+    start = time.perf_counter()
+    for _ in range(lines):
+        # 阻塞入队，避免队列满时丢弃导致结果虚高
+        writer.log_queue.put((target, entry))
+    writer.log_queue.join()
+    return lines / (time.perf_counter() - start)
+
+
+def run_end_to_end(writer, lines: int) -> float:
+    """schema 格式化 + 入队 + 写入的端到端吞吐（行/秒）"""
+    from src.common.modules.logger.schemas import AppLogCreate
+
+    start = time.perf_counter()
+    for i in range(lines):
+        writer.write(
+            AppLogCreate(
+                source="backend",
+                level="INFO",
+                message=f"benchmark line {i}",
+                layer="Service",
+                module="scripts.benchmark_file_log_writer",
+                function="run_end_to_end",
+                line_number=1,
+            ),
+            "app",
+        )
+        # 队列接近上限时让写入线程追上，避免丢弃
+        if writer.log_queue.qsize() > writer.log_queue.maxsize // 2:
+            writer.log_queue.join()
+    writer.log_queue.join()
+    return lines / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="FileLogWriter throughput benchmark")
+    parser.add_argument("--lines", type=int, default=200000, help="每项测试写入的行数")
+    args = parser.parse_args()
+
+    from src.common.modules.logger.file_writer import file_log_writer
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        # 重定向到临时目录
+        file_log_writer.application_logs_file = tmp_dir / "app.log"
+
+        print("=" * 80)
+        print("📝 FileLogWriter 吞吐基准")
+        print(f"   batch_size={file_log_writer.write_batch_size}, fsync_interval={file_log_writer.fsync_interval}s")
+        print("=" * 80)
+
+        writer_only = run_writer_only(file_log_writer, tmp_dir / "bench.log", args.lines)
+        print(f"\n写入线程吞吐:   {writer_only:,.0f} 行/秒")
+
+        end_to_end = run_end_to_end(file_log_writer, args.lines)
+        print(f"端到端吞吐:     {end_to_end:,.0f} 行/秒")
+
+        print(f"\n统计: {file_log_writer.get_stats()}")
+        file_log_writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+HTTP 中间件吞吐基准 (HTTPLoggingMiddleware + ExceptionMiddleware)
+
+在本地测试应用上（不启动服务器，不连接数据库）通过 ASGI 直接发送请求，
+测量每秒请求数：
+    1. bare:    无中间件
+    2. logging: setup_interceptors 使用的中间件组合（异常 + HTTP 日志）
+    3. stream:  logging 组合下的流式响应（验证逐块透传）
+
+请求携带有效的 Bearer token，以包含 JWT 解码开销。
+
+    cd backend
+    uv run python scripts/benchmark_http_middleware.py --requests 5000 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# 加载环境变量（必须在导入 settings 之前）
+env_path = os.path.join(os.path.dirname(__file__), '..', '.env.local')
+load_dotenv(env_path)
+
+# 基准只测中间件本身，不写数据库日志和控制台
+os.environ["LOG_DB_ENABLED"] = "false"
+os.environ["LOG_ENABLE_CONSOLE"] = "false"
+
+
+def build_app(with_middleware: bool):
+    """本地测试应用：一个 JSON 接口和一个流式接口"""
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+
+    app = FastAPI()
+
+    @app.get("/bench/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id, "name": "benchmark"}
+
+    @app.get("/bench/stream")
+    async def stream():
+        async def chunks():
+            for i in range(10):
+                yield f"chunk {i}\n".encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    if with_middleware:
+        from src.common.modules.interceptor import HTTPLoggingMiddleware, add_exception_middleware
+
+        add_exception_middleware(app)
+        app.add_middleware(HTTPLoggingMiddleware)
+    return app
+
+
+def make_token() -> str:
+    from jose import jwt
+    from src.common.modules.config import settings
+
+    payload = {
+        "sub": "00000000-0000-0000-0000-000000000001",
+        "role": "member",
+        "exp": datetime.now(timezone.utc) + timedelta(hours=1),
+    }
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+async def run(app, path: str, total: int, concurrency: int, token: str) -> float:
+    """并发发送 total 个请求，返回每秒请求数"""
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # 预热
+        for _ in range(20):
+            await client.get(path, headers=headers)
+
+        remaining = total
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                response = await client.get(path, headers=headers)
+                assert response.status_code == 200, response.status_code
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+
+
+async def main_async(args) -> None:
+    token = make_token()
+
+    print("=" * 80)
+    print("🌐 HTTP 中间件吞吐基准")
+    print(f"   requests={args.requests}, concurrency={args.concurrency}")
+    print("=" * 80)
+
+    bare = await run(build_app(False), "/bench/items/1", args.requests, args.concurrency, token)
+    print(f"\nbare:     {bare:,.0f} req/s")
+
+    logging_app = build_app(True)
+    with_logging = await run(logging_app, "/bench/items/1", args.requests, args.concurrency, token)
+    print(f"logging:  {with_logging:,.0f} req/s  (中间件开销 {1000 / with_logging - 1000 / bare:.3f} ms/请求)")
+
+    stream = await run(logging_app, "/bench/stream", args.requests, args.concurrency, token)
+    print(f"stream:   {stream:,.0f} req/s")
+
+    from src.common.modules.logger.file_writer import file_log_writer
+    file_log_writer.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTTP middleware throughput benchmark")
+    parser.add_argument("--requests", type=int, default=5000, help="每项测试的请求数")
+    parser.add_argument("--concurrency", type=int, default=50, help="并发数")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+登录吞吐与事件循环延迟基准 (AuthService.authenticate + bcrypt)
+
+以 concurrency 个并发登录调用 AuthService.authenticate（会员查询替换为内存记录，
+不连接数据库），同时运行一个探测任务每 5ms 醒来一次，测量其额外延迟，
+即登录高峰期间其他接口会感受到的事件循环阻塞：
+    1. inline: 在事件循环中直接执行 bcrypt（改动前的行为）
+    2. pool:   password_hasher 线程池执行 bcrypt
+
+    cd backend
+    uv run python scripts/benchmark_login.py --logins 40 --concurrency 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from dotenv import load_dotenv
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# 加载环境变量（必须在导入 settings 之前）
+env_path = os.path.join(os.path.dirname(__file__), '..', '.env.local')
+load_dotenv(env_path)
+
+# 基准只测登录路径本身，不写数据库日志和控制台
+os.environ["LOG_DB_ENABLED"] = "false"
+os.environ["LOG_ENABLE_CONSOLE"] = "false"
+
+PASSWORD = "Benchmark-Passw0rd!"
+PROBE_INTERVAL = 0.005
+
+
+async def probe(stop: asyncio.Event, lags: list) -> None:
+    """每 PROBE_INTERVAL 秒醒来一次，记录超出预期的延迟（毫秒）"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append((time.perf_counter() - start - PROBE_INTERVAL) * 1000)
+
+
+async def run(logins: int, concurrency: int) -> dict:
+    """执行 logins 次登录，返回吞吐和探测延迟"""
+    from src.modules.user.service import AuthService
+
+    auth_service = AuthService()
+    remaining = logins
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await auth_service.authenticate("1234567890", PASSWORD)
+
+    stop = asyncio.Event()
+    lags: list = []
+    probe_task = asyncio.create_task(probe(stop, lags))
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe_task
+
+    lags.sort()
+    return {
+        "logins_per_s": logins / elapsed,
+        "lag_p50": statistics.median(lags) if lags else 0.0,
+        "lag_p99": lags[int(len(lags) * 0.99)] if lags else 0.0,
+        "lag_max": lags[-1] if lags else 0.0,
+        "probes": len(lags),
+    }
+
+
+def print_result(name: str, result: dict) -> None:
+    print(
+        f"{name:<8} {result['logins_per_s']:6.1f} logins/s  "
+        f"其他任务延迟 p50={result['lag_p50']:.1f}ms p99={result['lag_p99']:.1f}ms "
+        f"max={result['lag_max']:.1f}ms  (探测 {result['probes']} 次)"
+    )
+
+
+async def main_async(args) -> None:
+    from src.common.modules.supabase.service import supabase_service
+    from src.modules.user.password import password_hasher, pwd_context
+
+    member = {
+        "id": "00000000-0000-0000-0000-000000000001",
+        "business_number": "1234567890",
+        "password_hash": pwd_context.hash(PASSWORD),
+        "approval_status": "approved",
+        "status": "active",
+    }
+
+    async def get_member_by_business_number(business_number):
+        return dict(member)
+
+    # 会员查询替换为内存记录
+    supabase_service.get_member_by_business_number = get_member_by_business_number
+
+    print("=" * 80)
+    print("🔐 登录吞吐与事件循环延迟")
+    print(f"   logins={args.logins}, concurrency={args.concurrency}, pool workers={password_hasher.workers}")
+    print("=" * 80 + "\n")
+
+    # inline: 模拟改动前在事件循环中同步执行 bcrypt
+    pool_verify = password_hasher.verify
+
+    async def inline_verify(plain_password, hashed_password):
+        return pwd_context.verify(plain_password, hashed_password)
+
+    password_hasher.verify = inline_verify
+    print_result("inline", await run(args.logins, args.concurrency))
+
+    password_hasher.verify = pool_verify
+    print_result("pool", await run(args.logins, args.concurrency))
+
+    print(f"\n线程池统计: {password_hasher.get_stats()}")
+    password_hasher.shutdown()
+
+    from src.common.modules.logger.file_writer import file_log_writer
+    file_log_writer.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Login throughput and event loop lag benchmark")
+    parser.add_argument("--logins", type=int, default=40, help="每项测试的登录次数")
+    parser.add_argument("--concurrency", type=int, default=20, help="并发登录数")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Service 拦截器单次调用开销基准 (intercept_service)
+
+对同一个异步方法分别测量（日志写入临时目录，不连接数据库）：
+    1. bare:     未拦截
+    2. default:  默认配置（成功日志为 DEBUG，级别过滤后直接跳过）
+    3. sampled:  INFO 级别 + 1/10 采样 + 限流（未采样的调用只更新计数）
+    4. log-all:  INFO 级别、不采样不限流（每次调用入队，另计消费耗时）
+
+    cd backend
+    uv run python scripts/benchmark_service_interceptor.py --calls 200000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# 加载环境变量（必须在导入 settings 之前）
+env_path = os.path.join(os.path.dirname(__file__), '..', '.env.local')
+load_dotenv(env_path)
+
+# 基准只测拦截器本身，不写数据库日志和控制台
+os.environ["LOG_DB_ENABLED"] = "false"
+os.environ["LOG_ENABLE_CONSOLE"] = "false"
+
+
+class BenchService:
+    async def get_member(self, member_id: str, page: int = 1, filters: dict = None) -> dict:
+        return {"id": member_id, "page": page}
+
+
+def make_service(config=None):
+    """返回一个新的（可选拦截的）Service 实例"""
+    from src.common.modules.interceptor import intercept_service
+
+    cls = type("BenchService", (BenchService,), {"get_member": BenchService.get_member})
+    if config is not False:
+        intercept_service(cls, config=config)
+    return cls()
+
+
+async def measure(service, calls: int) -> float:
+    """平均每次调用耗时（微秒）"""
+    filters = {"status": "active", "password": "secret"}
+    for _ in range(1000):  # 预热
+        await service.get_member("m-1", page=2, filters=filters)
+    start = time.perf_counter()
+    for _ in range(calls):
+        await service.get_member("m-1", page=2, filters=filters)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+async def wait_drained() -> float:
+    """等待日志队列消费完，返回耗时（秒）"""
+    from src.common.modules.interceptor import get_method_log_queue_stats
+
+    start = time.perf_counter()
+    while get_method_log_queue_stats()["pending"]:
+        await asyncio.sleep(0.01)
+    return time.perf_counter() - start
+
+
+async def main_async(calls: int) -> None:
+    from src.common.modules.interceptor import ServiceConfig, get_method_log_queue_stats
+
+    print("=" * 80)
+    print("⏱️  Service 拦截器单次调用开销")
+    print(f"   calls={calls}")
+    print("=" * 80)
+
+    bare = await measure(make_service(False), calls)
+    print(f"\nbare:     {bare:.2f} µs/call")
+
+    default = await measure(make_service(), calls)
+    print(f"default:  {default:.2f} µs/call  (+{default - bare:.2f} µs)")
+
+    sampled = await measure(
+        make_service(ServiceConfig(log_level="INFO", sample_rate=10, rate_limit_per_second=5, rate_limit_burst=20)),
+        calls,
+    )
+    await wait_drained()
+    print(f"sampled:  {sampled:.2f} µs/call  (+{sampled - bare:.2f} µs)")
+
+    log_all_calls = min(calls, 8000)  # 加上预热不超过队列上限
+    log_all = await measure(
+        make_service(ServiceConfig(log_level="INFO", sample_rate=1, rate_limit_per_second=0)),
+        log_all_calls,
+    )
+    drain = await wait_drained()
+    print(
+        f"log-all:  {log_all:.2f} µs/call  (+{log_all - bare:.2f} µs 入队)，"
+        f"消费 {drain / log_all_calls * 1e6:.1f} µs/条（在调用路径之外）"
+    )
+    print(f"\n队列统计: {get_method_log_queue_stats()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Service interceptor per-call overhead benchmark")
+    parser.add_argument("--calls", type=int, default=200000, help="每项测试的调用次数")
+    args = parser.parse_args()
+
+    from src.common.modules.logger.file_writer import file_log_writer
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 重定向到临时目录
+        file_log_writer.application_logs_file = Path(tmp) / "app.log"
+        asyncio.run(main_async(args.calls))
+        file_log_writer.close()
+
+
+if __name__ == "__main__":
+    main()
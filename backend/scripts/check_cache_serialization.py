@@ -0,0 +1,103 @@
+"""
+缓存 JSON 序列化往返检查 (RedisCacheBackend)
+
+用 DashboardService 生成一份仪表盘数据（数据库查询替换为固定数值，不连接数据库），
+经过 Redis 后端使用的 encode_entry / decode_entry 往返，检查结果与原值
+（包括 Decimal 等类型）完全一致。不一致或无法序列化时以非 0 状态退出。
+
+    cd backend
+    uv run python scripts/check_cache_serialization.py
+"""
+import asyncio
+import os
+import sys
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from dotenv import load_dotenv
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# 加载环境变量（必须在导入 settings 之前）
+env_path = os.path.join(os.path.dirname(__file__), '..', '.env.local')
+load_dotenv(env_path)
+
+os.environ["LOG_DB_ENABLED"] = "false"
+os.environ["LOG_ENABLE_CONSOLE"] = "false"
+
+
+def same(a, b) -> bool:
+    """值相等且类型一致（递归比较 dict / list）"""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+async def dashboard_payload() -> dict:
+    from src.common.modules.supabase.service import supabase_service
+    from src.modules.dashboard.service import DashboardService
+
+    async def get_approved_members_count():
+        return 128
+
+    async def get_dashboard_performance_stats(year=None, quarter=None):
+        return {
+            "total_sales": "123456.78",
+            "total_employment": 42,
+            "total_ip": 7,
+            "series": [
+                {"year": 2025, "quarter": 1, "members": 10, "sales": "1000.50", "employment": 5},
+                {"year": 2025, "quarter": None, "members": 12, "sales": 2500, "employment": 9},
+            ],
+        }
+
+    # 数据库查询替换为固定数值
+    supabase_service.get_approved_members_count = get_approved_members_count
+    supabase_service.get_dashboard_performance_stats = get_dashboard_performance_stats
+    return await DashboardService()._load_dashboard_stats(None, None)
+
+
+def main() -> None:
+    from src.common.modules.cache.backend import CacheEntry, decode_entry, encode_entry
+
+    payloads = {
+        "dashboard": asyncio.run(dashboard_payload()),
+        "scalars": {
+            "count": 3,
+            "ratio": 0.25,
+            "amount": Decimal("0.10"),
+            "at": datetime(2026, 10, 17, 15, 0, tzinfo=timezone.utc),
+            "day": date(2026, 10, 17),
+            "tags": ["a", None, True],
+        },
+    }
+
+    failed = False
+    now = time.time()
+    for name, value in payloads.items():
+        entry = CacheEntry(value=value, fresh_until=now + 60, stale_until=now + 360)
+        try:
+            restored = decode_entry(encode_entry(entry))
+        except (TypeError, ValueError) as e:
+            print(f"❌ {name}: {e}")
+            failed = True
+            continue
+        if same(entry.value, restored.value) and restored.stale_until == entry.stale_until:
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}: {entry.value!r} != {restored.value!r}")
+            failed = True
+
+    from src.common.modules.logger.file_writer import file_log_writer
+    file_log_writer.close()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+重建会员业绩聚合表 (member_performance_summary)
+
+首次执行迁移后、或怀疑聚合数据与 performance_records 不一致时运行：
+
+    cd backend
+    uv run python scripts/rebuild_member_performance_summary.py
+"""
+import asyncio
+import os
+import sys
+
+from dotenv import load_dotenv
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# 加载环境变量（必须在导入 settings 之前）
+env_path = os.path.join(os.path.dirname(__file__), '..', '.env.local')
+load_dotenv(env_path)
+
+
+async def main() -> None:
+    from src.modules.statistics.service import service as statistics_service
+
+    print("=" * 80)
+    print("🔄 重建会员业绩聚合表 member_performance_summary")
+    print("=" * 80)
+
+    try:
+        count = await statistics_service.rebuild_member_performance_summaries()
+        print(f"\n✅ 已重建 {count} 个会员的业绩聚合数据")
+    except Exception as e:
+        print(f"\n❌ 重建失败: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,42 @@
+"""
+修复/回填项目申请数 (projects.applications_count)
+
+计数由 project_applications 上的触发器维护。在触发器被禁用期间导入过数据、
+或怀疑计数与实际申请数不一致时运行：
+
+    cd backend
+    uv run python scripts/rebuild_project_applications_count.py
+"""
+import asyncio
+import os
+import sys
+
+from dotenv import load_dotenv
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# 加载环境变量（必须在导入 settings 之前）
+env_path = os.path.join(os.path.dirname(__file__), '..', '.env.local')
+load_dotenv(env_path)
+
+
+async def main() -> None:
+    from src.modules.project.service import service as project_service
+
+    print("=" * 80)
+    print("🔄 重算项目申请数 projects.applications_count")
+    print("=" * 80)
+
+    try:
+        fixed = await project_service.rebuild_applications_count()
+        print(f"\n✅ 已修正 {fixed} 个项目的申请数")
+    except Exception as e:
+        print(f"\n❌ 重算失败: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,29 @@
+"""
+Cache Module
+应用缓存模块 - TTL + LRU 缓存，支持可选的共享后端 (Redis)
+
+使用方式:
+    from src.common.modules.cache import cache_service
+
+    stats = await cache_service.get_or_load("dashboard", key, loader)
+    await cache_service.invalidate("dashboard")
+"""
+
+from .backend import (
+    CacheBackend,
+    CacheEntry,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    create_backend,
+)
+from .service import CacheService, cache_service
+
+__all__ = [
+    "CacheBackend",
+    "CacheEntry",
+    "MemoryCacheBackend",
+    "RedisCacheBackend",
+    "create_backend",
+    "CacheService",
+    "cache_service",
+]
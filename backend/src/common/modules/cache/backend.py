@@ -0,0 +1,227 @@
+"""
+Cache Backends
+缓存存储后端 - 进程内 LRU/TTL 存储，以及可选的共享存储 (Redis)
+
+共享后端是可选依赖：未安装 redis 或未配置 URL 时自动退回进程内存储，
+两者接口一致，业务代码无需关心具体实现。
+"""
+
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """缓存条目
+
+    fresh_until 之前直接命中；fresh_until 到 stale_until 之间可以返回旧值
+    并在后台刷新；stale_until 之后视为不存在。
+    """
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+def _json_default(value: Any) -> Any:
+    """JSON 不支持的类型编码为带类型标记的对象，读取时还原为原类型"""
+    if isinstance(value, Decimal):
+        return {"__decimal__": str(value)}
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_object_hook(obj: dict) -> Any:
+    if len(obj) == 1:
+        if "__decimal__" in obj:
+            return Decimal(obj["__decimal__"])
+        if "__datetime__" in obj:
+            return datetime.fromisoformat(obj["__datetime__"])
+        if "__date__" in obj:
+            return date.fromisoformat(obj["__date__"])
+    return obj
+
+
+def encode_entry(entry: CacheEntry) -> str:
+    """将条目序列化为 JSON（Decimal / datetime / date 保留原类型）"""
+    return json.dumps(
+        {"value": entry.value, "fresh_until": entry.fresh_until, "stale_until": entry.stale_until},
+        default=_json_default,
+    )
+
+
+def decode_entry(raw: Any) -> CacheEntry:
+    """从 encode_entry 的结果还原条目"""
+    data = json.loads(raw, object_hook=_json_object_hook)
+    return CacheEntry(
+        value=data["value"],
+        fresh_until=float(data["fresh_until"]),
+        stale_until=float(data["stale_until"]),
+    )
+
+
+class CacheBackend(ABC):
+    """缓存存储后端接口"""
+
+    name: str = "abstract"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """获取条目（已完全过期的返回 None）"""
+
+    @abstractmethod
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        """写入条目"""
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> int:
+        """删除指定前缀的所有条目，返回删除数量"""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """清空所有条目"""
+
+    def stats(self) -> dict:
+        """后端自身的统计信息"""
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """进程内缓存：LRU 淘汰 + TTL 过期"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 1000):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._evictions = 0
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() >= entry.stale_until:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    async def delete_prefix(self, prefix: str) -> int:
+        keys = [k for k in self._entries if k.startswith(prefix)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "evictions": self._evictions,
+        }
+
+
+class RedisCacheBackend(CacheBackend):
+    """共享缓存：多个进程/实例共用同一份数据和失效
+
+    条目序列化为 JSON（value、fresh_until、stale_until），读取时不会执行任何代码；
+    缓存值必须是 JSON 可表示的数据（dict / list / str / 数字 / None），
+    Decimal、datetime、date 带类型标记编码并在读取时还原，其他无法序列化的值不写入 Redis。
+    Redis 不可用时按未命中处理，不影响请求。
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, key_prefix: str = "gbp:cache:"):
+        import redis.asyncio as redis_asyncio  # 可选依赖
+
+        self._client = redis_asyncio.from_url(url)
+        self._key_prefix = key_prefix
+        self._errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self._key_prefix}{key}"
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            raw = await self._client.get(self._key(key))
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"Redis cache get failed: {e}")
+            return None
+        if raw is None:
+            return None
+        try:
+            return decode_entry(raw)
+        except (ValueError, TypeError, KeyError):
+            return None
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        ttl = max(int(entry.stale_until - time.time()), 1)
+        try:
+            raw = encode_entry(entry)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Redis cache skipped non-JSON value for {key}: {e}")
+            return
+        try:
+            await self._client.set(self._key(key), raw, ex=ttl)
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"Redis cache set failed: {e}")
+
+    async def delete_prefix(self, prefix: str) -> int:
+        deleted = 0
+        try:
+            async for redis_key in self._client.scan_iter(match=f"{self._key(prefix)}*"):
+                deleted += await self._client.delete(redis_key)
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"Redis cache invalidation failed: {e}")
+        return deleted
+
+    async def clear(self) -> None:
+        await self.delete_prefix("")
+
+    def stats(self) -> dict:
+        return {"errors": self._errors}
+
+
+def create_backend(
+    kind: str = "memory",
+    redis_url: Optional[str] = None,
+    max_entries: int = 1000,
+    key_prefix: str = "gbp:cache:",
+) -> CacheBackend:
+    """根据配置创建缓存后端（共享后端不可用时退回进程内存储）
+
+    key_prefix 区分共用同一个 Redis 的多个缓存实例。
+    """
+    if kind == "redis":
+        if not redis_url:
+            logger.warning("CACHE_BACKEND=redis but CACHE_REDIS_URL is not set, using in-memory cache")
+        else:
+            try:
+                return RedisCacheBackend(redis_url, key_prefix=key_prefix)
+            except ImportError:
+                logger.warning("redis package not installed, using in-memory cache")
+    return MemoryCacheBackend(max_entries=max_entries)
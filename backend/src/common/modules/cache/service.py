@@ -0,0 +1,207 @@
+"""
+Cache Service
+应用缓存服务 - 为昂贵的聚合查询提供 TTL + LRU 缓存
+
+特性:
+    - fresh 期内直接返回缓存
+    - stale 期内先返回旧值，同时在后台刷新（同一 key 只刷新一次）
+    - 未命中时同一 key 的并发请求只加载一次（single-flight）
+    - 按 namespace 显式失效，失效期间进行中的加载结果不会写回
+
+使用方式:
+    from src.common.modules.cache import cache_service
+
+    data = await cache_service.get_or_load("dashboard", "2025:all", loader)
+    await cache_service.invalidate("dashboard")
+    await cache_service.invalidate_prefix("principal", "<user_id>:")
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..config import settings
+from .backend import CacheBackend, CacheEntry, create_backend
+
+logger = logging.getLogger(__name__)
+
+
+class CacheService:
+    """应用缓存服务"""
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        default_ttl: int = 300,
+        stale_ttl: int = 60,
+        enabled: bool = True,
+    ):
+        self._backend = backend or create_backend()
+        self._default_ttl = default_ttl
+        self._stale_ttl = stale_ttl
+        self._enabled = enabled
+        # 进行中的加载任务 {full_key: Task}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # 每个 namespace 的失效代数
+        self._generations: Dict[str, int] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def backend(self) -> CacheBackend:
+        return self._backend
+
+    def set_backend(self, backend: CacheBackend) -> None:
+        """替换存储后端（例如切换到共享后端）"""
+        self._backend = backend
+        self._inflight.clear()
+
+    def _ns_stats(self, namespace: str) -> Dict[str, int]:
+        if namespace not in self._stats:
+            self._stats[namespace] = {
+                "hits": 0,
+                "misses": 0,
+                "stale_serves": 0,
+                "refresh_errors": 0,
+                "invalidations": 0,
+            }
+        return self._stats[namespace]
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        stale_ttl: Optional[int] = None,
+    ) -> Any:
+        """
+        获取缓存值，不存在时调用 loader 加载并写入
+
+        Args:
+            namespace: 缓存命名空间（失效粒度）
+            key: 命名空间内的 key
+            loader: 无参异步加载函数
+            ttl: fresh 时长（秒），默认使用配置值
+            stale_ttl: stale 时长（秒），默认使用配置值；0 表示过期后不返回旧值
+        """
+        if not self._enabled:
+            return await loader()
+
+        full_key = f"{namespace}:{key}"
+        stats = self._ns_stats(namespace)
+        entry = await self._backend.get(full_key)
+        now = time.time()
+
+        if entry is not None and now < entry.fresh_until:
+            stats["hits"] += 1
+            return entry.value
+
+        if entry is not None:
+            # 过期但仍在 stale 窗口内：返回旧值并后台刷新
+            stats["stale_serves"] += 1
+            if full_key not in self._inflight:
+                self._start_load(namespace, full_key, loader, ttl, stale_ttl, background=True)
+            return entry.value
+
+        stats["misses"] += 1
+        task = self._inflight.get(full_key)
+        if task is None:
+            task = self._start_load(namespace, full_key, loader, ttl, stale_ttl)
+        return await asyncio.shield(task)
+
+    def _start_load(
+        self,
+        namespace: str,
+        full_key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        stale_ttl: Optional[int],
+        background: bool = False,
+    ) -> asyncio.Task:
+        generation = self._generations.get(namespace, 0)
+        task = asyncio.create_task(self._load(namespace, full_key, loader, ttl, stale_ttl, generation, background))
+        self._inflight[full_key] = task
+        task.add_done_callback(lambda t: self._inflight.pop(full_key, None) if self._inflight.get(full_key) is t else None)
+        return task
+
+    async def _load(
+        self,
+        namespace: str,
+        full_key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        stale_ttl: Optional[int],
+        generation: int,
+        background: bool,
+    ) -> Any:
+        try:
+            value = await loader()
+        except Exception as e:
+            if not background:
+                raise
+            self._ns_stats(namespace)["refresh_errors"] += 1
+            logger.warning(f"Background cache refresh failed for {full_key}: {e}")
+            return None
+
+        # 加载期间发生了失效，结果可能已过时，不写回
+        if self._generations.get(namespace, 0) == generation:
+            fresh_ttl = self._default_ttl if ttl is None else ttl
+            stale = self._stale_ttl if stale_ttl is None else stale_ttl
+            now = time.time()
+            await self._backend.set(
+                full_key,
+                CacheEntry(value=value, fresh_until=now + fresh_ttl, stale_until=now + fresh_ttl + stale),
+            )
+        return value
+
+    async def invalidate(self, *namespaces: str) -> None:
+        """失效一个或多个命名空间下的所有条目"""
+        for namespace in namespaces:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            self._ns_stats(namespace)["invalidations"] += 1
+            await self._backend.delete_prefix(f"{namespace}:")
+            for full_key in [k for k in self._inflight if k.startswith(f"{namespace}:")]:
+                self._inflight.pop(full_key, None)
+
+    async def invalidate_prefix(self, namespace: str, prefix: str) -> None:
+        """失效命名空间内 key 以 prefix 开头的条目（例如单个用户的所有条目）"""
+        full_prefix = f"{namespace}:{prefix}"
+        # 代数按 namespace 计，同一命名空间其他 key 进行中的加载也不会写回，只是少缓存一次
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        self._ns_stats(namespace)["invalidations"] += 1
+        await self._backend.delete_prefix(full_prefix)
+        for full_key in [k for k in self._inflight if k.startswith(full_prefix)]:
+            self._inflight.pop(full_key, None)
+
+    async def clear(self) -> None:
+        """清空全部缓存"""
+        for namespace in list(self._generations):
+            self._generations[namespace] += 1
+        self._inflight.clear()
+        await self._backend.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """缓存命中统计（用于健康检查）"""
+        totals = {"hits": 0, "misses": 0, "stale_serves": 0, "refresh_errors": 0, "invalidations": 0}
+        for ns_stats in self._stats.values():
+            for name in totals:
+                totals[name] += ns_stats[name]
+        lookups = totals["hits"] + totals["misses"] + totals["stale_serves"]
+        return {
+            "enabled": self._enabled,
+            "type": self._backend.name,
+            **totals,
+            "hit_rate": round((totals["hits"] + totals["stale_serves"]) / lookups, 4) if lookups else 0.0,
+            "inflight": len(self._inflight),
+            "backend": self._backend.stats(),
+            "namespaces": {name: dict(values) for name, values in self._stats.items()},
+        }
+
+
+cache_service = CacheService(
+    backend=create_backend(settings.CACHE_BACKEND, settings.CACHE_REDIS_URL, settings.CACHE_MAX_ENTRIES),
+    default_ttl=settings.CACHE_DEFAULT_TTL,
+    stale_ttl=settings.CACHE_STALE_TTL,
+    enabled=settings.CACHE_ENABLED,
+)
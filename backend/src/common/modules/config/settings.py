@@ -6,7 +6,7 @@ and application configuration.
 """
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
-from typing import List, Union
+from typing import Dict, List, Union
 
 
 class Settings(BaseSettings):
@@ -30,6 +30,8 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "development-secret-key-change-in-production"  # Default for development
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
+    PASSWORD_HASH_WORKERS: int = 2  # Threads for bcrypt hash/verify, kept off the event loop
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # Hash/verify calls allowed to wait for a worker; beyond this login returns 429
 
     # CORS Configuration
     # Default allows both Vite dev ports (5173 and 3000) and production domains
@@ -97,6 +99,10 @@ class Settings(BaseSettings):
     LOG_FILE: str | None = None  # Path to system log file (None = auto-detect backend/logs/system.log)
     LOG_FILE_MAX_BYTES: int = 10485760  # 10MB per log file
     LOG_FILE_BACKUP_COUNT: int = 5  # Number of backup files to keep
+    LOG_FILE_WRITE_BATCH_SIZE: int = 1000  # Max queued lines written per batch by the file log writer
+    LOG_FILE_FSYNC_INTERVAL: float = 1.0  # Seconds between fsync of log files (0 = fsync every batch, <0 = never)
+    LOG_FILE_COMPRESSION: str = "gzip"  # Compression for rotated log files: gzip, zstd (needs zstandard) or none
+    LOG_FILE_RETENTION_BYTES: int = 1073741824  # 1GB total for rotated log archives; oldest are deleted first
     LOG_ENABLE_FILE: bool = True  # Enable system log file (default: True - writes to system.log)
     LOG_ENABLE_CONSOLE: bool = True  # Enable console logging
     LOG_CLEAR_ON_STARTUP: bool = True  # Clear logs and database records on startup (default: True)
@@ -123,6 +129,33 @@ class Settings(BaseSettings):
     LOG_DB_APP_MIN_LEVEL: str = "INFO"  # Minimum log level for app logs (app_logs table) - INFO/WARNING/ERROR/CRITICAL
     LOG_DB_BATCH_SIZE: int = 50  # Batch size for database inserts (reduce database overhead)
     LOG_DB_BATCH_INTERVAL: float = 5.0  # Batch interval in seconds (flush batch after this time)
+    LOG_DB_MAX_CONCURRENCY: int = 4  # Max concurrent database log inserts (dedicated thread pool size)
+    LOG_DB_QUEUE_SETTINGS: Dict[str, Dict[str, float]] = {}  # Per log type batch overrides, e.g. {"error": {"batch_size": 10, "batch_interval": 0.5}}
+    LOG_DB_FLUSH_ON_CRITICAL: bool = True  # Flush a log queue immediately when a CRITICAL entry is queued
+    LOG_DB_SPOOL_ENABLED: bool = True  # Spill overflow and failed log batches to logs/db_spool and replay them later
+    LOG_DB_SPOOL_MAX_BYTES: int = 104857600  # 100MB disk budget for the spool
+    LOG_DB_SPOOL_SEGMENT_BYTES: int = 4194304  # 4MB per spool segment file
+    LOG_DB_SPOOL_REPLAY_INTERVAL: float = 10.0  # Seconds between replay attempts (doubles on failure, max 5 minutes)
+    
+    # Interceptor log sampling (successful fast calls only; slow and failed calls are always logged)
+    LOG_SERVICE_SAMPLE_RATE: int = 10  # Log 1 in N successful Service/Auth method calls (1 = log all)
+    LOG_DB_SAMPLE_RATE: int = 10  # Log 1 in N successful database operations (1 = log all)
+    LOG_INTERCEPTOR_RATE_LIMIT: float = 5.0  # Max sampled logs per second per (layer, function); 0 = unlimited
+    LOG_INTERCEPTOR_RATE_BURST: int = 20  # Token bucket burst size for LOG_INTERCEPTOR_RATE_LIMIT
+    
+    # Latency Metrics (in-process histograms fed by the interceptors)
+    METRICS_ENABLED: bool = True  # Record per route / service method / table latency histograms
+    METRICS_TOKEN: str | None = None  # Bearer token for the Prometheus scrape endpoint /metrics (disabled when unset)
+
+    # Application Cache Configuration (dashboard / analytics aggregates)
+    CACHE_ENABLED: bool = True  # Enable caching of expensive aggregate queries
+    CACHE_BACKEND: str = "memory"  # memory (per process) or redis (shared between instances)
+    CACHE_REDIS_URL: str | None = None  # Redis URL for the shared backend, e.g. redis://localhost:6379/0
+    CACHE_DEFAULT_TTL: int = 300  # Seconds an entry is served as fresh
+    CACHE_STALE_TTL: int = 60  # Extra seconds a stale entry may be served while it refreshes in background
+    CACHE_MAX_ENTRIES: int = 1000  # LRU bound for the in-memory backend
+    AUTH_PRINCIPAL_CACHE_TTL: int = 30  # Seconds an authenticated user row is reused across requests (0 = always query)
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = 5000  # LRU bound for cached principals, separate from the aggregate cache
 
     class Config:
         # Try .env.local first (for local development), then .env
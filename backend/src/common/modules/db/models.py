@@ -18,10 +18,11 @@ from sqlalchemy import (
     CheckConstraint,
     Index,
     UniqueConstraint,
+    Computed,
 )
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import uuid
 
 from .session import Base
@@ -29,6 +30,7 @@ from .session import Base
 __all__ = [
     "Member",
     "PerformanceRecord", 
+    "MemberPerformanceSummary",
     "Project",
     "ProjectApplication",
     "ApplicationStatusHistory",
@@ -111,6 +113,11 @@ class Member(Base):
     participation_programs = Column(Text)  # 참여 프로그램 (JSON array as text)
     investment_status = Column(Text)  # 투자 유치 (JSON object as text)
     
+    # 标签数组（由数据库根据 JSON 文本列自动生成，带 GIN 索引，供统计筛选使用）
+    participation_programs_tags = Column(ARRAY(Text), Computed("parse_tag_list(participation_programs)", persisted=True))
+    cooperation_fields_tags = Column(ARRAY(Text), Computed("parse_tag_list(cooperation_fields)", persisted=True))
+    main_industry_ksic_codes_tags = Column(ARRAY(Text), Computed("parse_tag_list(main_industry_ksic_codes)", persisted=True))
+    
     # Soft delete field
     deleted_at = Column(TIMESTAMP(timezone=True), nullable=True)
     
@@ -125,6 +132,9 @@ class Member(Base):
     # Indexes
     __table_args__ = (
         Index("idx_members_deleted_at", "deleted_at"),
+        Index("idx_members_participation_programs_tags", "participation_programs_tags", postgresql_using="gin"),
+        Index("idx_members_cooperation_fields_tags", "cooperation_fields_tags", postgresql_using="gin"),
+        Index("idx_members_main_industry_ksic_codes_tags", "main_industry_ksic_codes_tags", postgresql_using="gin"),
     )
 
     def __repr__(self):
@@ -174,12 +184,38 @@ class PerformanceRecord(Base):
     __table_args__ = (
         Index("idx_performance_member_year", "member_id", "year", "quarter"),
         Index("idx_performance_records_deleted_at", "deleted_at"),
+        Index(
+            "idx_performance_records_approved_period", "year", "quarter",
+            postgresql_where=text("status = 'approved' AND deleted_at IS NULL"),
+        ),
     )
 
     def __repr__(self):
         return f"<PerformanceRecord(id={self.id}, member_id={self.member_id}, year={self.year}, quarter={self.quarter}, status={self.status})>"
 
 
+class MemberPerformanceSummary(Base):
+    """Per-member aggregate of submitted performance records (refreshed on write)."""
+
+    __tablename__ = "member_performance_summary"
+
+    member_id = Column(UUID(as_uuid=True), ForeignKey("members.id", ondelete="CASCADE"), primary_key=True)
+    export_amount = Column(Float, nullable=False, server_default="0")  # 最新年度出口额
+    total_investment = Column(Float, nullable=False, server_default="0")  # 政府支持金额合计（元）
+    patent_count = Column(Integer, nullable=False, server_default="0")  # 知识产权数量
+    latest_revenue = Column(Float, nullable=False, server_default="0")  # 最新年度销售额
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Indexes
+    __table_args__ = (
+        Index("idx_member_perf_summary_investment", "total_investment"),
+        Index("idx_member_perf_summary_patents", "patent_count"),
+    )
+
+    def __repr__(self):
+        return f"<MemberPerformanceSummary(member_id={self.member_id}, total_investment={self.total_investment}, patent_count={self.patent_count})>"
+
+
 class Project(Base):
     """Program/project announcements."""
 
@@ -195,6 +231,7 @@ class Project(Base):
     image_url = Column(String(500))
     status = Column(String(50), default="active")  # active, inactive, archived
     view_count = Column(Integer, nullable=False, server_default='0')  # 浏览次数
+    applications_count = Column(Integer, nullable=False, server_default='0')  # 未删除的申请数（由 project_applications 触发器维护）
     attachments = Column(JSONB, nullable=True)  # Store file attachments as JSON array
     
     # Soft delete field
@@ -721,6 +758,19 @@ class Message(Base):
         return f"<Message(id={self.id}, type={self.message_type}, subject={self.subject})>"
 
 
+class MessageUnreadCount(Base):
+    """Unread message counter per recipient (maintained by a trigger on messages)."""
+
+    __tablename__ = "message_unread_counts"
+
+    owner_key = Column(String(64), primary_key=True)  # 用户 ID，或管理员共享的 "admin:threads"
+    unread_count = Column(Integer, nullable=False, server_default="0")
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<MessageUnreadCount(owner_key={self.owner_key}, unread_count={self.unread_count})>"
+
+
 class NiceDnbCompanyInfo(Base):
     """Snapshot of Nice D&B company info responses."""
 
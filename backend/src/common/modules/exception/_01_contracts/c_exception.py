@@ -123,6 +123,7 @@ class CMessageTemplate:
     # ========== Business Module Messages - Messages ==========
     MESSAGE_BROADCAST_ADMIN_ONLY: Final[str] = "Only admins can send broadcast messages"
     MESSAGE_NO_RECIPIENTS: Final[str] = "No recipients specified"
+    MESSAGE_BROADCAST_NOT_RESUMABLE: Final[str] = "Cannot resume broadcast job with status '{status}'. Only 'failed' jobs can be resumed"
     
     # ========== Business Module Messages - Upload ==========
     UPLOAD_MIME_TYPE_NOT_ALLOWED: Final[str] = "MIME type '{mime_type}' is not allowed for {file_category} files"
@@ -107,6 +107,15 @@ async def check_database_health():
     return None
 
 
+def get_cache_stats():
+    """获取应用缓存统计（缓存模块不可用时返回 None）"""
+    try:
+        from ..cache import cache_service
+        return cache_service.get_stats()
+    except ImportError:
+        return None
+
+
 def get_app_version():
     """获取应用版本"""
     return APP_VERSION
@@ -18,7 +18,8 @@ from .adapter import (
     get_app_version, 
     is_using_supabase, 
     get_supabase_client_instance,
-    check_database_health
+    check_database_health,
+    get_cache_stats
 )
 
 logger = logging.getLogger(__name__)
@@ -140,7 +141,7 @@ class HealthService:
                 "database": db_health,
                 "api": api_health,
                 "storage": storage_health,
-                "cache": {"status": "healthy", "type": "memory"}
+                "cache": cls._check_cache()
             },
         }
         
@@ -172,7 +173,9 @@ class HealthService:
                 if client:
                     start_time = time.time()
                     # 测试连接响应时间
-                    result = client.table('members').select('id').limit(1).execute()
+                    result = await asyncio.to_thread(
+                        lambda: client.table('members').select('id').limit(1).execute()
+                    )
                     response_time = round((time.time() - start_time) * 1000, 2)
                     
                     return {
@@ -258,7 +261,9 @@ class HealthService:
                 if client:
                     start_time = time.time()
                     # 简单查询测试连接
-                    result = client.table('members').select('id').limit(1).execute()
+                    result = await asyncio.to_thread(
+                        lambda: client.table('members').select('id').limit(1).execute()
+                    )
                     response_time = round((time.time() - start_time) * 1000, 2)
                     
                     return {
@@ -295,6 +300,14 @@ class HealthService:
             "version": config.app_version
         }
     
+    @classmethod
+    def _check_cache(cls) -> Dict[str, Any]:
+        """应用缓存状态及命中统计"""
+        stats = get_cache_stats()
+        if stats is None:
+            return {"status": "unknown", "type": "none"}
+        return {"status": "healthy", **stats}
+    
     @classmethod
     async def _check_storage(cls) -> Dict[str, Any]:
         """检查存储服务状态（Supabase Storage）"""
@@ -24,6 +24,8 @@ setup_interceptors(app, debug=settings.DEBUG)
     ├── service.py      # Service 层
     ├── auth.py         # Auth 层
     ├── database.py     # Database 层
+    ├── sampling.py     # 日志采样与限流
+    ├── metrics.py      # 延迟直方图
     ├── error.py        # 错误日志拦截
     └── __init__.py     # 入口 + 自动注册
 """
@@ -56,6 +58,7 @@ from .router import (
     add_logging_middleware,
     should_skip_logging,
     determine_log_level,
+    get_token_claims,
     SLOW_REQUEST_THRESHOLD_MS,
 )
 
@@ -71,7 +74,7 @@ from .error import (
 # =============================================================================
 # Service 层
 # =============================================================================
-from .service import intercept_service, intercept_method
+from .service import intercept_service, intercept_method, get_method_log_queue_stats
 
 # =============================================================================
 # Auth 层
@@ -88,6 +91,27 @@ from .database import (
     DatabaseOperationLogger,
     DatabaseExceptionHandler,
     create_unified_supabase_client,
+    get_db_executor,
+    run_in_db_executor,
+    shutdown_db_executor,
+)
+
+
+# =============================================================================
+# 日志采样
+# =============================================================================
+from .sampling import LogSampler, get_sampler, get_sampling_stats
+
+# =============================================================================
+# 延迟指标
+# =============================================================================
+from .metrics import (
+    LatencyHistogram,
+    MetricsRegistry,
+    metrics_registry,
+    record_latency,
+    register_stats_provider,
+    get_provider_stats,
 )
 
 
@@ -188,7 +212,8 @@ def setup_interceptors(
         service_packages = ["src.modules", "src.common.modules"]
     
     # LoggingService 必须排除，否则会导致日志递归循环
-    exclude_classes = ["LoggingService"]
+    # CacheService 处于热路径，且其后台刷新任务不应产生调用日志
+    exclude_classes = ["LoggingService", "CacheService"]
     
     # 1. Router 层
     add_exception_middleware(app, debug=debug)
@@ -225,6 +250,7 @@ __all__ = [
     "add_logging_middleware",
     "should_skip_logging",
     "determine_log_level",
+    "get_token_claims",
     "SLOW_REQUEST_THRESHOLD_MS",
     # Error 层
     "ExceptionMiddleware",
@@ -233,6 +259,7 @@ __all__ = [
     # Service 层
     "intercept_service",
     "intercept_method",
+    "get_method_log_queue_stats",
     # Auth 层
     "intercept_auth_service",
     "intercept_auth_method",
@@ -243,4 +270,18 @@ __all__ = [
     "DatabaseOperationLogger",
     "DatabaseExceptionHandler",
     "create_unified_supabase_client",
+    "get_db_executor",
+    "run_in_db_executor",
+    "shutdown_db_executor",
+    # 日志采样
+    "LogSampler",
+    "get_sampler",
+    "get_sampling_stats",
+    # 延迟指标
+    "LatencyHistogram",
+    "MetricsRegistry",
+    "metrics_registry",
+    "record_latency",
+    "register_stats_provider",
+    "get_provider_stats",
 ]
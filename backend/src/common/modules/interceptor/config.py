@@ -6,6 +6,8 @@ Interceptor Configuration - 各层拦截器的统一配置
 from dataclasses import dataclass, field
 from typing import Set, List
 
+from ..config import settings
+
 
 # =============================================================================
 # 通用配置
@@ -58,6 +60,11 @@ class ServiceConfig:
     sensitive_args: Set[str] = field(default_factory=lambda: SENSITIVE_FIELDS)
     max_arg_length: int = 200
     max_result_length: int = 500
+    # 采样：成功且未超过 slow_threshold_ms 的调用每 N 次记录 1 次，慢调用和失败调用始终记录
+    sample_rate: int = field(default_factory=lambda: settings.LOG_SERVICE_SAMPLE_RATE)
+    # 限流：每个 (layer, function) 每秒最多记录的采样日志数（令牌桶，0 = 不限）
+    rate_limit_per_second: float = field(default_factory=lambda: settings.LOG_INTERCEPTOR_RATE_LIMIT)
+    rate_limit_burst: int = field(default_factory=lambda: settings.LOG_INTERCEPTOR_RATE_BURST)
 
 
 # =============================================================================
@@ -69,7 +76,12 @@ class DatabaseConfig:
     """Database 层拦截器配置"""
     slow_threshold_ms: float = 500.0
     log_query_params: bool = True
+    executor_max_workers: int = 16
     sensitive_fields: Set[str] = field(default_factory=lambda: SENSITIVE_FIELDS)
+    # 采样与限流（含义同 ServiceConfig）
+    sample_rate: int = field(default_factory=lambda: settings.LOG_DB_SAMPLE_RATE)
+    rate_limit_per_second: float = field(default_factory=lambda: settings.LOG_INTERCEPTOR_RATE_LIMIT)
+    rate_limit_burst: int = field(default_factory=lambda: settings.LOG_INTERCEPTOR_RATE_BURST)
 
 
 # 别名
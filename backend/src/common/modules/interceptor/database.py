@@ -4,15 +4,21 @@ Database Interceptor - DB 层拦截器
 提供数据库操作的 AOP 拦截：
 - 自动记录 SQL 操作日志
 - 慢查询警告
+- 日志采样与限流（慢查询和失败查询始终记录）
+- 延迟直方图（按 表名.操作 统计，见 metrics.py）
 - 异常捕获和标准化
+- 异步执行（有界线程池，避免阻塞事件循环）
 """
 import time
 import asyncio
 import threading
 import logging
-from typing import Any, Dict, Optional, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar, TYPE_CHECKING
 
 from .config import DatabaseConfig, SENSITIVE_FIELDS
+from .sampling import get_sampler
+from .metrics import record_latency
 
 if TYPE_CHECKING:
     from supabase import Client
@@ -20,6 +26,8 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 def _get_logging_service():
     """延迟导入避免循环依赖"""
@@ -76,6 +84,46 @@ def _filter_sensitive_data(data: Dict[str, Any], sensitive_fields: set = SENSITI
     return filtered
 
 
+# =============================================================================
+# Database Executor
+# =============================================================================
+
+_db_executor: Optional[ThreadPoolExecutor] = None
+_db_executor_lock = threading.Lock()
+
+
+def get_db_executor(max_workers: Optional[int] = None) -> ThreadPoolExecutor:
+    """获取数据库执行线程池（懒加载，进程内共享）
+
+    同步 postgrest 客户端的 execute() 会阻塞调用线程，这里用有界线程池
+    承载这些调用，事件循环只负责 await 结果。
+    """
+    global _db_executor
+    if _db_executor is None:
+        with _db_executor_lock:
+            if _db_executor is None:
+                _db_executor = ThreadPoolExecutor(
+                    max_workers=max_workers or DatabaseConfig().executor_max_workers,
+                    thread_name_prefix="db-exec",
+                )
+    return _db_executor
+
+
+async def run_in_db_executor(func: Callable[..., T], *args: Any) -> T:
+    """在数据库线程池中执行同步调用，不阻塞事件循环"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), func, *args)
+
+
+def shutdown_db_executor(wait: bool = True) -> None:
+    """关闭数据库线程池（应用关闭时调用）"""
+    global _db_executor
+    with _db_executor_lock:
+        if _db_executor is not None:
+            _db_executor.shutdown(wait=wait)
+            _db_executor = None
+
+
 # =============================================================================
 # Database Operation Logger
 # =============================================================================
@@ -86,6 +134,16 @@ class DatabaseOperationLogger:
     def __init__(self, config: DatabaseConfig = None):
         self.config = config or DatabaseConfig()
         self._slow_query_threshold_ms = self.config.slow_threshold_ms
+        self._sampler = get_sampler("Database", self.config)
+    
+    def should_log(self, table_name: str, operation_type: str, duration_ms: float, success: bool) -> bool:
+        """采样决策：慢查询和失败查询始终记录，其余按 (table, operation) 采样限流"""
+        return self._sampler.should_log(
+            "Database",
+            f"{table_name}.{operation_type}",
+            slow=duration_ms > self._slow_query_threshold_ms,
+            failed=not success,
+        )
     
     async def log_operation(
         self,
@@ -95,6 +153,7 @@ class DatabaseOperationLogger:
         success: bool,
         error: Optional[Exception] = None,
         operation_data: Optional[Dict] = None,
+        sample_rate: int = 1,
     ):
         """记录数据库操作"""
         try:
@@ -112,6 +171,9 @@ class DatabaseOperationLogger:
                 "table_name": table_name,
                 "operation_type": operation_type,
             }
+            if sample_rate > 1:
+                # 采样日志：1 条代表 sample_rate 次操作
+                extra_data["sample_rate"] = sample_rate
             
             if self.config.log_query_params and operation_data:
                 filtered = _filter_sensitive_data(operation_data, self.config.sensitive_fields)
@@ -263,34 +325,55 @@ class UnifiedQuery:
         return attr
     
     def execute(self) -> "APIResponse":
-        """执行查询并记录日志"""
+        """执行查询并记录日志（同步，会阻塞调用线程）"""
         start_time = time.time()
         
         try:
             result = self._query.execute()
-            duration_ms = (time.time() - start_time) * 1000
-            
-            _schedule_coro(self._logger.log_operation(
-                self._table_name, self._operation_type, duration_ms, True,
-                operation_data=self._operation_data
-            ))
-            
-            return result
-            
         except Exception as exc:
-            duration_ms = (time.time() - start_time) * 1000
-            
-            _schedule_coro(self._logger.log_operation(
-                self._table_name, self._operation_type, duration_ms, False, error=exc
-            ))
-            
-            DatabaseError = _get_database_error()
-            raise DatabaseError(
-                message=f"Database {self._operation_type} operation failed on table '{self._table_name}'",
-                table_name=self._table_name,
-                operation=self._operation_type,
-                original_exception=exc
-            ) from exc
+            raise self._on_failure(exc, (time.time() - start_time) * 1000) from exc
+        
+        self._on_success((time.time() - start_time) * 1000)
+        return result
+    
+    async def execute_async(self) -> "APIResponse":
+        """在数据库线程池中执行查询并记录日志（不阻塞事件循环）"""
+        start_time = time.time()
+        
+        try:
+            result = await run_in_db_executor(self._query.execute)
+        except Exception as exc:
+            raise self._on_failure(exc, (time.time() - start_time) * 1000) from exc
+        
+        self._on_success((time.time() - start_time) * 1000)
+        return result
+    
+    def _on_success(self, duration_ms: float) -> None:
+        """记录成功的查询（按采样规则，未采样时不创建日志协程）"""
+        record_latency("Database", f"{self._table_name}.{self._operation_type}", duration_ms)
+        if not self._logger.should_log(self._table_name, self._operation_type, duration_ms, True):
+            return
+        is_slow = duration_ms > self._logger.config.slow_threshold_ms
+        _schedule_coro(self._logger.log_operation(
+            self._table_name, self._operation_type, duration_ms, True,
+            operation_data=self._operation_data,
+            sample_rate=1 if is_slow else self._logger.config.sample_rate,
+        ))
+    
+    def _on_failure(self, exc: Exception, duration_ms: float) -> Exception:
+        """记录失败的查询并返回标准化的 DatabaseError"""
+        record_latency("Database", f"{self._table_name}.{self._operation_type}", duration_ms, error=True)
+        _schedule_coro(self._logger.log_operation(
+            self._table_name, self._operation_type, duration_ms, False, error=exc
+        ))
+        
+        DatabaseError = _get_database_error()
+        return DatabaseError(
+            message=f"Database {self._operation_type} operation failed on table '{self._table_name}'",
+            table_name=self._table_name,
+            operation=self._operation_type,
+            original_exception=exc
+        )
 
 
 # =============================================================================
@@ -316,8 +399,10 @@ class UnifiedTable:
         query = self._table.select(columns, count=count) if count else self._table.select(columns)
         return UnifiedQuery(query, self._table_name, "SELECT", logger=self._logger, exception_handler=self._exception_handler)
     
-    def insert(self, data: Dict) -> UnifiedQuery:
-        return UnifiedQuery(self._table.insert(data), self._table_name, "INSERT", data, self._logger, self._exception_handler)
+    def insert(self, data: Dict, returning: Optional[str] = None) -> UnifiedQuery:
+        """returning="minimal" 时不返回插入的行（批量写入不需要回读）"""
+        query = self._table.insert(data, returning=returning) if returning else self._table.insert(data)
+        return UnifiedQuery(query, self._table_name, "INSERT", data, self._logger, self._exception_handler)
     
     def update(self, data: Dict) -> UnifiedQuery:
         return UnifiedQuery(self._table.update(data), self._table_name, "UPDATE", data, self._logger, self._exception_handler)
@@ -367,6 +452,17 @@ class UnifiedSupabaseClient:
             self._exception_handler
         )
     
+    def rpc(self, fn: str, params: Optional[Dict] = None) -> UnifiedQuery:
+        """调用数据库函数（同样记录日志和处理异常）"""
+        return UnifiedQuery(
+            self._client.rpc(fn, params or {}),
+            fn,
+            "RPC",
+            params,
+            self._logger,
+            self._exception_handler
+        )
+    
     def set_context(self, context):
         """更新异常上下文"""
         self._exception_handler.set_context(context)
@@ -0,0 +1,191 @@
+"""
+Latency Metrics - 进程内延迟直方图
+
+三层拦截器在每次调用结束时写入直方图（与日志采样无关，所有调用都计入）：
+- Router:   HTTPLoggingMiddleware，按 "METHOD 路由模板" 统计
+- Service:  intercept_method，按 "类名.方法名" 统计（含 Auth 层）
+- Database: UnifiedQuery，按 "表名.操作" 统计
+
+每个 (layer, name) 一个固定桶直方图，记录一次只是一次二分查找和几次计数，
+p50/p95/p99 由桶内线性插值估算。可导出 Prometheus 文本格式或 JSON 摘要。
+
+业务模块可以通过 register_stats_provider 注册自己的运行统计（如线程池队列），
+指标接口统一输出，common 不需要导入业务模块。
+"""
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import settings
+
+# 桶上界（毫秒），最后一个桶为 +Inf
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000,
+)
+
+# series 数量上限，超出后归入 "<other>"，防止异常路径导致内存增长
+MAX_SERIES = 2000
+OVERFLOW_NAME = "<other>"
+
+
+class LatencyHistogram:
+    """固定桶延迟直方图（由 MetricsRegistry 的锁保护）"""
+
+    __slots__ = ("buckets", "count", "errors", "sum_ms", "max_ms")
+
+    def __init__(self):
+        self.buckets: List[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float, error: bool = False) -> None:
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.sum_ms += duration_ms
+        if duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+        if error:
+            self.errors += 1
+
+    def percentile(self, q: float) -> float:
+        """按桶内线性插值估算分位数（毫秒）"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.buckets):
+            if bucket_count and cumulative + bucket_count >= target:
+                lower = LATENCY_BUCKETS_MS[i - 1] if i > 0 else 0.0
+                upper = LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+                upper = min(upper, self.max_ms)
+                fraction = (target - cumulative) / bucket_count
+                return round(lower + (upper - lower) * fraction, 2)
+            cumulative += bucket_count
+        return round(self.max_ms, 2)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.sum_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class MetricsRegistry:
+    """(layer, name) -> LatencyHistogram"""
+
+    def __init__(self, enabled: bool = True, max_series: int = MAX_SERIES):
+        self.enabled = enabled
+        self.max_series = max_series
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def observe(self, layer: str, name: str, duration_ms: float, error: bool = False) -> None:
+        """记录一次调用耗时（线程安全，可在线程池中调用）"""
+        if not self.enabled:
+            return
+        key = (layer, name)
+        with self._lock:
+            histogram = self._series.get(key)
+            if histogram is None:
+                if len(self._series) >= self.max_series:
+                    key = (layer, OVERFLOW_NAME)
+                    histogram = self._series.get(key)
+                if histogram is None:
+                    histogram = self._series[key] = LatencyHistogram()
+            histogram.observe(duration_ms, error)
+
+    def _snapshot(self) -> List[Tuple[Tuple[str, str], LatencyHistogram]]:
+        """复制当前数据，导出时不长时间持有锁"""
+        with self._lock:
+            snapshot = []
+            for key, histogram in self._series.items():
+                copy = LatencyHistogram()
+                copy.buckets = list(histogram.buckets)
+                copy.count = histogram.count
+                copy.errors = histogram.errors
+                copy.sum_ms = histogram.sum_ms
+                copy.max_ms = histogram.max_ms
+                snapshot.append((key, copy))
+        snapshot.sort(key=lambda item: item[0])
+        return snapshot
+
+    def get_summary(self, layer: Optional[str] = None, top: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """JSON 摘要 {layer: {name: {count, errors, p50_ms, ...}}}，每层按总耗时降序"""
+        by_layer: Dict[str, List[Tuple[str, LatencyHistogram]]] = {}
+        for (series_layer, name), histogram in self._snapshot():
+            if layer and series_layer != layer:
+                continue
+            by_layer.setdefault(series_layer, []).append((name, histogram))
+
+        result: Dict[str, Dict[str, Any]] = {}
+        for series_layer, items in by_layer.items():
+            items.sort(key=lambda item: item[1].sum_ms, reverse=True)
+            if top:
+                items = items[:top]
+            result[series_layer] = {name: histogram.summary() for name, histogram in items}
+        return result
+
+    def render_prometheus(self) -> str:
+        """Prometheus 文本格式（0.0.4）"""
+        lines = [
+            "# HELP app_latency_seconds Call latency by layer (Router/Service/Auth/Database) and name.",
+            "# TYPE app_latency_seconds histogram",
+        ]
+        errors = [
+            "# HELP app_errors_total Failed calls by layer and name.",
+            "# TYPE app_errors_total counter",
+        ]
+        for (layer, name), histogram in self._snapshot():
+            labels = f'layer="{_escape_label(layer)}",name="{_escape_label(name)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS_MS, histogram.buckets):
+                cumulative += bucket_count
+                lines.append(f'app_latency_seconds_bucket{{{labels},le="{bound / 1000:g}"}} {cumulative}')
+            lines.append(f'app_latency_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"app_latency_seconds_sum{{{labels}}} {histogram.sum_ms / 1000:.6f}")
+            lines.append(f"app_latency_seconds_count{{{labels}}} {histogram.count}")
+            errors.append(f"app_errors_total{{{labels}}} {histogram.errors}")
+        return "\n".join(lines + errors) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics_registry = MetricsRegistry(enabled=settings.METRICS_ENABLED)
+
+
+def record_latency(layer: str, name: str, duration_ms: float, error: bool = False) -> None:
+    """拦截器调用入口"""
+    metrics_registry.observe(layer, name, duration_ms, error)
+
+
+# 运行统计提供者 {name: () -> dict}
+_stats_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_stats_provider(name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+    """注册一组运行统计，指标接口以 name 为 key 输出（同名覆盖）"""
+    _stats_providers[name] = provider
+
+
+def get_provider_stats() -> Dict[str, Dict[str, Any]]:
+    """调用所有已注册的统计提供者（单个失败不影响其他）"""
+    result: Dict[str, Dict[str, Any]] = {}
+    for name, provider in list(_stats_providers.items()):
+        try:
+            result[name] = provider()
+        except Exception as e:
+            result[name] = {"error": str(e)}
+    return result
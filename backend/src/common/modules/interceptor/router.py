@@ -4,17 +4,22 @@ Router Interceptor - HTTP 请求/响应日志中间件
 职责：记录 Router 层日志
 - 请求/响应日志
 - 性能监控（慢请求警告）
+- 延迟直方图（按 "METHOD 路由模板" 统计，见 metrics.py）
+
+纯 ASGI 中间件（不继承 BaseHTTPMiddleware）：不为每个请求创建额外的任务和
+响应流，流式响应直接透传。
 """
 import logging
 import time
-from typing import Callable, Optional
+from typing import Optional
 from uuid import UUID
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from .error import get_client_ip
+from .metrics import record_latency
 
 logger = logging.getLogger(__name__)
 
@@ -49,47 +54,83 @@ def determine_log_level(status_code: int, duration_ms: float) -> str:
     return "INFO"
 
 
-def extract_user_id_from_token(request: Request) -> Optional[str]:
-    """从 Authorization header 中提取 user_id（不验证用户是否存在）"""
-    try:
-        auth_header = request.headers.get("authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return None
-        
-        token = auth_header[7:]  # Remove "Bearer " prefix
-        if not token:
-            return None
-        
-        from jose import jwt
-        from ..config import settings
-        
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id = payload.get("sub")
-        return user_id
-    except Exception:
-        # Token invalid or expired - return None silently
+def get_route_name(request: Request) -> str:
+    """指标名：使用路由模板而非实际路径，避免 /items/{id} 产生无限多个 series"""
+    route = request.scope.get("route")
+    path = getattr(route, "path", None)
+    return f"{request.method} {path}" if path else f"{request.method} <unmatched>"
+
+
+_UNSET = object()
+
+
+def _get_bearer_token(request: Request) -> Optional[str]:
+    auth_header = request.headers.get("authorization", "")
+    if not auth_header.startswith("Bearer "):
         return None
+    return auth_header[7:] or None  # Remove "Bearer " prefix
+
+
+def get_token_claims(request: Request) -> Optional[dict]:
+    """
+    解码 Authorization header 中的 JWT 并缓存到 request.state（每个请求只解码一次）
+
+    request.state.token / request.state.token_claims 供后续依赖（get_current_user）
+    复用；token 缺失、无效或过期时 claims 为 None。
+    """
+    state = request.state
+    cached = getattr(state, "token_claims", _UNSET)
+    if cached is not _UNSET:
+        return cached
+
+    token = _get_bearer_token(request)
+    claims = None
+    if token:
+        try:
+            from jose import jwt
+            from ..config import settings
+
+            claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except Exception:
+            # Token invalid or expired - return None silently
+            claims = None
+
+    state.token = token
+    state.token_claims = claims
+    return claims
+
+
+def extract_user_id_from_token(request: Request) -> Optional[str]:
+    """从 Authorization header 中提取 user_id（不验证用户是否存在，复用缓存的 claims）"""
+    claims = get_token_claims(request)
+    return claims.get("sub") if claims else None
 
 
-class HTTPLoggingMiddleware(BaseHTTPMiddleware):
+class HTTPLoggingMiddleware:
     """
-    HTTP 日志中间件
+    HTTP 日志中间件（纯 ASGI 实现）
 
     - 记录请求方法、路径、IP
     - 记录响应状态码和耗时
     - 慢请求 WARNING 级别日志
     - 自动生成/传递 trace_id
+    - JWT 只解码一次，claims 缓存在 request.state
+    - 不包装响应体，流式响应逐块透传
     """
 
     def __init__(self, app: ASGIApp, debug: bool = False):
-        super().__init__(app)
+        self.app = app
         self.debug = debug
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        from ..logger import logging_service
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         from ..logger.request import set_request_context, get_trace_id, get_request_id
-        from ..logger.schemas import AppLogCreate, PerformanceLogCreate
 
+        # Request 只是 scope 的视图，request.state 与下游共享 scope["state"]
+        request = Request(scope)
         trace_id = get_trace_id(request)
         request_id = get_request_id(request, trace_id)
 
@@ -109,92 +150,111 @@ class HTTPLoggingMiddleware(BaseHTTPMiddleware):
             user_agent=user_agent,
         )
 
-        # 尝试在请求处理前提取 user_id，用于异常处理时记录
+        # 在请求处理前提取 user_id，用于异常处理时记录
         # 这样即使请求处理过程中发生异常，也能记录 user_id
-        pre_user_id_str = extract_user_id_from_token(request)
-        if pre_user_id_str:
-            try:
-                request.state.user_id = UUID(pre_user_id_str)
-            except (ValueError, TypeError):
-                request.state.user_id = None
-        else:
+        user_id_str = extract_user_id_from_token(request)
+        try:
+            request.state.user_id = UUID(user_id_str) if user_id_str else None
+        except (ValueError, TypeError):
             request.state.user_id = None
 
+        status_code = 500
+        debug = self.debug
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if debug:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-Trace-Id"] = trace_id
+                    headers["X-Request-Id"] = request_id
+            await send(message)
+
         start_time = time.time()
-        response = await call_next(request)
-        duration_ms = (time.time() - start_time) * 1000
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 耗时包含完整响应体（流式响应到最后一块发送完毕）
+            duration_ms = (time.time() - start_time) * 1000
+            record_latency("Router", get_route_name(request), duration_ms, error=status_code >= 500)
+            if not should_skip_logging(request.url.path):
+                await self._log_request(
+                    request, status_code, duration_ms, trace_id, request_id, ip_address, user_agent,
+                )
 
-        # 从 token 中提取 user_id（在请求处理后，确保 token 已被验证）
-        user_id_str = extract_user_id_from_token(request)
-        user_id = UUID(user_id_str) if user_id_str else None
-        
-        # 更新 request.state.user_id（可能在请求处理过程中被更新）
-        if user_id:
-            request.state.user_id = user_id
+    async def _log_request(
+        self,
+        request: Request,
+        status_code: int,
+        duration_ms: float,
+        trace_id: str,
+        request_id: str,
+        ip_address: Optional[str],
+        user_agent: Optional[str],
+    ) -> None:
+        from ..logger import logging_service
+        from ..logger.schemas import AppLogCreate, PerformanceLogCreate
 
-        log_level = determine_log_level(response.status_code, duration_ms)
+        # request.state.user_id 可能在请求处理过程中被更新
+        user_id = getattr(request.state, "user_id", None)
+
+        log_level = determine_log_level(status_code, duration_ms)
         is_slow = duration_ms > SLOW_REQUEST_THRESHOLD_MS
 
-        log_message = f"HTTP: {request.method} {request.url.path} -> {response.status_code}"
+        log_message = f"HTTP: {request.method} {request.url.path} -> {status_code}"
+
+        try:
+            await logging_service.log(
+                AppLogCreate(
+                    source="backend",
+                    level=log_level,
+                    message=log_message,
+                    layer="Router",
+                    module="src.common.modules.interceptor",
+                    function="dispatch",
+                    line_number=100,
+                    file_path="src/common/modules/interceptor/router.py",
+                    trace_id=trace_id,
+                    request_id=request_id,
+                    user_id=user_id,
+                    ip_address=ip_address,
+                    user_agent=user_agent,
+                    request_method=request.method,
+                    request_path=request.url.path,
+                    response_status=status_code,
+                    duration_ms=int(duration_ms),
+                )
+            )
 
-        if not should_skip_logging(request.url.path):
-            try:
-                await logging_service.log(
-                    AppLogCreate(
+            if is_slow:
+                await logging_service.performance(
+                    PerformanceLogCreate(
                         source="backend",
-                        level=log_level,
-                        message=log_message,
+                        metric_name="slow_api_response",
+                        metric_value=duration_ms,
+                        metric_unit="ms",
+                        level="WARNING",
                         layer="Router",
                         module="src.common.modules.interceptor",
                         function="dispatch",
-                        line_number=100,
+                        line_number=148,
                         file_path="src/common/modules/interceptor/router.py",
                         trace_id=trace_id,
                         request_id=request_id,
                         user_id=user_id,
-                        ip_address=ip_address,
-                        user_agent=user_agent,
-                        request_method=request.method,
-                        request_path=request.url.path,
-                        response_status=response.status_code,
                         duration_ms=int(duration_ms),
+                        threshold_ms=float(SLOW_REQUEST_THRESHOLD_MS),
+                        is_slow=True,
+                        extra_data={
+                            "request_method": request.method,
+                            "request_path": request.url.path,
+                            "response_status": status_code,
+                        },
                     )
                 )
-
-                if is_slow:
-                    await logging_service.performance(
-                        PerformanceLogCreate(
-                            source="backend",
-                            metric_name="slow_api_response",
-                            metric_value=duration_ms,
-                            metric_unit="ms",
-                            level="WARNING",
-                            layer="Router",
-                            module="src.common.modules.interceptor",
-                            function="dispatch",
-                            line_number=148,
-                            file_path="src/common/modules/interceptor/router.py",
-                            trace_id=trace_id,
-                            request_id=request_id,
-                            user_id=user_id,
-                            duration_ms=int(duration_ms),
-                            threshold_ms=float(SLOW_REQUEST_THRESHOLD_MS),
-                            is_slow=True,
-                            extra_data={
-                                "request_method": request.method,
-                                "request_path": request.url.path,
-                                "response_status": response.status_code,
-                            },
-                        )
-                    )
-            except Exception as e:
-                logger.warning(f"Failed to record log: {e}")
-
-        if self.debug:
-            response.headers["X-Trace-Id"] = trace_id
-            response.headers["X-Request-Id"] = request_id
-
-        return response
+        except Exception as e:
+            logger.warning(f"Failed to record log: {e}")
 
 
 def add_logging_middleware(app, debug: bool = False):
@@ -207,5 +267,6 @@ __all__ = [
     "add_logging_middleware",
     "should_skip_logging",
     "determine_log_level",
+    "get_token_claims",
     "SLOW_REQUEST_THRESHOLD_MS",
 ]
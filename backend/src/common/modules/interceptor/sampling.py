@@ -0,0 +1,107 @@
+"""
+Log Sampling - 拦截器日志采样与限流
+
+拦截器为每次 Service 方法调用和每次数据库操作都生成一条日志，每条日志
+都要经过 schema 校验、文件写入和数据库插入。这里在生成日志之前做决策：
+
+- 尾部规则：慢调用和失败调用始终记录（不受采样和限流影响）
+- 头部采样：成功且快速的调用，每个 (layer, function) 每 N 次记录 1 次
+- 令牌桶限流：通过采样的日志，每个 (layer, function) 每秒最多 rate 条（允许 burst 突发）
+
+被记录的采样日志在 extra_data 中带 sample_rate，统计时可按 N 还原总量。
+"""
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+
+class LogSampler:
+    """头部采样 + 尾部规则 + 令牌桶限流（线程安全）"""
+
+    def __init__(self, sample_rate: int = 1, rate_limit_per_second: float = 0.0, rate_limit_burst: int = 0):
+        self.sample_rate = max(1, int(sample_rate))
+        self.rate_limit = max(0.0, float(rate_limit_per_second))
+        self.burst = float(max(1, rate_limit_burst or int(self.rate_limit) or 1))
+        self._lock = threading.Lock()
+        # 每个 (layer, function) 的调用计数
+        self._counters: Dict[Tuple[str, str], int] = {}
+        # 每个 (layer, function) 的令牌桶 [tokens, last_refill]
+        self._buckets: Dict[Tuple[str, str], List[float]] = {}
+        self._stats = {"logged": 0, "forced": 0, "sampled_out": 0, "rate_limited": 0}
+
+    @classmethod
+    def from_config(cls, config: Any) -> "LogSampler":
+        return cls(config.sample_rate, config.rate_limit_per_second, config.rate_limit_burst)
+
+    def should_log(self, layer: str, function: str, slow: bool = False, failed: bool = False) -> bool:
+        """判断本次调用是否需要生成日志"""
+        with self._lock:
+            if slow or failed:
+                self._stats["forced"] += 1
+                return True
+
+            key = (layer, function)
+            if self.sample_rate > 1:
+                count = self._counters.get(key, 0)
+                self._counters[key] = count + 1
+                if count % self.sample_rate:
+                    self._stats["sampled_out"] += 1
+                    return False
+
+            if self.rate_limit > 0 and not self._take_token(key):
+                self._stats["rate_limited"] += 1
+                return False
+
+            self._stats["logged"] += 1
+            return True
+
+    def _take_token(self, key: Tuple[str, str]) -> bool:
+        """从令牌桶取一个令牌（调用方持有锁）"""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now]
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate_limit)
+            bucket[1] = now
+        if bucket[0] < 1:
+            return False
+        bucket[0] -= 1
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            decisions = sum(self._stats.values())
+            emitted = self._stats["logged"] + self._stats["forced"]
+            return {
+                **self._stats,
+                "sample_rate": self.sample_rate,
+                "rate_limit_per_second": self.rate_limit,
+                "keys": len(self._counters.keys() | self._buckets.keys()),
+                "emit_ratio": round(emitted / decisions, 4) if decisions else 1.0,
+            }
+
+
+# 每个 layer + 采样参数一个采样器，首次使用时按配置创建
+_samplers: Dict[Tuple[str, int, float, int], LogSampler] = {}
+_samplers_lock = threading.Lock()
+
+
+def get_sampler(layer: str, config: Any) -> LogSampler:
+    """获取 layer 和配置对应的采样器（相同配置的方法共享计数与统计）"""
+    key = (layer, config.sample_rate, config.rate_limit_per_second, config.rate_limit_burst)
+    sampler = _samplers.get(key)
+    if sampler is None:
+        with _samplers_lock:
+            sampler = _samplers.get(key)
+            if sampler is None:
+                sampler = _samplers[key] = LogSampler.from_config(config)
+    return sampler
+
+
+def get_sampling_stats() -> Dict[str, Dict[str, Any]]:
+    """各采样器的统计，key 形如 "Service:1/10" """
+    return {
+        f"{layer}:1/{sampler.sample_rate}": sampler.get_stats()
+        for (layer, *_), sampler in list(_samplers.items())
+    }
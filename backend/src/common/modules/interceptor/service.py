@@ -5,25 +5,39 @@ Service Interceptor - AOP 风格的 Service 层拦截器实现
 - 日志记录（方法调用、参数、耗时）
 - 异常处理（捕获、分类、记录）
 - 性能监控（慢方法警告）
+- 日志采样与限流（慢调用和失败调用始终记录，见 sampling.py）
+- 延迟直方图（所有调用都计入，见 metrics.py）
+
+调用路径上只做计时、采样决策和入队：参数名在装饰时预先计算，参数序列化
+和日志 schema 构建推迟到共享日志队列的消费任务中，且只对需要记录的调用进行。
 """
 import time
 import asyncio
 import functools
 import inspect
-from typing import Any, Callable, Optional, TypeVar, Type
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, TypeVar, Type
 from uuid import UUID
 
 from .config import InterceptorConfig
+from .sampling import get_sampler
+from .metrics import record_latency
 
 # Type variables for generic decorators
 T = TypeVar('T')
 F = TypeVar('F', bound=Callable[..., Any])
 
 
+_logging_service = None
+
+
 def _get_logging_service():
-    """延迟导入避免循环依赖"""
-    from ..logger.service import logging_service
-    return logging_service
+    """延迟导入避免循环依赖（首次导入后缓存）"""
+    global _logging_service
+    if _logging_service is None:
+        from ..logger.service import logging_service
+        _logging_service = logging_service
+    return _logging_service
 
 
 def _get_app_log_create():
@@ -88,16 +102,21 @@ def _serialize_arg(value: Any, max_length: int) -> Any:
     return _truncate_value(value, max_length)
 
 
+def _get_param_names(func: Callable) -> Tuple[str, ...]:
+    """获取参数名（装饰时调用一次，替代每次调用 inspect.signature）"""
+    try:
+        return tuple(inspect.signature(func).parameters)
+    except (TypeError, ValueError):
+        return ()
+
+
 def _build_args_dict(
-    func: Callable, 
+    params: Tuple[str, ...],
     args: tuple, 
     kwargs: dict, 
     config: InterceptorConfig
 ) -> dict:
     """构建参数字典"""
-    sig = inspect.signature(func)
-    params = list(sig.parameters.keys())
-    
     args_dict = {}
     
     # 处理位置参数（跳过 self）
@@ -137,10 +156,13 @@ async def _log_method_call(
     error: Optional[Exception] = None,
     layer: str = "Service",
     line_number: Optional[int] = None,
+    sample_rate: int = 1,
+    context: Optional[dict] = None,
 ):
-    """记录方法调用日志"""
+    """记录方法调用日志（context 为调用时捕获的请求上下文）"""
     try:
-        context = _get_request_context()
+        if context is None:
+            context = _get_request_context()
         trace_id = context.get("trace_id")
         request_id = context.get("request_id")
         user_id = context.get("user_id")
@@ -169,6 +191,10 @@ async def _log_method_call(
         if config.log_result and result is not None and success:
             extra_data["result"] = _serialize_arg(result, config.max_result_length)
         
+        if sample_rate > 1:
+            # 采样日志：1 条代表 sample_rate 次调用
+            extra_data["sample_rate"] = sample_rate
+        
         if error:
             extra_data["error"] = str(error)
             extra_data["error_type"] = type(error).__name__
@@ -220,6 +246,152 @@ async def _log_method_call(
         logging.error(f"Failed to log service method call: {log_exc}", exc_info=True)
 
 
+class _MethodInfo:
+    """被拦截方法的静态信息（装饰时计算一次）"""
+
+    __slots__ = (
+        "func", "name", "param_names", "line_number", "owner_class",
+        "is_static", "layer", "config", "sampler", "metric_name",
+    )
+
+    def __init__(self, func: Callable, config: InterceptorConfig, owner_class: Optional[Type], is_static: bool, layer: str):
+        self.func = func
+        self.name = func.__name__
+        self.param_names = _get_param_names(func)
+        self.line_number = _get_function_line_number(func)
+        self.owner_class = owner_class
+        self.is_static = is_static
+        self.layer = layer
+        self.config = config
+        self.sampler = get_sampler(layer, config)
+        self.metric_name = f"{owner_class.__name__}.{func.__name__}" if owner_class else func.__qualname__
+
+    def class_name(self, args: tuple) -> str:
+        if self.owner_class:
+            return self.owner_class.__name__
+        if self.is_static:
+            return "Unknown"
+        return args[0].__class__.__name__ if args else "Unknown"
+
+
+class _MethodLogRecord:
+    """待记录的一次调用（参数保持原样引用，消费时才序列化）"""
+
+    __slots__ = ("info", "args", "kwargs", "duration_ms", "result", "error", "sample_rate", "context")
+
+    def __init__(self, info, args, kwargs, duration_ms, result, error, sample_rate, context):
+        self.info = info
+        self.args = args
+        self.kwargs = kwargs
+        self.duration_ms = duration_ms
+        self.result = result
+        self.error = error
+        self.sample_rate = sample_rate
+        self.context = context
+
+
+class _MethodLogQueue:
+    """
+    所有被拦截方法共享的日志队列
+
+    调用方只追加记录；队列从空变为非空时才创建一个消费任务，由它依次构建并
+    写出所有记录，而不是每次调用 create_task 一次。
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self._records: Deque[_MethodLogRecord] = deque()
+        self._maxsize = maxsize
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"enqueued": 0, "emitted": 0, "dropped": 0, "drain_tasks": 0}
+
+    def put(self, loop: asyncio.AbstractEventLoop, record: _MethodLogRecord) -> None:
+        if len(self._records) >= self._maxsize:
+            self._stats["dropped"] += 1
+            return
+        self._records.append(record)
+        self._stats["enqueued"] += 1
+        task = self._task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._task = loop.create_task(self._drain())
+            self._stats["drain_tasks"] += 1
+
+    async def _drain(self) -> None:
+        while self._records:
+            record = self._records.popleft()
+            info = record.info
+            config = info.config
+            args_dict = (
+                _build_args_dict(info.param_names, record.args, record.kwargs, config)
+                if config.log_args else None
+            )
+            await _log_method_call(
+                info.class_name(record.args), info.name, record.duration_ms, record.error is None, config,
+                args_dict=args_dict, result=record.result, error=record.error, layer=info.layer,
+                line_number=info.line_number, sample_rate=record.sample_rate, context=record.context,
+            )
+            self._stats["emitted"] += 1
+            if self._stats["emitted"] % 100 == 0:
+                # 积压较多时让出事件循环，避免阻塞请求处理
+                await asyncio.sleep(0)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self._stats, "pending": len(self._records)}
+
+
+_method_log_queue = _MethodLogQueue()
+
+# 日志级别是否会被任一写入端接收（级别配置在启动时确定，按级别缓存）
+_level_enabled: Dict[str, bool] = {}
+
+
+def _is_level_enabled(level: str) -> bool:
+    enabled = _level_enabled.get(level)
+    if enabled is None:
+        enabled = _level_enabled[level] = _get_logging_service().is_enabled(level)
+    return enabled
+
+
+def get_method_log_queue_stats() -> Dict[str, int]:
+    """Service 层日志队列统计"""
+    return _method_log_queue.get_stats()
+
+
+def _after_call(
+    info: _MethodInfo,
+    args: tuple,
+    kwargs: dict,
+    start_time: float,
+    result: Any = None,
+    error: Optional[Exception] = None,
+) -> None:
+    """调用结束：计入直方图，决定是否记录日志，需要时入队"""
+    duration_ms = (time.perf_counter() - start_time) * 1000
+    failed = error is not None
+    record_latency(info.layer, info.metric_name, duration_ms, error=failed)
+    
+    config = info.config
+    is_slow = duration_ms > config.slow_threshold_ms
+    forced = is_slow or failed
+    # 快速路径：成功日志的级别两个写入端都不接收时，直接跳过（不计入采样）
+    if not forced and not _is_level_enabled(config.log_level):
+        return
+    if not info.sampler.should_log(info.layer, info.metric_name, slow=is_slow, failed=failed):
+        return
+    
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return  # 没有事件循环，跳过日志
+    
+    _method_log_queue.put(loop, _MethodLogRecord(
+        info, args, kwargs, duration_ms,
+        result if config.log_result else None,
+        error,
+        1 if forced else info.sampler.sample_rate,
+        _get_request_context(),
+    ))
+
+
 def intercept_method(
     config: Optional[InterceptorConfig] = None,
     log_args: bool = True,
@@ -231,6 +403,9 @@ def intercept_method(
     """
     方法装饰器 - 拦截单个方法
     
+    成功且快速的调用按 config.sample_rate 采样并按 (layer, function) 限流，
+    慢调用和失败调用始终记录。
+    
     Usage:
         @intercept_method(log_args=True)
         async def my_method(self, arg1, arg2):
@@ -239,96 +414,33 @@ def intercept_method(
     _config = config or InterceptorConfig(log_args=log_args, log_result=log_result)
     
     def decorator(func: F) -> F:
-        # 在装饰时获取行号（只获取一次）
-        func_line_number = _get_function_line_number(func)
+        # 在装饰时计算行号、参数名和指标名（只计算一次）
+        info = _MethodInfo(func, _config, owner_class, is_static, layer)
         
         if asyncio.iscoroutinefunction(func):
             @functools.wraps(func)
             async def async_wrapper(*args, **kwargs):
-                # 获取类名
-                if owner_class:
-                    class_name = owner_class.__name__
-                elif is_static:
-                    class_name = "Unknown"
-                else:
-                    class_name = args[0].__class__.__name__ if args else "Unknown"
-                method_name = func.__name__
-                
-                # 构建参数字典
-                args_dict = _build_args_dict(func, args, kwargs, _config) if _config.log_args else None
-                
-                start_time = time.time()
+                start_time = time.perf_counter()
                 try:
                     result = await func(*args, **kwargs)
-                    duration_ms = (time.time() - start_time) * 1000
-                    
-                    # 异步记录日志（不阻塞）
-                    asyncio.create_task(_log_method_call(
-                        class_name, method_name, duration_ms, True, _config,
-                        args_dict=args_dict, result=result, layer=layer,
-                        line_number=func_line_number
-                    ))
-                    
-                    return result
-                    
                 except Exception as exc:
-                    duration_ms = (time.time() - start_time) * 1000
-                    
-                    # 异步记录错误日志
-                    asyncio.create_task(_log_method_call(
-                        class_name, method_name, duration_ms, False, _config,
-                        args_dict=args_dict, error=exc, layer=layer,
-                        line_number=func_line_number
-                    ))
-                    
+                    _after_call(info, args, kwargs, start_time, error=exc)
                     raise
+                _after_call(info, args, kwargs, start_time, result=result)
+                return result
             
             return async_wrapper  # type: ignore
         else:
             @functools.wraps(func)
             def sync_wrapper(*args, **kwargs):
-                if owner_class:
-                    class_name = owner_class.__name__
-                elif is_static:
-                    class_name = "Unknown"
-                else:
-                    class_name = args[0].__class__.__name__ if args else "Unknown"
-                method_name = func.__name__
-                
-                args_dict = _build_args_dict(func, args, kwargs, _config) if _config.log_args else None
-                
-                start_time = time.time()
+                start_time = time.perf_counter()
                 try:
                     result = func(*args, **kwargs)
-                    duration_ms = (time.time() - start_time) * 1000
-                    
-                    # 同步上下文中调度异步日志
-                    try:
-                        loop = asyncio.get_running_loop()
-                        loop.create_task(_log_method_call(
-                            class_name, method_name, duration_ms, True, _config,
-                            args_dict=args_dict, result=result, layer=layer,
-                            line_number=func_line_number
-                        ))
-                    except RuntimeError:
-                        pass  # 没有事件循环，跳过日志
-                    
-                    return result
-                    
                 except Exception as exc:
-                    duration_ms = (time.time() - start_time) * 1000
-                    
-                    try:
-                        loop = asyncio.get_running_loop()
-                        loop.create_task(_log_method_call(
-                            class_name, method_name, duration_ms, False, _config,
-                            args_dict=args_dict, error=exc, layer=layer,
-                            line_number=func_line_number
-                        ))
-                    except RuntimeError:
-                        pass
-                    
+                    _after_call(info, args, kwargs, start_time, error=exc)
                     raise
+                _after_call(info, args, kwargs, start_time, result=result)
+                return result
             
             return sync_wrapper  # type: ignore
     
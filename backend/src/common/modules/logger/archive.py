@@ -0,0 +1,203 @@
+"""Rotated log file archives: naming, compression and streaming search.
+
+Rotated files are named ``<stem>.<YYYY-MM-DD>.<seq>.log`` and compressed in
+the background to ``.log.gz`` (gzip, stdlib) or ``.log.zst`` (zstd, needs the
+optional ``zstandard`` package). Legacy names without a sequence number
+(``app.2025-01-01.log``) and with a time suffix (``app.2025-01-01.235959.log``)
+are recognised too.
+
+Search reads files line by line through a streaming decompressor, so an
+archive is never loaded into memory as a whole.
+"""
+import gzip
+import io
+import json
+import logging
+import os
+import re
+import shutil
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+LOG_STEMS = ("app", "error", "audit", "performance", "system")
+
+ARCHIVE_PATTERN = re.compile(
+    r"^(?P<stem>[a-z]+)\.(?P<date>\d{4}-\d{2}-\d{2})(?:\.(?P<seq>\d+))?\.log(?P<ext>\.gz|\.zst)?$"
+)
+
+COMPRESSION_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def parse_archive_name(name: str) -> Optional[Tuple[str, str, int]]:
+    """Parse an archive file name into (stem, date, seq), or None if it is not one."""
+    match = ARCHIVE_PATTERN.match(name)
+    if not match:
+        return None
+    return match.group("stem"), match.group("date"), int(match.group("seq") or 0)
+
+
+def archive_sort_key(path: Path) -> Tuple[str, int, str]:
+    """Chronological sort key for archives (date, then sequence)."""
+    parsed = parse_archive_name(path.name)
+    if parsed is None:
+        return ("", 0, path.name)
+    _, day, seq = parsed
+    return (day, seq, path.name)
+
+
+def list_archives(logs_dir: Path, stem: Optional[str] = None) -> List[Path]:
+    """List rotated archives, oldest first (one directory listing)."""
+    if not logs_dir.exists():
+        return []
+    archives = []
+    for entry in os.scandir(logs_dir):
+        if not entry.is_file():
+            continue
+        parsed = parse_archive_name(entry.name)
+        if parsed and (stem is None or parsed[0] == stem):
+            archives.append(Path(entry.path))
+    archives.sort(key=archive_sort_key)
+    return archives
+
+
+def next_archive_path(file_path: Path, day: date) -> Path:
+    """Next rotated name for a log file on a given day.
+
+    Uses one past the highest existing sequence, so a name freed by retention
+    is never reused for a newer file.
+    """
+    date_str = day.strftime("%Y-%m-%d")
+    seq = 0
+    for existing in file_path.parent.glob(f"{file_path.stem}.{date_str}.*"):
+        parsed = parse_archive_name(existing.name)
+        if parsed and parsed[0] == file_path.stem:
+            seq = max(seq, parsed[2])
+    return file_path.parent / f"{file_path.stem}.{date_str}.{seq + 1}{file_path.suffix}"
+
+
+def resolve_compression(method: str) -> Optional[str]:
+    """Validate the configured compression, falling back to gzip if zstd is unavailable."""
+    method = (method or "none").lower()
+    if method in ("", "none", "off"):
+        return None
+    if method == "zstd":
+        try:
+            import zstandard  # noqa: F401  optional dependency
+            return "zstd"
+        except ImportError:
+            logging.warning("zstandard package not installed, compressing log archives with gzip")
+            return "gzip"
+    return "gzip"
+
+
+def compress_file(path: Path, method: str) -> Path:
+    """Compress a rotated log file next to itself and remove the original.
+
+    Writes to a temporary name first so a crash never leaves a truncated
+    archive under the final name.
+    """
+    target = path.with_name(path.name + COMPRESSION_EXTENSIONS[method])
+    tmp = target.with_name(target.name + ".tmp")
+    with open(path, "rb") as src:
+        if method == "zstd":
+            import zstandard
+            with open(tmp, "wb") as raw, zstandard.ZstdCompressor(level=3).stream_writer(raw) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+        else:
+            with gzip.open(tmp, "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+    tmp.replace(target)
+    path.unlink()
+    return target
+
+
+def open_log_text(path: Path) -> TextIO:
+    """Open a current or archived log file as a streaming text reader."""
+    if path.name.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    if path.name.endswith(".zst"):
+        import zstandard
+        raw = open(path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(reader, encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def _matches(record: Dict[str, Any], level: Optional[str], trace_id: Optional[str]) -> bool:
+    if level and str(record.get("level", "")).upper() != level.upper():
+        return False
+    if trace_id and record.get("trace_id") != trace_id:
+        return False
+    return True
+
+
+def search_log_files(
+    logs_dir: Path,
+    stem: str,
+    keyword: Optional[str] = None,
+    level: Optional[str] = None,
+    trace_id: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    include_archives: bool = True,
+    limit: int = 100,
+) -> Dict[str, Any]:
+    """Search a log type's current file and archives, newest file first.
+
+    Files are streamed line by line; the keyword test runs on the raw line
+    before any JSON parsing. Archives outside [start_date, end_date] are
+    skipped by name without being opened.
+
+    Returns:
+        {"items": [...], "files_scanned": int, "truncated": bool}
+    """
+    files: List[Path] = [logs_dir / f"{stem}.log"]
+    if include_archives:
+        archives = list_archives(logs_dir, stem)
+        archives.reverse()
+        for archive in archives:
+            _, day_str, _ = parse_archive_name(archive.name)
+            day = date.fromisoformat(day_str)
+            if (start_date and day < start_date) or (end_date and day > end_date):
+                continue
+            files.append(archive)
+
+    needle = keyword.lower() if keyword else None
+    items: List[Dict[str, Any]] = []
+    files_scanned = 0
+
+    for path in files:
+        if not path.exists():
+            continue
+        files_scanned += 1
+        with open_log_text(path) as f:
+            for line in f:
+                if needle and needle not in line.lower():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = {"message": line.rstrip("\n")}
+                if not isinstance(record, dict) or not _matches(record, level, trace_id):
+                    continue
+                record["_file"] = path.name
+                items.append(record)
+                if len(items) >= limit:
+                    return {"items": items, "files_scanned": files_scanned, "truncated": True}
+
+    return {"items": items, "files_scanned": files_scanned, "truncated": False}
+
+
+def iter_archive_info(logs_dir: Path) -> Iterator[Dict[str, Any]]:
+    """Name, size and date of every archive (for listing endpoints)."""
+    for path in list_archives(logs_dir):
+        stem, day, seq = parse_archive_name(path.name)
+        yield {
+            "name": path.name,
+            "log_type": stem,
+            "date": day,
+            "sequence": seq,
+            "size": path.stat().st_size,
+            "compressed": path.suffix in (".gz", ".zst"),
+        }
@@ -4,7 +4,7 @@ import logging
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from ..config import settings
 from .filters import SensitiveDataFilter, ContextFilter
@@ -37,6 +37,24 @@ class LogConfig:
         # Queue settings
         max_queue_size: Maximum queue size before dropping logs
         
+        # Database write concurrency
+        db_max_concurrency: Maximum concurrent database inserts (off the event loop)
+        db_queue_settings: Per log type overrides of batch_size / batch_interval
+        db_flush_on_critical: Flush a queue immediately when a CRITICAL entry is queued
+        
+        # Spill-to-disk spool (database writer)
+        spool_enabled: Spill overflow and failed batches to disk and replay them later
+        spool_max_bytes: Disk budget for the spool
+        spool_segment_bytes: Size of one spool segment file
+        spool_replay_interval: Seconds between replay attempts
+        
+        # File writer settings
+        file_batch_size: Max lines written per batch by the file writer
+        file_fsync_interval: Seconds between fsync (0 = every batch, <0 = never)
+        file_max_bytes: Rotate a log file once it reaches this size (also rotated daily)
+        file_compression: Compression for rotated files (gzip/zstd/none)
+        file_retention_bytes: Total size budget for rotated archives
+        
         # Feature flags
         db_enabled: Whether database logging is enabled
         file_enabled: Whether file logging is enabled
@@ -62,6 +80,24 @@ class LogConfig:
     # Queue settings
     max_queue_size: int = 10000
     
+    # Database write concurrency
+    db_max_concurrency: int = 4
+    db_queue_settings: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    db_flush_on_critical: bool = True
+    
+    # Spill-to-disk spool (database writer)
+    spool_enabled: bool = True
+    spool_max_bytes: int = 104857600
+    spool_segment_bytes: int = 4194304
+    spool_replay_interval: float = 10.0
+    
+    # File writer settings
+    file_batch_size: int = 1000
+    file_fsync_interval: float = 1.0
+    file_max_bytes: int = 10485760
+    file_compression: str = "gzip"
+    file_retention_bytes: int = 1073741824
+    
     # Feature flags
     db_enabled: bool = True
     file_enabled: bool = True
@@ -108,6 +144,24 @@ class LogConfig:
             # Queue settings
             max_queue_size=10000,  # Fixed default, not in settings
             
+            # Database write concurrency
+            db_max_concurrency=getattr(settings, "LOG_DB_MAX_CONCURRENCY", 4),
+            db_queue_settings=getattr(settings, "LOG_DB_QUEUE_SETTINGS", {}),
+            db_flush_on_critical=getattr(settings, "LOG_DB_FLUSH_ON_CRITICAL", True),
+            
+            # Spill-to-disk spool
+            spool_enabled=getattr(settings, "LOG_DB_SPOOL_ENABLED", True),
+            spool_max_bytes=getattr(settings, "LOG_DB_SPOOL_MAX_BYTES", 104857600),
+            spool_segment_bytes=getattr(settings, "LOG_DB_SPOOL_SEGMENT_BYTES", 4194304),
+            spool_replay_interval=getattr(settings, "LOG_DB_SPOOL_REPLAY_INTERVAL", 10.0),
+            
+            # File writer settings
+            file_batch_size=getattr(settings, "LOG_FILE_WRITE_BATCH_SIZE", 1000),
+            file_fsync_interval=getattr(settings, "LOG_FILE_FSYNC_INTERVAL", 1.0),
+            file_max_bytes=getattr(settings, "LOG_FILE_MAX_BYTES", 10485760),
+            file_compression=getattr(settings, "LOG_FILE_COMPRESSION", "gzip"),
+            file_retention_bytes=getattr(settings, "LOG_FILE_RETENTION_BYTES", 1073741824),
+            
             # Feature flags
             db_enabled=getattr(settings, "LOG_DB_ENABLED", True),
             file_enabled=getattr(settings, "LOG_ENABLE_FILE", True),
@@ -152,6 +206,30 @@ class LogConfig:
             "audit": "DEBUG",
             "performance": "DEBUG",
         }.get(log_type, "INFO")
+    
+    def get_db_queue_settings(self, log_type: str) -> Tuple[int, float]:
+        """Get the database batch size and interval for a given log type.
+        
+        Error and audit logs default to smaller, faster batches so they reach
+        the database quickly; LOG_DB_QUEUE_SETTINGS overrides any of them,
+        e.g. {"error": {"batch_size": 10, "batch_interval": 0.5}}.
+        
+        Args:
+            log_type: Type of log (app, error, audit, performance, system)
+            
+        Returns:
+            Tuple of (batch_size, batch_interval)
+        """
+        defaults = {
+            "error": (20, 1.0),
+            "audit": (20, 1.0),
+        }
+        batch_size, batch_interval = defaults.get(log_type, (self.batch_size, self.batch_interval))
+        overrides = self.db_queue_settings.get(log_type) or {}
+        return (
+            int(overrides.get("batch_size", batch_size)),
+            float(overrides.get("batch_interval", batch_interval)),
+        )
 
 
 # Global config instance (lazy initialization)
@@ -1,15 +1,20 @@
 """Unified database log writer for all log types using Supabase API.
 
 This module provides unified asynchronous writing of all log types to Supabase database:
-- Application logs (app_logs) - batch processing
-- Error logs (error_logs) - single insert
-- System logs (system_logs) - single insert
-- Audit logs (audit_logs) - single insert
+- Application logs (app_logs)
+- Error logs (error_logs)
+- System logs (system_logs)
+- Audit logs (audit_logs)
+- Performance logs (performance_logs)
 
 Features:
 - Asynchronous queue-based writing (non-blocking)
-- Batch insertion for application logs (configurable batch size and interval)
-- Single insert for error/system/audit logs (immediate write)
+- One batch queue per log type, each with its own batch size and interval
+- Optional immediate flush when a CRITICAL entry is queued
+- All inserts run in a dedicated thread pool, never on the event loop thread
+- Bounded write concurrency with backpressure
+- Overflow and failed batches spill to a local disk spool and are replayed
+  once the database is reachable again (see spool.py)
 - Log level filtering (configurable) - inherited from BaseLogWriter
 - Failure handling with graceful degradation
 - Uses database models to ensure data structure consistency
@@ -20,6 +25,8 @@ Inherits from BaseLogWriter:
 """
 import asyncio
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, Optional, Union, TYPE_CHECKING
 from uuid import UUID, uuid4
@@ -27,6 +34,7 @@ from collections import deque
 
 from ..config import settings
 from .base_writer import BaseLogWriter
+from .spool import LogSpool
 # Import database models for consistent data structure
 from ..db.models import AppLog, ErrorLog, SystemLog, AuditLog, PerformanceLog
 
@@ -40,26 +48,10 @@ def _get_raw_supabase_client():
     return get_supabase_client()
 
 
-async def _async_insert(table_name: str, data: dict) -> Optional[dict]:
-    """异步插入数据到指定表，避免循环日志记录"""
-    try:
-        client = _get_raw_supabase_client()
-        # Run synchronous execute in thread pool
-        import asyncio
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None, 
-            lambda: client.table(table_name).insert(data).execute()
-        )
-        if result.data and len(result.data) > 0:
-            return result.data[0]
-        import logging
-        logging.warning(f"_async_insert to {table_name} returned empty result")
-        return None
-    except Exception as e:
-        import logging
-        logging.warning(f"_async_insert to {table_name} failed: {str(e)}")
-        return None
+def _insert_rows_sync(table_name: str, rows: Union[dict, list]) -> Any:
+    """同步插入一行或多行（在线程池中执行，避免阻塞事件循环）"""
+    client = _get_raw_supabase_client()
+    return client.table(table_name).insert(rows).execute()
 
 
 from ...utils.formatters import now_utc
@@ -74,11 +66,94 @@ def format_timestamp() -> str:
     return now_utc().isoformat()
 
 
+# Log types handled by the writer, mapped to their database tables
+LOG_TABLES: Dict[str, str] = {
+    "app": "app_logs",
+    "error": "error_logs",
+    "audit": "audit_logs",
+    "performance": "performance_logs",
+    "system": "system_logs",
+}
+
+# Rows per insert when replaying the spool
+SPOOL_REPLAY_BATCH_SIZE = 200
+# Replay attempts before a segment is set aside as dead
+SPOOL_MAX_REPLAY_ATTEMPTS = 5
+# Upper bound for the replay backoff (seconds)
+SPOOL_MAX_BACKOFF = 300.0
+
+
+class LogBatchQueue:
+    """Batch queue for a single log type with its own flush policy and statistics."""
+    
+    def __init__(
+        self,
+        log_type: str,
+        table_name: str,
+        batch_size: int,
+        batch_interval: float,
+        max_size: int,
+    ):
+        self.log_type = log_type
+        self.table_name = table_name
+        self.batch_size = max(1, batch_size)
+        self.batch_interval = batch_interval
+        self.queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=max_size)
+        self.worker_task: Optional[asyncio.Task] = None
+        # Set when an urgent (CRITICAL) entry is queued; worker flushes right away
+        self.flush_requested = False
+        # True while the worker is idle waiting for entries (safe to wake on shutdown)
+        self.idle = False
+        
+        # Statistics
+        self.enqueued = 0
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.flushes = 0
+        self.last_write_time: Optional[datetime] = None
+        self.last_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self._total_latency_ms = 0.0
+    
+    def record_flush(self, rows: int, success: bool, latency_ms: float) -> None:
+        """Record the outcome of one batch insert."""
+        self.flushes += 1
+        self.last_latency_ms = latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        self._total_latency_ms += latency_ms
+        if success:
+            self.written += rows
+            self.last_write_time = datetime.now()
+        else:
+            self.failed += rows
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue statistics."""
+        return {
+            "table": self.table_name,
+            "depth": self.queue.qsize(),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "flushes": self.flushes,
+            "batch_size": self.batch_size,
+            "batch_interval": self.batch_interval,
+            "last_write_time": self.last_write_time,
+            "last_latency_ms": round(self.last_latency_ms, 2),
+            "avg_latency_ms": round(self._total_latency_ms / self.flushes, 2) if self.flushes else 0.0,
+            "max_latency_ms": round(self.max_latency_ms, 2),
+        }
+
+
 class DatabaseLogWriter(BaseLogWriter):
     """Asynchronous batch database log writer using Supabase API.
     
-    Uses a queue-based approach where log entries are enqueued and written
-    in batches to reduce database overhead and avoid blocking requests.
+    Every log type has its own queue and background worker, and entries are
+    written in batches to reduce database overhead and avoid blocking requests.
     
     Inherits from BaseLogWriter:
     - LOG_LEVELS constant for log level priority mapping
@@ -109,158 +184,182 @@ class DatabaseLogWriter(BaseLogWriter):
         self.batch_interval = config.batch_interval
         self.min_log_level = config.db_level_app
         self.min_system_log_level = config.db_level_system
+        self.max_concurrency = max(1, config.db_max_concurrency)
+        self.flush_on_critical = config.db_flush_on_critical
         
         # Initialize base class with app log level
         super().__init__(min_level=self.min_log_level, enabled=config.db_enabled)
         
-        # Queue for log entries
-        self.log_queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=10000)
+        # One batch queue per log type, each with its own size and interval
+        self._queues: Dict[str, LogBatchQueue] = {}
+        for log_type, table_name in LOG_TABLES.items():
+            batch_size, batch_interval = config.get_db_queue_settings(log_type)
+            self._queues[log_type] = LogBatchQueue(
+                log_type, table_name, batch_size, batch_interval, config.max_queue_size
+            )
         
-        # Queue for performance log entries - Requirements 10.5
-        self.performance_queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=10000)
+        # Backward compatible aliases
+        self.log_queue = self._queues["app"].queue
+        self.performance_queue = self._queues["performance"].queue
         
         # Control flags
         self._shutdown_event = asyncio.Event()
-        self._worker_task: Optional[asyncio.Task] = None
-        self._performance_worker_task: Optional[asyncio.Task] = None
         
-        # Statistics
-        self._stats = {
-            "total_enqueued": 0,
-            "total_written": 0,
-            "total_failed": 0,
-            "last_write_time": None,
-            "performance_total_enqueued": 0,
-            "performance_total_written": 0,
-            "performance_total_failed": 0,
-            "performance_last_write_time": None,
-        }
+        # Dedicated thread pool for the blocking Supabase HTTP calls, so log
+        # writes never run on the event loop and never compete with request
+        # queries for the default executor
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="db-log-writer",
+        )
+        self._write_semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Event loop that owns the queues (for writes from other threads)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Spill-to-disk spool for overflow and failed batches. File I/O runs
+        # on its own single thread so a slow disk or a stuck insert pool
+        # never delays the other
+        self._spool: Optional[LogSpool] = None
+        self._spool_executor: Optional[ThreadPoolExecutor] = None
+        self._overflow: Dict[str, list[Dict[str, Any]]] = {}
+        self._spill_task: Optional[asyncio.Task] = None
+        self._replay_task: Optional[asyncio.Task] = None
+        self.spool_replay_interval = config.spool_replay_interval
+        if config.spool_enabled:
+            self._spool = LogSpool(
+                max_bytes=config.spool_max_bytes,
+                segment_bytes=config.spool_segment_bytes,
+            )
+            self._spool_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-log-spool")
         
         self._initialized = True
     
     def _ensure_worker_started(self) -> None:
-        """Ensure worker task is started (lazy initialization)."""
+        """Ensure worker tasks are started (lazy initialization)."""
         if not self.enabled:
             return
         
-        # Check if we're in an async context and worker is not running
+        # Check if we're in an async context and workers are not running
         try:
-            loop = asyncio.get_running_loop()
-            if self._worker_task is None or self._worker_task.done():
-                self._worker_task = asyncio.create_task(self._batch_worker_loop(self.log_queue, "app_logs", "app"))
-            if self._performance_worker_task is None or self._performance_worker_task.done():
-                self._performance_worker_task = asyncio.create_task(self._batch_worker_loop(self.performance_queue, "performance_logs", "performance"))
+            self._loop = asyncio.get_running_loop()
         except RuntimeError:
-            # No event loop running - worker will be started on first async call
-            pass
+            # No event loop running - workers will be started on first async call
+            return
+        
+        for batch_queue in self._queues.values():
+            if batch_queue.worker_task is None or batch_queue.worker_task.done():
+                batch_queue.worker_task = asyncio.create_task(self._batch_worker_loop(batch_queue))
+        
+        if self._spool and (self._replay_task is None or self._replay_task.done()):
+            self._replay_task = asyncio.create_task(self._replay_loop())
 
     # =========================================================================
     # Unified batch processing - 统一批量处理
     # =========================================================================
 
-    async def _batch_worker_loop(
-        self, 
-        queue: asyncio.Queue, 
-        table_name: str, 
-        log_type: str
-    ) -> None:
-        """Generic background worker task that processes log entries in batches.
+    async def _batch_worker_loop(self, batch_queue: LogBatchQueue) -> None:
+        """Background worker task that processes one queue's entries in batches.
+        
+        Flushes when the batch is full, when the queue's interval has elapsed,
+        or immediately when an urgent entry has been queued.
         
         Args:
-            queue: The asyncio queue to read from
-            table_name: Database table name for batch insert
-            log_type: Type of log for stats tracking (app or performance)
+            batch_queue: The queue to read from
         """
+        queue = batch_queue.queue
         batch: list[Dict[str, Any]] = []
-        last_flush_time = datetime.now()
+        last_flush_time = time.monotonic()
         
         while not self._shutdown_event.is_set():
             try:
                 # Try to get log entry with timeout
                 try:
-                    timeout = max(0.1, self.batch_interval - (datetime.now() - last_flush_time).total_seconds())
-                    log_entry = await asyncio.wait_for(queue.get(), timeout=timeout)
-                    batch.append(log_entry)
+                    timeout = max(0.1, batch_queue.batch_interval - (time.monotonic() - last_flush_time))
+                    batch_queue.idle = True
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout=timeout))
+                    finally:
+                        batch_queue.idle = False
+                    # Take whatever is already queued without awaiting per entry
+                    while len(batch) < batch_queue.batch_size:
+                        try:
+                            batch.append(queue.get_nowait())
+                        except asyncio.QueueEmpty:
+                            break
                 except asyncio.TimeoutError:
                     # Timeout - flush batch if not empty
                     pass
+                except asyncio.CancelledError:
+                    # close() wakes idle workers by cancelling the wait
+                    if self._shutdown_event.is_set():
+                        break
+                    raise
                 
                 # Check if we should flush the batch
                 should_flush = (
-                    len(batch) >= self.batch_size or
-                    (batch and (datetime.now() - last_flush_time).total_seconds() >= self.batch_interval)
+                    len(batch) >= batch_queue.batch_size or
+                    batch_queue.flush_requested or
+                    (time.monotonic() - last_flush_time) >= batch_queue.batch_interval
                 )
                 
                 if should_flush and batch:
-                    await self._flush_batch_to_table(batch, table_name, log_type)
-                    batch.clear()
-                    last_flush_time = datetime.now()
+                    await self._flush_batch_to_table(batch, batch_queue)
+                    batch = []
+                    last_flush_time = time.monotonic()
+                    if queue.empty():
+                        batch_queue.flush_requested = False
                     
             except Exception as e:
                 # Log error but continue processing
-                logging.error(f"Error in DatabaseLogWriter {log_type} worker loop: {e}", exc_info=True)
+                logging.error(f"Error in DatabaseLogWriter {batch_queue.log_type} worker loop: {e}", exc_info=True)
                 await asyncio.sleep(1)  # Wait before retrying
         
         # Flush remaining entries on shutdown
         if batch:
-            await self._flush_batch_to_table(batch, table_name, log_type)
+            await self._flush_batch_to_table(batch, batch_queue)
 
     async def _flush_batch_to_table(
         self, 
         batch: list[Dict[str, Any]], 
-        table_name: str, 
-        log_type: str
+        batch_queue: LogBatchQueue,
     ) -> None:
-        """Flush a batch of log entries to the specified table.
+        """Flush a batch of log entries to the queue's table.
         
         Args:
             batch: List of log entry dictionaries
-            table_name: Database table name
-            log_type: Type of log for stats tracking (app or performance)
+            batch_queue: Queue the entries came from (table name and stats)
         """
         if not batch:
             return
         
-        # Stats keys based on log type
-        is_performance = log_type == "performance"
-        written_key = "performance_total_written" if is_performance else "total_written"
-        failed_key = "performance_total_failed" if is_performance else "total_failed"
-        time_key = "performance_last_write_time" if is_performance else "last_write_time"
-        
+        start = time.perf_counter()
         try:
-            client = _get_raw_supabase_client()
-            
-            # Batch insert using Supabase API
-            result = client.table(table_name).insert(batch).execute()
+            # Batch insert using Supabase API (off the event loop)
+            result = await self._insert_rows(batch_queue.table_name, batch)
+            latency_ms = (time.perf_counter() - start) * 1000
             
             if result.data:
-                self._stats[written_key] += len(result.data)
-                self._stats[time_key] = datetime.now()
+                batch_queue.record_flush(len(batch), True, latency_ms)
             else:
-                self._stats[failed_key] += len(batch)
-                logging.warning(f"Failed to write {len(batch)} {log_type} log entries to database: no data returned")
+                batch_queue.record_flush(len(batch), False, latency_ms)
+                self._spill(batch_queue, batch)
+                logging.warning(f"Failed to write {len(batch)} {batch_queue.log_type} log entries to database: no data returned")
                 
         except Exception as e:
-            self._stats[failed_key] += len(batch)
-            logging.error(f"Failed to write {len(batch)} {log_type} log entries to database: {e}", exc_info=True)
+            batch_queue.record_flush(len(batch), False, (time.perf_counter() - start) * 1000)
+            self._spill(batch_queue, batch)
+            logging.error(f"Failed to write {len(batch)} {batch_queue.log_type} log entries to database: {e}", exc_info=True)
             # Don't raise - graceful degradation
 
-    # Legacy worker methods - 保留向后兼容，委托到通用方法
-    async def _worker_loop(self) -> None:
-        """Background worker task that processes app log entries in batches."""
-        await self._batch_worker_loop(self.log_queue, "app_logs", "app")
-
-    async def _performance_worker_loop(self) -> None:
-        """Background worker task that processes performance log entries in batches."""
-        await self._batch_worker_loop(self.performance_queue, "performance_logs", "performance")
-
-    async def _flush_batch(self, batch: list[Dict[str, Any]]) -> None:
-        """Flush a batch of app log entries to Supabase."""
-        await self._flush_batch_to_table(batch, "app_logs", "app")
-
-    async def _flush_performance_batch(self, batch: list[Dict[str, Any]]) -> None:
-        """Flush a batch of performance log entries to Supabase."""
-        await self._flush_batch_to_table(batch, "performance_logs", "performance")
+    async def _insert_rows(self, table_name: str, rows: Union[dict, list]) -> Any:
+        """Insert one or more rows in the dedicated thread pool.
+        
+        At most max_concurrency inserts run at once; further callers wait here
+        instead of piling up HTTP requests against Supabase.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._write_semaphore:
+            return await loop.run_in_executor(self._executor, _insert_rows_sync, table_name, rows)
     
     def _should_write_to_db(self, level: str) -> bool:
         """Check if app log level should be written to database.
@@ -282,13 +381,7 @@ class DatabaseLogWriter(BaseLogWriter):
 
     def _get_table_for_type(self, log_type: str) -> str:
         """Get the database table name for a given log type."""
-        return {
-            "app": "app_logs",
-            "error": "error_logs",
-            "audit": "audit_logs",
-            "performance": "performance_logs",
-            "system": "system_logs",
-        }.get(log_type, "app_logs")
+        return LOG_TABLES.get(log_type, "app_logs")
 
     def _get_min_level_for_type(self, log_type: str) -> str:
         """Get the minimum log level for a given log type."""
@@ -301,10 +394,6 @@ class DatabaseLogWriter(BaseLogWriter):
             "performance": "DEBUG",
         }.get(log_type, "INFO")
 
-    def _is_batch_type(self, log_type: str) -> bool:
-        """Check if log type uses batch processing."""
-        return log_type in ("app", "performance")
-
     # =========================================================================
     # Unified write method - 实现基类抽象方法
     # =========================================================================
@@ -313,7 +402,7 @@ class DatabaseLogWriter(BaseLogWriter):
         """Write a log entry to the appropriate database table using schema.
         
         This is the unified write method that implements the BaseLogWriter interface.
-        Routes to batch queue or immediate write based on log type.
+        Routes the entry to the batch queue of its log type.
         
         Args:
             schema: The log schema instance containing log data
@@ -331,67 +420,162 @@ class DatabaseLogWriter(BaseLogWriter):
         # Get db dict and add created_at
         log_data = schema.to_db_dict()
         log_data["created_at"] = format_timestamp()
-        
-        if self._is_batch_type(log_type):
-            # Batch processing for app and performance logs
-            self._enqueue_batch(log_data, log_type)
-        else:
-            # Immediate write for error, audit, system logs
-            self._write_immediate(log_data, log_type)
+        self._enqueue(log_data, log_type)
 
-    def _enqueue_batch(self, log_data: Dict[str, Any], log_type: str) -> None:
-        """Enqueue a log entry for batch processing.
+    def _enqueue(self, log_data: Dict[str, Any], log_type: str) -> None:
+        """Enqueue a log entry on its type's batch queue.
+        
+        Safe to call from any thread: calls from outside the event loop are
+        handed over with call_soon_threadsafe. Without any running loop
+        (startup, scripts) the entry is written synchronously.
         
         Args:
             log_data: Dictionary containing log data
-            log_type: Type of log (app or performance)
+            log_type: Type of log (app, error, audit, performance, system)
         """
         if not self._enabled:
             return
-            
-        self._ensure_worker_started()
         
-        queue = self.performance_queue if log_type == "performance" else self.log_queue
-        stats_key = "performance_total_enqueued" if log_type == "performance" else "total_enqueued"
-        fail_key = "performance_total_failed" if log_type == "performance" else "total_failed"
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            if self._loop is not None and self._loop.is_running():
+                self._loop.call_soon_threadsafe(self._put, log_data, log_type)
+                return
+            try:
+                _insert_rows_sync(self._get_table_for_type(log_type), log_data)
+            except Exception:
+                # Don't log here to avoid infinite recursion
+                if self._spool:
+                    try:
+                        self._spool.append(log_type, [log_data])
+                    except Exception:
+                        pass
+            return
+        
+        self._put(log_data, log_type)
+
+    def _put(self, log_data: Dict[str, Any], log_type: str) -> None:
+        """Put an entry on its queue (event loop thread only)."""
+        self._ensure_worker_started()
         
+        batch_queue = self._queues.get(log_type) or self._queues["app"]
         try:
-            queue.put_nowait(log_data)
-            self._stats[stats_key] += 1
+            batch_queue.queue.put_nowait(log_data)
+            batch_queue.enqueued += 1
         except asyncio.QueueFull:
-            logging.warning(f"Log database queue is full, dropping {log_type} entry")
-            self._stats[fail_key] += 1
+            self._spill(batch_queue, [log_data])
+            return
+        
+        if self.flush_on_critical and str(log_data.get("level") or "").upper() == "CRITICAL":
+            batch_queue.flush_requested = True
 
-    def _write_immediate(self, log_data: Dict[str, Any], log_type: str) -> None:
-        """Write a log entry immediately (non-batch).
+    # =========================================================================
+    # Spill-to-disk spool - 溢出落盘与回放
+    # =========================================================================
+
+    def _spill(self, batch_queue: LogBatchQueue, rows: list[Dict[str, Any]]) -> None:
+        """Hand rows that could not be queued or written to the disk spool.
         
-        Args:
-            log_data: Dictionary containing log data
-            log_type: Type of log (error, audit, system)
+        Rows are buffered in memory and appended by a single background task
+        on the spool thread, so callers on the event loop never touch the disk.
         """
-        if not self._enabled:
+        if self._spool is None:
+            batch_queue.dropped += len(rows)
             return
-            
-        table_name = self._get_table_for_type(log_type)
         
-        async def _insert_log():
-            try:
-                client = _get_raw_supabase_client()
-                return client.table(table_name).insert(log_data).execute()
-            except Exception:
-                pass
+        self._overflow.setdefault(batch_queue.log_type, []).extend(rows)
+        if self._spill_task is None or self._spill_task.done():
+            self._spill_task = asyncio.create_task(self._drain_overflow())
+
+    async def _drain_overflow(self) -> None:
+        """Append buffered overflow rows to the spool until the buffer is empty."""
+        loop = asyncio.get_running_loop()
+        while self._overflow:
+            overflow, self._overflow = self._overflow, {}
+            for log_type, rows in overflow.items():
+                batch_queue = self._queues[log_type]
+                try:
+                    written = await loop.run_in_executor(self._spool_executor, self._spool.append, log_type, rows)
+                except Exception as e:
+                    written = 0
+                    logging.error(f"Failed to spool {len(rows)} {log_type} log entries: {e}")
+                batch_queue.spilled += written
+                batch_queue.dropped += len(rows) - written
+
+    async def _replay_loop(self) -> None:
+        """Background task draining the spool back into the database.
         
-        # Try to run in background task if event loop is running
-        try:
-            asyncio.get_running_loop()
-            asyncio.create_task(_insert_log())
-        except RuntimeError:
-            # No event loop running - run synchronously
+        Runs every spool_replay_interval seconds; after a failed attempt the
+        interval doubles (up to SPOOL_MAX_BACKOFF) so an outage does not turn
+        into a retry storm.
+        """
+        delay = self.spool_replay_interval
+        attempts: Dict[str, int] = {}
+        
+        while not self._shutdown_event.is_set():
             try:
-                client = _get_raw_supabase_client()
-                client.table(table_name).insert(log_data).execute()
-            except Exception:
+                await asyncio.wait_for(self._shutdown_event.wait(), timeout=delay)
+                break
+            except asyncio.TimeoutError:
                 pass
+            
+            try:
+                recovered = await self._replay_spool(attempts)
+            except Exception as e:
+                logging.error(f"Error replaying database log spool: {e}", exc_info=True)
+                recovered = False
+            delay = self.spool_replay_interval if recovered else min(delay * 2, SPOOL_MAX_BACKOFF)
+
+    async def _replay_spool(self, attempts: Dict[str, int]) -> bool:
+        """Replay spooled segments, oldest first.
+        
+        Args:
+            attempts: Failed replay attempts per segment name
+            
+        Returns:
+            True if the spool was drained, False if a write failed
+        """
+        loop = asyncio.get_running_loop()
+        spool = self._spool
+        
+        while not self._shutdown_event.is_set():
+            segment = await loop.run_in_executor(self._spool_executor, spool.next_segment)
+            if segment is None:
+                return True
+            
+            rows = await loop.run_in_executor(self._spool_executor, lambda: list(spool.read_segment(segment)))
+            done = 0
+            while done < len(rows):
+                # Consecutive rows of the same type go in one insert
+                log_type = rows[done][0]
+                end = done
+                while end < len(rows) and end - done < SPOOL_REPLAY_BATCH_SIZE and rows[end][0] == log_type:
+                    end += 1
+                chunk = [row for _, row in rows[done:end]]
+                
+                try:
+                    result = await self._insert_rows(self._get_table_for_type(log_type), chunk)
+                    written = bool(result.data)
+                except Exception:
+                    written = False
+                
+                if not written:
+                    attempts[segment.name] = attempts.get(segment.name, 0) + 1
+                    if attempts[segment.name] >= SPOOL_MAX_REPLAY_ATTEMPTS:
+                        # Keep it on disk for inspection, stop retrying it
+                        await loop.run_in_executor(self._spool_executor, spool.mark_dead, segment)
+                        attempts.pop(segment.name, None)
+                        logging.error(f"Database log spool segment {segment.name} failed {SPOOL_MAX_REPLAY_ATTEMPTS} replays, set aside")
+                    elif done:
+                        await loop.run_in_executor(self._spool_executor, spool.rewrite_segment, segment, rows[done:], done)
+                    return False
+                done = end
+            
+            await loop.run_in_executor(self._spool_executor, spool.complete_segment, segment, len(rows))
+            attempts.pop(segment.name, None)
+        return False
+
 
     # =========================================================================
     # Model-based enqueue methods - 从数据库模型入队
@@ -411,7 +595,7 @@ class DatabaseLogWriter(BaseLogWriter):
         
         if not self._should_write_to_db(app_log.level):
             return
-        self._enqueue_batch(log_data, "app")
+        self._enqueue(log_data, "app")
 
     def enqueue_log(
         self,
@@ -491,7 +675,7 @@ class DatabaseLogWriter(BaseLogWriter):
         log_data = schema.to_db_dict()
         log_data["id"] = str(error_log.id)
         log_data["created_at"] = format_timestamp()
-        self._write_immediate(log_data, "error")
+        self._enqueue(log_data, "error")
 
     def enqueue_audit_log(self, audit_log: "AuditLog") -> None:
         """Enqueue an audit log entry using AuditLog model object."""
@@ -524,7 +708,7 @@ class DatabaseLogWriter(BaseLogWriter):
         log_data = schema.to_db_dict()
         log_data["id"] = str(audit_log.id)
         log_data["created_at"] = format_timestamp()
-        self._write_immediate(log_data, "audit")
+        self._enqueue(log_data, "audit")
 
     def enqueue_performance_log(self, performance_log: "PerformanceLog") -> None:
         """Enqueue a performance log entry using PerformanceLog model object."""
@@ -550,7 +734,7 @@ class DatabaseLogWriter(BaseLogWriter):
         log_data = schema.to_db_dict()
         log_data["id"] = str(performance_log.id)
         log_data["created_at"] = format_timestamp()
-        self._enqueue_batch(log_data, "performance")
+        self._enqueue(log_data, "performance")
 
     def enqueue_performance_log_params(
         self,
@@ -590,16 +774,21 @@ class DatabaseLogWriter(BaseLogWriter):
         self.write(schema, "performance")
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get writer statistics."""
+        """Get writer statistics, including per-queue depth, drops and write latency."""
+        queues = {log_type: q.get_stats() for log_type, q in self._queues.items()}
         return {
-            **self._stats,
-            "queue_size": self.log_queue.qsize(),
-            "performance_queue_size": self.performance_queue.qsize(),
+            "total_enqueued": sum(q["enqueued"] for q in queues.values()),
+            "total_written": sum(q["written"] for q in queues.values()),
+            "total_failed": sum(q["failed"] for q in queues.values()),
+            "total_dropped": sum(q["dropped"] for q in queues.values()),
             "enabled": self._enabled,
             "min_log_level": self.min_log_level,
             "min_system_log_level": self.min_system_log_level,
-            "batch_size": self.batch_size,
-            "batch_interval": self.batch_interval,
+            "max_concurrency": self.max_concurrency,
+            "flush_on_critical": self.flush_on_critical,
+            "total_spilled": sum(q["spilled"] for q in queues.values()),
+            "queues": queues,
+            "spool": self._spool.get_stats() if self._spool else None,
         }
     
     async def close(self, timeout: float = 10.0) -> None:
@@ -614,45 +803,40 @@ class DatabaseLogWriter(BaseLogWriter):
         # Signal shutdown
         self._shutdown_event.set()
         
-        # Wait for worker task to finish
-        if self._worker_task and not self._worker_task.done():
-            try:
-                await asyncio.wait_for(self._worker_task, timeout=timeout)
-            except asyncio.TimeoutError:
-                logging.warning(
-                    f"DatabaseLogWriter worker task did not finish within {timeout}s timeout"
-                )
-        
-        # Wait for performance worker task to finish
-        if self._performance_worker_task and not self._performance_worker_task.done():
-            try:
-                await asyncio.wait_for(self._performance_worker_task, timeout=timeout)
-            except asyncio.TimeoutError:
+        # Wake idle workers, then wait for them to flush what they hold
+        workers = []
+        for batch_queue in self._queues.values():
+            if batch_queue.worker_task and not batch_queue.worker_task.done():
+                if batch_queue.idle:
+                    batch_queue.worker_task.cancel()
+                workers.append(batch_queue.worker_task)
+        if workers:
+            _, pending = await asyncio.wait(workers, timeout=timeout)
+            if pending:
                 logging.warning(
-                    f"DatabaseLogWriter performance worker task did not finish within {timeout}s timeout"
+                    f"DatabaseLogWriter: {len(pending)} worker task(s) did not finish within {timeout}s timeout"
                 )
         
         # Flush remaining entries
-        remaining = []
-        while not self.log_queue.empty():
-            try:
-                remaining.append(self.log_queue.get_nowait())
-            except asyncio.QueueEmpty:
-                break
-        
-        if remaining:
-            await self._flush_batch(remaining)
+        for batch_queue in self._queues.values():
+            remaining = []
+            while not batch_queue.queue.empty():
+                try:
+                    remaining.append(batch_queue.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            for i in range(0, len(remaining), batch_queue.batch_size):
+                await self._flush_batch_to_table(remaining[i:i + batch_queue.batch_size], batch_queue)
         
-        # Flush remaining performance entries
-        remaining_performance = []
-        while not self.performance_queue.empty():
+        # Stop replaying and persist anything that failed during shutdown
+        if self._replay_task and not self._replay_task.done():
             try:
-                remaining_performance.append(self.performance_queue.get_nowait())
-            except asyncio.QueueEmpty:
-                break
-        
-        if remaining_performance:
-            await self._flush_performance_batch(remaining_performance)
+                await asyncio.wait_for(self._replay_task, timeout=timeout)
+            except asyncio.TimeoutError:
+                self._replay_task.cancel()
+        if self._spill_task and not self._spill_task.done():
+            await self._spill_task
     
     def write_error_log(
         self,
@@ -737,17 +921,8 @@ class DatabaseLogWriter(BaseLogWriter):
             error_data = error_create.to_db_dict()
             error_data["created_at"] = format_timestamp()
             
-            # Insert using Supabase API (async)
-            async def _insert_error_log():
-                try:
-                    client = _get_raw_supabase_client()
-                    return client.table("error_logs").insert(error_data).execute()
-                except Exception:
-                    # Don't log here to avoid infinite recursion
-                    pass
-            
-            # Run in background task (fire-and-forget)
-            asyncio.create_task(_insert_error_log())
+            # Queue for batched insert
+            self._enqueue(error_data, "error")
             
         except Exception:
             # Don't fail if database write fails (graceful degradation)
@@ -804,26 +979,8 @@ class DatabaseLogWriter(BaseLogWriter):
             system_log_data = system_create.to_db_dict()
             system_log_data["created_at"] = format_timestamp()
             
-            # Insert using Supabase API (sync, in thread pool if needed)
-            async def _insert_system_log():
-                try:
-                    client = _get_raw_supabase_client()
-                    return client.table("system_logs").insert(system_log_data).execute()
-                except Exception:
-                    # Don't log here to avoid infinite recursion
-                    pass
-            
-            # Try to run in background task if event loop is running
-            try:
-                loop = asyncio.get_running_loop()
-                asyncio.create_task(_insert_system_log())
-            except RuntimeError:
-                # No event loop running - run synchronously
-                try:
-                    client = _get_raw_supabase_client()
-                    client.table("system_logs").insert(system_log_data).execute()
-                except Exception:
-                    pass
+            # Queue for batched insert
+            self._enqueue(system_log_data, "system")
             
         except Exception:
             # Don't fail if database write fails (graceful degradation)
@@ -897,9 +1054,12 @@ class DatabaseLogWriter(BaseLogWriter):
                 request_path=request_path,
             )
             
-            # Insert using raw Supabase API (async) - avoid circular logging
-            result_data = await _async_insert("audit_logs", audit_log.to_db_dict())
-            return result_data
+            # Insert using raw Supabase API (off the event loop) - avoid circular logging
+            result = await self._insert_rows("audit_logs", audit_log.to_db_dict())
+            if result.data:
+                return result.data[0]
+            logging.warning("Audit log insert returned empty result")
+            return None
                 
         except Exception as e:
             # Log the specific error for debugging, but don't fail (graceful degradation)
@@ -915,17 +1075,10 @@ class DatabaseLogWriter(BaseLogWriter):
         """Enqueue an application log entry directly from schema."""
         if not self._should_write_to_db(schema.level):
             return
-        self._ensure_worker_started()
         
         log_entry = schema.to_db_dict()
         log_entry["created_at"] = format_timestamp()
-        
-        try:
-            self.log_queue.put_nowait(log_entry)
-            self._stats["total_enqueued"] += 1
-        except asyncio.QueueFull:
-            logging.warning("Log database queue is full, dropping log entry")
-            self._stats["total_failed"] += 1
+        self._enqueue(log_entry, "app")
 
     def enqueue_error_log_from_schema(self, schema: "ErrorLogCreate") -> None:
         """Enqueue an error log entry directly from schema."""
@@ -934,15 +1087,7 @@ class DatabaseLogWriter(BaseLogWriter):
         
         error_data = schema.to_db_dict()
         error_data["created_at"] = format_timestamp()
-        
-        async def _insert_error_log():
-            try:
-                client = _get_raw_supabase_client()
-                return client.table("error_logs").insert(error_data).execute()
-            except Exception:
-                pass
-        
-        asyncio.create_task(_insert_error_log())
+        self._enqueue(error_data, "error")
 
     def enqueue_audit_log_from_schema(self, schema: "AuditLogCreate") -> None:
         """Enqueue an audit log entry directly from schema."""
@@ -951,31 +1096,16 @@ class DatabaseLogWriter(BaseLogWriter):
         
         audit_data = schema.to_db_dict()
         audit_data["created_at"] = format_timestamp()
-        
-        async def _insert_audit_log():
-            try:
-                client = _get_raw_supabase_client()
-                return client.table("audit_logs").insert(audit_data).execute()
-            except Exception:
-                pass
-        
-        asyncio.create_task(_insert_audit_log())
+        self._enqueue(audit_data, "audit")
 
     def enqueue_performance_log_from_schema(self, schema: "PerformanceLogCreate") -> None:
         """Enqueue a performance log entry directly from schema."""
         if not self._enabled:
             return
-        self._ensure_worker_started()
         
         perf_entry = schema.to_db_dict()
         perf_entry["created_at"] = format_timestamp()
-        
-        try:
-            self.performance_queue.put_nowait(perf_entry)
-            self._stats["performance_total_enqueued"] += 1
-        except asyncio.QueueFull:
-            logging.warning("Performance log database queue is full, dropping performance log entry")
-            self._stats["performance_total_failed"] += 1
+        self._enqueue(perf_entry, "performance")
 
 
 # Singleton instance
@@ -8,6 +8,13 @@ This module provides thread-safe asynchronous file writing for:
 - system.log - System logs
 
 Uses queue-based asynchronous writing to avoid blocking the main thread.
+The worker thread keeps one open handle per log file, drains the queue in
+batches and writes each file's lines with a single buffered call; fsync runs
+on a configurable cadence.
+
+Rotation happens when a file reaches LOG_FILE_MAX_BYTES or the date changes.
+Rotated files are compressed by a background thread and archives are kept
+within a total byte budget (see archive.py).
 All formatting is delegated to Schema classes for consistency.
 
 Log level configuration (per file):
@@ -15,16 +22,24 @@ Log level configuration (per file):
 - system.log, performance.log: Production = WARNING, Development = INFO
 """
 import json
+import os
 import queue
 import threading
+import time
 from datetime import datetime, date
 from pathlib import Path
-from typing import Any, Optional, Tuple, Union, TYPE_CHECKING
+from typing import Any, Dict, IO, List, Optional, Tuple, Union, TYPE_CHECKING
 import logging
-import re
 from uuid import UUID
 
 from .base_writer import BaseLogWriter
+from .archive import (
+    archive_sort_key,
+    compress_file,
+    list_archives,
+    next_archive_path,
+    resolve_compression,
+)
 
 # Import database models for type hints
 from ..db.models import AppLog, ErrorLog, AuditLog, PerformanceLog
@@ -35,6 +50,9 @@ if TYPE_CHECKING:
         AuditLogCreate, PerformanceLogCreate, SystemLogCreate
     )
 
+# Userspace buffer per open log file; a batch is flushed with one write syscall
+WRITE_BUFFER_SIZE = 64 * 1024
+
 
 class FileLogWriter(BaseLogWriter):
     """Thread-safe asynchronous file log writer.
@@ -91,21 +109,43 @@ class FileLogWriter(BaseLogWriter):
                 log_file.touch()
 
         # File rotation settings
-        self.backup_count = 30
-        self._last_rotation_date = {}
+        self._last_rotation_date: Dict[Path, date] = {}
 
         # Initialize log level configuration
         self._init_log_levels()
 
+        # Rotated archives {path: size}, maintained in memory so retention
+        # never has to list the directory again
+        self._archives: Dict[Path, int] = {}
+        self._archive_bytes = 0
+        self._compress_queue: queue.Queue[Optional[Path]] = queue.Queue()
+        self._compressor_thread: Optional[threading.Thread] = None
+
+        # Open file handles (owned by the worker thread) and fsync bookkeeping
+        self._handles: Dict[Path, IO[str]] = {}
+        self._unsynced: set[Path] = set()
+        self._last_fsync = time.monotonic()
+        
+        # Statistics
+        self._stats = {
+            "written": 0,
+            "dropped": 0,
+            "batches": 0,
+            "fsyncs": 0,
+            "rotations": 0,
+            "compressed": 0,
+            "archives_deleted": 0,
+        }
+
         # Queue for asynchronous log writing
         self.log_queue: queue.Queue[Tuple[Path, str]] = queue.Queue(maxsize=50000)
         
         # Control flags for background thread
         self._shutdown_event = threading.Event()
         self._worker_thread: Optional[threading.Thread] = None
-        self.write_lock = threading.Lock()
         
-        # Start background worker thread
+        # Start background worker and compressor threads
+        self._init_archives()
         self._start_worker_thread()
         self._initialized = True
 
@@ -120,6 +160,15 @@ class FileLogWriter(BaseLogWriter):
         self.log_level_error = config.level_error
         self.log_level_system = config.level_system
         self.log_level_performance = config.level_performance
+        
+        # Batch and durability settings
+        self.write_batch_size = max(1, config.file_batch_size)
+        self.fsync_interval = config.file_fsync_interval
+        
+        # Rotation, compression and retention settings
+        self.max_file_bytes = config.file_max_bytes
+        self.compression = resolve_compression(config.file_compression)
+        self.retention_bytes = config.file_retention_bytes
 
     # =========================================================================
     # File and level mapping
@@ -167,86 +216,227 @@ class FileLogWriter(BaseLogWriter):
             daemon=True,
         )
         self._worker_thread.start()
+        
+        self._compressor_thread = threading.Thread(
+            target=self._compressor_loop,
+            name="FileLogWriter-Compressor",
+            daemon=True,
+        )
+        self._compressor_thread.start()
 
     def _worker_loop(self) -> None:
-        """Background worker that processes log entries from the queue."""
+        """Background worker that drains the queue in batches."""
         while not self._shutdown_event.is_set():
             try:
-                file_path, entry = self.log_queue.get(timeout=0.5)
-                self._write_entry_to_file(file_path, entry)
-                self.log_queue.task_done()
-            except queue.Empty:
-                continue
+                batch = self._next_batch(timeout=0.5)
+                if batch:
+                    self._write_batch(batch)
+                else:
+                    # Idle: still honour the fsync cadence for the last writes
+                    self._maybe_fsync()
             except Exception as e:
                 logging.error(f"Error in FileLogWriter worker thread: {e}")
 
         # Process remaining entries before shutdown
         while True:
+            batch = self._next_batch(timeout=None)
+            if not batch:
+                break
+            self._write_batch(batch)
+        self._close_handles()
+
+    def _next_batch(self, timeout: Optional[float]) -> List[Tuple[Path, str]]:
+        """Wait for one entry (or not at all if timeout is None), then take whatever else is queued."""
+        try:
+            if timeout is None:
+                first = self.log_queue.get_nowait()
+            else:
+                first = self.log_queue.get(timeout=timeout)
+        except queue.Empty:
+            return []
+        
+        batch = [first]
+        while len(batch) < self.write_batch_size:
             try:
-                file_path, entry = self.log_queue.get_nowait()
-                self._write_entry_to_file(file_path, entry)
-                self.log_queue.task_done()
+                batch.append(self.log_queue.get_nowait())
             except queue.Empty:
                 break
+        return batch
 
-    def _write_entry_to_file(self, file_path: Path, entry: str) -> None:
-        """Write a single log entry to the specified file."""
-        with self.write_lock:
+    def _write_batch(self, batch: List[Tuple[Path, str]]) -> None:
+        """Write a batch of entries with one buffered write per file."""
+        grouped: Dict[Path, List[str]] = {}
+        for file_path, entry in batch:
+            grouped.setdefault(file_path, []).append(entry)
+        
+        today = date.today()
+        try:
+            for file_path, entries in grouped.items():
+                try:
+                    handle = self._get_handle(file_path, today)
+                    handle.write("\n".join(entries) + "\n")
+                    handle.flush()
+                    self._unsynced.add(file_path)
+                    self._stats["written"] += len(entries)
+                    self._check_after_write(file_path, handle)
+                except Exception as e:
+                    logging.error(f"Failed to write {len(entries)} log entries to {file_path}: {e}")
+                    self._close_handle(file_path)
+            self._stats["batches"] += 1
+            self._maybe_fsync()
+        finally:
+            for _ in batch:
+                self.log_queue.task_done()
+
+    def _get_handle(self, file_path: Path, today: date) -> IO[str]:
+        """Get the open handle for a log file, rotating first when the date changed."""
+        if self._last_rotation_date.get(file_path) != today:
+            self._close_handle(file_path)
+            self._rotate_file_if_needed(file_path)
+            self._last_rotation_date[file_path] = today
+        
+        handle = self._handles.get(file_path)
+        if handle is None:
+            handle = open(file_path, "a", encoding="utf-8", buffering=WRITE_BUFFER_SIZE)
+            self._handles[file_path] = handle
+        return handle
+
+    def _maybe_fsync(self) -> None:
+        """fsync files written since the last sync, at most every fsync_interval seconds."""
+        if self.fsync_interval < 0 or not self._unsynced:
+            return
+        
+        now = time.monotonic()
+        if now - self._last_fsync < self.fsync_interval:
+            return
+        
+        for file_path in self._unsynced:
+            handle = self._handles.get(file_path)
+            if handle is not None:
+                try:
+                    os.fsync(handle.fileno())
+                except OSError as e:
+                    logging.warning(f"Failed to fsync log file {file_path}: {e}")
+        self._unsynced.clear()
+        self._last_fsync = now
+        self._stats["fsyncs"] += 1
+
+    def _close_handle(self, file_path: Path) -> None:
+        """Close the handle of a log file if it is open."""
+        handle = self._handles.pop(file_path, None)
+        if handle is not None:
             try:
-                self._rotate_file_if_needed(file_path)
-                with open(file_path, "a", encoding="utf-8") as f:
-                    f.write(entry + "\n")
-            except Exception as e:
-                logging.error(f"Failed to write log entry to {file_path}: {e}")
+                handle.close()
+            except Exception:
+                pass
+        self._unsynced.discard(file_path)
+
+    def _close_handles(self) -> None:
+        """Flush, sync and close all open handles (worker shutdown)."""
+        for file_path, handle in list(self._handles.items()):
+            try:
+                handle.flush()
+                if self.fsync_interval >= 0:
+                    os.fsync(handle.fileno())
+            except Exception:
+                pass
+            self._close_handle(file_path)
 
     # =========================================================================
     # File rotation
     # =========================================================================
 
+    def _check_after_write(self, file_path: Path, handle: IO[str]) -> None:
+        """Rotate by size, and drop handles whose file was moved away by someone else."""
+        stat = os.fstat(handle.fileno())
+        try:
+            on_disk = os.stat(file_path)
+        except FileNotFoundError:
+            on_disk = None
+        
+        if on_disk is None or on_disk.st_ino != stat.st_ino:
+            # Renamed or deleted externally: reopen on the next batch
+            self._close_handle(file_path)
+        elif stat.st_size >= self.max_file_bytes:
+            self._rotate(file_path, date.today())
+
     def _rotate_file_if_needed(self, file_path: Path) -> None:
-        """Rotate file daily at midnight."""
+        """Rotate a file written on an earlier day.
+        
+        Called by the worker only on the first write of each day (with the
+        file's handle closed), not for every entry.
+        """
         if not file_path.exists():
             return
 
-        today = date.today()
-        file_key = str(file_path)
-        
-        if self._last_rotation_date.get(file_key) == today:
-            return
-        
         file_mtime = datetime.fromtimestamp(file_path.stat().st_mtime).date()
+        if file_mtime < date.today():
+            self._rotate(file_path, file_mtime)
+
+    def _rotate(self, file_path: Path, day: date) -> None:
+        """Move the current file to its next archive name and queue it for compression."""
+        self._close_handle(file_path)
+        if not file_path.exists() or file_path.stat().st_size == 0:
+            return
         
-        if file_mtime < today:
-            date_str = file_mtime.strftime("%Y-%m-%d")
-            backup_file = file_path.parent / f"{file_path.stem}.{date_str}{file_path.suffix}"
-            
-            if backup_file.exists():
-                timestamp = datetime.now().strftime("%H%M%S")
-                backup_file = file_path.parent / f"{file_path.stem}.{date_str}.{timestamp}{file_path.suffix}"
+        backup_file = next_archive_path(file_path, day)
+        file_path.rename(backup_file)
+        self._stats["rotations"] += 1
+        self._compress_queue.put(backup_file)
+
+    # =========================================================================
+    # Compression and retention (background thread)
+    # =========================================================================
+
+    def _init_archives(self) -> None:
+        """Index existing archives once at startup; compress leftovers from a crash."""
+        for archive in list_archives(self.logs_dir):
+            if self.compression and archive.suffix == ".log":
+                self._compress_queue.put(archive)
+            else:
+                self._register_archive(archive)
+
+    def _compressor_loop(self) -> None:
+        """Background thread compressing rotated files and enforcing retention."""
+        while True:
+            try:
+                path = self._compress_queue.get(timeout=1.0)
+            except queue.Empty:
+                if self._shutdown_event.is_set():
+                    break
+                continue
+            if path is None:
+                break
             
-            file_path.rename(backup_file)
-            self._last_rotation_date[file_key] = today
-            self._cleanup_old_files(file_path)
-    
-    def _cleanup_old_files(self, file_path: Path) -> None:
-        """Clean up old log files beyond backup_count."""
-        if not file_path.parent.exists():
+            try:
+                if self.compression and path.suffix == ".log":
+                    path = compress_file(path, self.compression)
+                    self._stats["compressed"] += 1
+                self._register_archive(path)
+                self._enforce_retention()
+            except Exception as e:
+                logging.warning(f"Failed to archive log file {path}: {e}")
+
+    def _register_archive(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
             return
-        
-        pattern = re.compile(
-            rf"^{re.escape(file_path.stem)}\."
-            rf"(?:\d{{4}}-\d{{2}}-\d{{2}}|\d+)"
-            rf"{re.escape(file_path.suffix)}$"
-        )
-        
-        backup_files = [f for f in file_path.parent.iterdir() if f.is_file() and pattern.match(f.name)]
-        backup_files.sort(key=lambda f: f.stat().st_mtime)
-        
-        for old_file in backup_files[:-self.backup_count]:
+        self._archives[path] = size
+        self._archive_bytes += size
+
+    def _enforce_retention(self) -> None:
+        """Delete the oldest archives until the total fits retention_bytes."""
+        while self._archives and self._archive_bytes > self.retention_bytes:
+            oldest = min(self._archives, key=archive_sort_key)
+            self._archive_bytes -= self._archives.pop(oldest)
             try:
-                old_file.unlink()
+                oldest.unlink()
+                self._stats["archives_deleted"] += 1
+            except FileNotFoundError:
+                pass
             except Exception as e:
-                logging.warning(f"Failed to delete old log file {old_file}: {e}")
+                logging.warning(f"Failed to delete old log file {oldest}: {e}")
 
     # =========================================================================
     # Unified write method - 实现基类抽象方法
@@ -278,6 +468,7 @@ class FileLogWriter(BaseLogWriter):
         try:
             self.log_queue.put((file_path, entry), block=False)
         except queue.Full:
+            self._stats["dropped"] += 1
             logging.warning(f"Log file queue is full, dropping {log_type} entry")
 
     # =========================================================================
@@ -635,6 +826,25 @@ class FileLogWriter(BaseLogWriter):
             
             if self._worker_thread.is_alive():
                 logging.warning(f"FileLogWriter worker thread did not finish within {timeout}s")
+        
+        if self._compressor_thread and self._compressor_thread.is_alive():
+            self._compress_queue.put(None)
+            self._compressor_thread.join(timeout=timeout)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get writer statistics."""
+        return {
+            **self._stats,
+            "queue_size": self.log_queue.qsize(),
+            "open_files": len(self._handles),
+            "write_batch_size": self.write_batch_size,
+            "fsync_interval": self.fsync_interval,
+            "max_file_bytes": self.max_file_bytes,
+            "compression": self.compression,
+            "archives": len(self._archives),
+            "archive_bytes": self._archive_bytes,
+            "retention_bytes": self.retention_bytes,
+        }
 
     def clear_queue(self) -> int:
         """Clear all pending log entries from the queue."""
@@ -4,10 +4,11 @@ Application logging router.
 API endpoints for viewing application logs (admin only).
 Exception endpoints are in the exception module.
 """
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, TYPE_CHECKING
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 
 from .service import LoggingService
@@ -28,6 +29,8 @@ from .schemas import (
 router = APIRouter()
 logging_service = LoggingService()
 
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
 
 def get_admin_user_dependency():
     """
@@ -58,6 +61,7 @@ async def list_logs(
     user_id: Optional[UUID] = Query(default=None, description="Filter by user ID"),
     start_date: Optional[datetime] = Query(default=None, description="Start date filter"),
     end_date: Optional[datetime] = Query(default=None, description="End date filter"),
+    cursor: Optional[str] = Query(default=None, description="Keyset cursor (next_cursor of the previous page); page is ignored"),
     current_user = Depends(get_admin_user_dependency),
     db: AsyncSession = Depends(get_db),
 ):
@@ -77,6 +81,7 @@ async def list_logs(
         user_id=user_id,
         start_date=start_date,
         end_date=end_date,
+        cursor=cursor,
     )
 
     return await logging_service.list_logs(db, query)
@@ -91,6 +96,7 @@ async def list_error_logs(
     user_id: Optional[UUID] = Query(default=None, description="Filter by user ID"),
     start_date: Optional[datetime] = Query(default=None, description="Start date filter"),
     end_date: Optional[datetime] = Query(default=None, description="End date filter"),
+    cursor: Optional[str] = Query(default=None, description="Keyset cursor (next_cursor of the previous page); page is ignored"),
     current_user = Depends(get_admin_user_dependency),
     db: AsyncSession = Depends(get_db),
 ):
@@ -107,6 +113,7 @@ async def list_error_logs(
         user_id=user_id,
         start_date=start_date,
         end_date=end_date,
+        cursor=cursor,
     )
 
     return await logging_service.list_error_logs(db, query)
@@ -121,6 +128,7 @@ async def list_performance_logs(
     user_id: Optional[UUID] = Query(default=None, description="Filter by user ID"),
     start_date: Optional[datetime] = Query(default=None, description="Start date filter"),
     end_date: Optional[datetime] = Query(default=None, description="End date filter"),
+    cursor: Optional[str] = Query(default=None, description="Keyset cursor (next_cursor of the previous page); page is ignored"),
     current_user = Depends(get_admin_user_dependency),
     db: AsyncSession = Depends(get_db),
 ):
@@ -137,6 +145,7 @@ async def list_performance_logs(
         user_id=user_id,
         start_date=start_date,
         end_date=end_date,
+        cursor=cursor,
     )
 
     return await logging_service.list_performance_logs(db, query)
@@ -150,6 +159,7 @@ async def list_system_logs(
     trace_id: Optional[str] = Query(default=None, description="Filter by trace ID"),
     start_date: Optional[datetime] = Query(default=None, description="Start date filter"),
     end_date: Optional[datetime] = Query(default=None, description="End date filter"),
+    cursor: Optional[str] = Query(default=None, description="Keyset cursor (next_cursor of the previous page); page is ignored"),
     current_user = Depends(get_admin_user_dependency),
     db: AsyncSession = Depends(get_db),
 ):
@@ -165,6 +175,7 @@ async def list_system_logs(
         trace_id=trace_id,
         start_date=start_date,
         end_date=end_date,
+        cursor=cursor,
     )
 
     return await logging_service.list_system_logs(db, query)
@@ -225,6 +236,7 @@ async def list_backend_logs(
     user_id: Optional[UUID] = Query(default=None, description="Filter by user ID"),
     start_date: Optional[datetime] = Query(default=None, description="Start date filter"),
     end_date: Optional[datetime] = Query(default=None, description="End date filter"),
+    cursor: Optional[str] = Query(default=None, description="Keyset cursor (next_cursor of the previous page); page is ignored"),
     current_user = Depends(get_admin_user_dependency),
     db: AsyncSession = Depends(get_db),
 ):
@@ -242,6 +254,7 @@ async def list_backend_logs(
         user_id=user_id,
         start_date=start_date,
         end_date=end_date,
+        cursor=cursor,
     )
 
     return await logging_service.list_logs(db, query)
@@ -256,6 +269,7 @@ async def list_frontend_logs(
     user_id: Optional[UUID] = Query(default=None, description="Filter by user ID"),
     start_date: Optional[datetime] = Query(default=None, description="Start date filter"),
     end_date: Optional[datetime] = Query(default=None, description="End date filter"),
+    cursor: Optional[str] = Query(default=None, description="Keyset cursor (next_cursor of the previous page); page is ignored"),
     current_user = Depends(get_admin_user_dependency),
     db: AsyncSession = Depends(get_db),
 ):
@@ -273,6 +287,7 @@ async def list_frontend_logs(
         user_id=user_id,
         start_date=start_date,
         end_date=end_date,
+        cursor=cursor,
     )
 
     return await logging_service.list_logs(db, query)
@@ -590,6 +605,110 @@ async def get_log_stats(
     }
 
 
+@router.get("/api/v1/logging/metrics")
+async def get_latency_metrics(
+    format: str = Query(default="json", pattern="^(json|prometheus)$", description="json or prometheus"),
+    layer: Optional[str] = Query(default=None, description="Filter by layer (Router/Service/Auth/Database)"),
+    top: Optional[int] = Query(default=None, ge=1, le=1000, description="Top N series per layer by total time"),
+    current_user = Depends(get_admin_user_dependency),
+):
+    """
+    In-process latency histograms per route, service method and table (admin only).
+    
+    Returns p50/p95/p99, counts and errors since process start, without
+    querying log tables. format=prometheus returns the text exposition format.
+    """
+    from ..interceptor import (
+        metrics_registry,
+        get_sampling_stats,
+        get_method_log_queue_stats,
+        get_provider_stats,
+    )
+    
+    if format == "prometheus":
+        return PlainTextResponse(metrics_registry.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+    return {
+        "latency": metrics_registry.get_summary(layer=layer, top=top),
+        "log_sampling": get_sampling_stats(),
+        "service_log_queue": get_method_log_queue_stats(),
+        **get_provider_stats(),
+    }
+
+
+@router.get("/metrics", include_in_schema=False)
+async def scrape_metrics(request: Request):
+    """
+    Prometheus scrape endpoint, authenticated with the static METRICS_TOKEN.
+    
+    Returns 404 when METRICS_TOKEN is not configured or the token does not
+    match, so the endpoint is not discoverable without it.
+    """
+    import hmac
+    from ..config import settings
+    from ..exception import NotFoundError
+    from ..interceptor import metrics_registry
+    
+    supplied = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+    if not settings.METRICS_TOKEN or not hmac.compare_digest(supplied.encode(), settings.METRICS_TOKEN.encode()):
+        raise NotFoundError(resource_type="Metrics endpoint")
+    return PlainTextResponse(metrics_registry.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get("/api/v1/logging/files")
+async def list_log_files(
+    current_user = Depends(get_admin_user_dependency),
+):
+    """
+    List rotated log file archives with their size (admin only).
+    """
+    import asyncio
+    from .archive import iter_archive_info
+    from .file_writer import file_log_writer
+    
+    items = await asyncio.to_thread(lambda: list(iter_archive_info(file_log_writer.logs_dir)))
+    return {
+        "items": items,
+        "total_bytes": sum(item["size"] for item in items),
+        "retention_bytes": file_log_writer.retention_bytes,
+    }
+
+
+@router.get("/api/v1/logging/files/search")
+async def search_log_files(
+    log_type: str = Query(default="app", pattern="^(app|error|audit|performance|system)$", description="Log file type"),
+    q: Optional[str] = Query(default=None, description="Keyword (case-insensitive substring)"),
+    level: Optional[str] = Query(default=None, description="Filter by level"),
+    trace_id: Optional[str] = Query(default=None, description="Filter by trace ID"),
+    start_date: Optional[date] = Query(default=None, description="Skip archives before this date"),
+    end_date: Optional[date] = Query(default=None, description="Skip archives after this date"),
+    include_archives: bool = Query(default=True, description="Also search rotated (compressed) archives"),
+    limit: int = Query(default=100, ge=1, le=1000, description="Maximum matching lines"),
+    current_user = Depends(get_admin_user_dependency),
+):
+    """
+    Search the current log file and its rotated archives (admin only).
+    
+    Compressed archives are decompressed as a stream, newest file first,
+    and the scan stops once `limit` matches are found.
+    """
+    import asyncio
+    from .archive import search_log_files as search_files
+    from .file_writer import file_log_writer
+    
+    return await asyncio.to_thread(
+        search_files,
+        file_log_writer.logs_dir,
+        log_type,
+        keyword=q,
+        level=level,
+        trace_id=trace_id,
+        start_date=start_date,
+        end_date=end_date,
+        include_archives=include_archives,
+        limit=limit,
+    )
+
+
 
 @router.delete("/api/v1/logging/logs/by-message")
 async def delete_logs_by_message(
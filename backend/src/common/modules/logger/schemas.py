@@ -598,16 +598,22 @@ class LogListQuery(BaseModel):
     user_id: Optional[UUID] = None
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
+    # 游标分页：传入上一页的 next_cursor 时按 (created_at, id) 定位，忽略 page
+    cursor: Optional[str] = None
 
 
 class LogListResponse(BaseModel):
-    """Response schema for application log list."""
+    """Response schema for application log list.
+
+    In cursor mode the total is not counted; total and total_pages are 0.
+    """
 
     items: list[AppLogResponse]
     total: int
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None
 
 
 class FrontendLogCreate(BaseModel):
@@ -11,12 +11,15 @@ Usage:
     await logging_service.performance(PerformanceLogCreate(...))  # -> performance.log + DB
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, or_
 from sqlalchemy.orm import selectinload
 from typing import Optional, TYPE_CHECKING, Type, Any, List
 from uuid import UUID
+from datetime import datetime
 import logging
 
+from ...utils.pagination import build_next_cursor, decode_cursor
+
 from .file_writer import file_log_writer
 from .db_writer import db_log_writer
 from .schemas import (
@@ -36,6 +39,11 @@ if TYPE_CHECKING:
     from ..db.models import AppLog, ErrorLog, AuditLog, PerformanceLog, SystemLog, Member
 
 
+def _log_cursor_key(log: Any) -> tuple:
+    """(created_at, id) of a log model row, for build_next_cursor."""
+    return log.created_at, log.id
+
+
 class LoggingService:
     """
     Unified logging service class.
@@ -149,6 +157,18 @@ class LoggingService:
         
         return schema.to_db_dict()
 
+    def is_enabled(self, level: str, log_type: str = "app") -> bool:
+        """
+        Check whether a log of this level would reach the file or the database.
+        
+        Lets callers skip building a schema that both writers would drop.
+        """
+        return file_log_writer.should_write_with_level(
+            level, file_log_writer._get_min_level_for_type(log_type)
+        ) or db_log_writer.should_write_with_level(
+            level, db_log_writer._get_min_level_for_type(log_type)
+        )
+
     # =========================================================================
     # Backward Compatibility - 向后兼容
     # =========================================================================
@@ -275,6 +295,36 @@ class LoggingService:
         if conditions:
             base_query = base_query.where(and_(*conditions))
         
+        # Stable ordering: id breaks ties between rows with the same created_at
+        base_query = base_query.order_by(model.created_at.desc(), model.id.desc())
+        
+        if query.cursor:
+            # Keyset mode: seek past the cursor instead of OFFSET scanning, and
+            # skip the count so deep pages cost the same as the first one.
+            # created_at <= cursor is kept as its own predicate so the
+            # created_at index can be used for the seek.
+            created_at, record_id = decode_cursor(query.cursor, uuid_id=True)
+            cursor_created_at = datetime.fromisoformat(created_at)
+            base_query = base_query.where(
+                model.created_at <= cursor_created_at,
+                or_(
+                    model.created_at < cursor_created_at,
+                    model.id < UUID(record_id),
+                ),
+            ).limit(query.page_size)
+            
+            result = await db.execute(base_query)
+            logs = result.scalars().all()
+            
+            return LogListResponse(
+                items=[self._to_response(log, log_type) for log in logs],
+                total=0,
+                page=query.page,
+                page_size=query.page_size,
+                total_pages=0,
+                next_cursor=build_next_cursor(logs, query.page_size, key=_log_cursor_key),
+            )
+        
         # Get total count
         count_query = select(func.count()).select_from(model)
         if conditions:
@@ -283,9 +333,8 @@ class LoggingService:
         total_result = await db.execute(count_query)
         total = total_result.scalar() or 0
         
-        # Apply pagination and ordering
+        # Apply pagination
         offset = (query.page - 1) * query.page_size
-        base_query = base_query.order_by(model.created_at.desc())
         base_query = base_query.offset(offset).limit(query.page_size)
         
         # Execute query
@@ -303,6 +352,7 @@ class LoggingService:
             page=query.page,
             page_size=query.page_size,
             total_pages=total_pages,
+            next_cursor=build_next_cursor(logs, query.page_size, key=_log_cursor_key),
         )
 
     async def list_logs(
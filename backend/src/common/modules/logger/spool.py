@@ -0,0 +1,230 @@
+"""Durable spill-to-disk spool for the database log pipeline.
+
+When a DatabaseLogWriter queue is full or a batch insert fails, entries are
+appended to segment files under logs/db_spool instead of being dropped. The
+writer's replayer drains the segments back into the database once it is
+reachable again.
+
+Layout:
+- critical-<timestamp>-<seq>.jsonl  error and audit logs
+- bulk-<timestamp>-<seq>.jsonl      app, performance and system logs
+- *.dead                            segments that kept failing on replay
+
+Each line is a JSON object {"type": <log type>, "data": <row>}.
+
+Disk budget:
+- Total spool size is bounded by max_bytes
+- When full, dead and then the oldest bulk segments are evicted to make room
+  for critical entries; bulk entries are rejected instead of evicting
+- Critical entries are only rejected when nothing else is left to evict
+
+All methods are blocking file I/O and thread-safe; the writer calls them from
+its spool executor thread, never from the event loop.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Log types that must survive an outage; they get their own segments and
+# priority over the disk budget
+CRITICAL_LOG_TYPES = ("error", "audit")
+
+SEGMENT_SUFFIX = ".jsonl"
+DEAD_SUFFIX = ".dead"
+
+
+def _default_spool_dir() -> Path:
+    """Spool directory inside the backend logs directory."""
+    backend_dir = Path(__file__).resolve().parent.parent.parent.parent.parent
+    return backend_dir / "logs" / "db_spool"
+
+
+class LogSpool:
+    """Append-only segment spool with a bounded disk budget."""
+
+    def __init__(
+        self,
+        spool_dir: Optional[Path] = None,
+        max_bytes: int = 100 * 1024 * 1024,
+        segment_bytes: int = 4 * 1024 * 1024,
+    ):
+        self.spool_dir = Path(spool_dir) if spool_dir else _default_spool_dir()
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._seq = 0
+        # Open segment per class ("critical" / "bulk"): (path, size)
+        self._active: Dict[str, Tuple[Path, int]] = {}
+        self._total_bytes: Optional[int] = None
+
+        # Statistics
+        self._stats = {
+            "spooled": 0,
+            "replayed": 0,
+            "rejected": 0,
+            "evicted_segments": 0,
+            "dead_segments": 0,
+        }
+
+    # =========================================================================
+    # Writing - 写入
+    # =========================================================================
+
+    def append(self, log_type: str, rows: List[Dict[str, Any]]) -> int:
+        """Append rows of one log type to the spool.
+
+        Returns:
+            Number of rows written (rows over the disk budget are rejected)
+        """
+        if not rows:
+            return 0
+
+        segment_class = "critical" if log_type in CRITICAL_LOG_TYPES else "bulk"
+        lines = [
+            json.dumps({"type": log_type, "data": row}, ensure_ascii=False, default=str) + "\n"
+            for row in rows
+        ]
+        payload = "".join(lines).encode("utf-8")
+
+        with self._lock:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            if not self._reserve(len(payload), segment_class):
+                self._stats["rejected"] += len(rows)
+                return 0
+
+            path, size = self._active_segment(segment_class)
+            with open(path, "ab") as f:
+                f.write(payload)
+            self._active[segment_class] = (path, size + len(payload))
+            self._total_bytes += len(payload)
+            self._stats["spooled"] += len(rows)
+        return len(rows)
+
+    def _active_segment(self, segment_class: str) -> Tuple[Path, int]:
+        """Current open segment for a class, starting a new one when full."""
+        active = self._active.get(segment_class)
+        if active and active[1] < self.segment_bytes and active[0].exists():
+            return active
+        self._seq += 1
+        path = self.spool_dir / f"{segment_class}-{time.time_ns()}-{self._seq:06d}{SEGMENT_SUFFIX}"
+        self._active[segment_class] = (path, 0)
+        return path, 0
+
+    def _reserve(self, size: int, segment_class: str) -> bool:
+        """Make room for size bytes within the disk budget (lock held)."""
+        if self._total_bytes is None:
+            self._total_bytes = sum(p.stat().st_size for p in self._all_files())
+
+        while self._total_bytes + size > self.max_bytes:
+            victim = self._eviction_candidate(segment_class)
+            if victim is None:
+                return False
+            victim_size = victim.stat().st_size
+            victim.unlink(missing_ok=True)
+            self._total_bytes -= victim_size
+            self._stats["evicted_segments"] += 1
+            for key, (path, _) in list(self._active.items()):
+                if path == victim:
+                    del self._active[key]
+        return True
+
+    def _eviction_candidate(self, segment_class: str) -> Optional[Path]:
+        """Oldest segment that may be evicted for an entry of this class."""
+        dead = sorted(self.spool_dir.glob(f"*{DEAD_SUFFIX}"))
+        if dead:
+            return dead[0]
+        if segment_class != "critical":
+            return None
+        bulk = sorted(self.spool_dir.glob(f"bulk-*{SEGMENT_SUFFIX}"))
+        return bulk[0] if bulk else None
+
+    def _all_files(self) -> List[Path]:
+        if not self.spool_dir.exists():
+            return []
+        return [p for p in self.spool_dir.iterdir() if p.is_file()]
+
+    # =========================================================================
+    # Replay - 回放
+    # =========================================================================
+
+    def next_segment(self) -> Optional[Path]:
+        """Oldest segment to replay (critical first), sealing it if still open."""
+        with self._lock:
+            if not self.spool_dir.exists():
+                return None
+            for segment_class in ("critical", "bulk"):
+                segments = sorted(self.spool_dir.glob(f"{segment_class}-*{SEGMENT_SUFFIX}"))
+                if segments:
+                    oldest = segments[0]
+                    active = self._active.get(segment_class)
+                    if active and active[0] == oldest:
+                        # Seal: new entries go to a fresh segment
+                        del self._active[segment_class]
+                    return oldest
+        return None
+
+    def read_segment(self, path: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream (log_type, row) pairs from a segment, skipping corrupt lines."""
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    yield record["type"], record["data"]
+                except (ValueError, KeyError, TypeError):
+                    # Torn write from a crash mid-append
+                    continue
+
+    def complete_segment(self, path: Path, replayed: int) -> None:
+        """Remove a fully replayed segment."""
+        with self._lock:
+            self._remove(path)
+            self._stats["replayed"] += replayed
+
+    def rewrite_segment(self, path: Path, remaining: List[Tuple[str, Dict[str, Any]]], replayed: int) -> None:
+        """Keep only the rows that were not replayed yet (partial replay)."""
+        payload = "".join(
+            json.dumps({"type": t, "data": row}, ensure_ascii=False, default=str) + "\n"
+            for t, row in remaining
+        ).encode("utf-8")
+        with self._lock:
+            old_size = path.stat().st_size if path.exists() else 0
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                f.write(payload)
+            tmp.replace(path)
+            if self._total_bytes is not None:
+                self._total_bytes += len(payload) - old_size
+            self._stats["replayed"] += replayed
+
+    def mark_dead(self, path: Path) -> None:
+        """Set aside a segment that keeps failing so it stops blocking replay."""
+        with self._lock:
+            if path.exists():
+                path.rename(path.with_suffix(DEAD_SUFFIX))
+                self._stats["dead_segments"] += 1
+
+    def _remove(self, path: Path) -> None:
+        if path.exists():
+            size = path.stat().st_size
+            path.unlink()
+            if self._total_bytes is not None:
+                self._total_bytes -= size
+
+    # =========================================================================
+    # Statistics - 统计
+    # =========================================================================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get spool statistics."""
+        with self._lock:
+            files = self._all_files()
+            segments = [p for p in files if p.suffix == SEGMENT_SUFFIX]
+            return {
+                **self._stats,
+                "segments": len(segments),
+                "dead": len([p for p in files if p.suffix == DEAD_SUFFIX]),
+                "bytes": sum(p.stat().st_size for p in files),
+                "max_bytes": self.max_bytes,
+            }
@@ -8,7 +8,7 @@ from supabase import create_client, Client
 from supabase.client import ClientOptions
 
 from ..config import settings
-from ..interceptor.database import UnifiedSupabaseClient, create_unified_supabase_client
+from ..interceptor.database import UnifiedSupabaseClient, create_unified_supabase_client, run_in_db_executor
 
 
 class SupabaseClient:
@@ -107,7 +107,9 @@ async def check_supabase_health() -> Dict[str, Any]:
     client = get_supabase_client()
     
     # 执行简单查询测试连接
-    result = client.table('members').select('count', count='exact').limit(1).execute()
+    result = await run_in_db_executor(
+        client.table('members').select('count', count='exact').limit(1).execute
+    )
     
     health_info = {
         "status": "healthy",
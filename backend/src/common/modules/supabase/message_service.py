@@ -1,7 +1,10 @@
-from typing import Dict, Any, List, Optional, Tuple
+import logging
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
 from .service import SupabaseService
 from ...utils.formatters import now_iso
 
+logger = logging.getLogger(__name__)
+
 
 class MessageService(SupabaseService):
     """消息管理服务类，处理统一消息表的所有数据库操作"""
@@ -14,47 +17,55 @@ class MessageService(SupabaseService):
     SENDER_MEMBER = "member"
     SENDER_SYSTEM = "system"
     
+    # message_unread_counts 中管理员共享的线程未读计数行
+    ADMIN_THREADS_UNREAD_KEY = "admin:threads"
+    
+    # 广播分发每次批量插入的行数
+    BROADCAST_CHUNK_SIZE = 500
+    # 续发时查询已投递接收者每批的 ID 数
+    BROADCAST_LOOKUP_BATCH_SIZE = 200
+    
     async def get_message_by_id(self, message_id: str) -> Optional[Dict[str, Any]]:
         """根据ID获取消息"""
-        result = self.client.table('messages')\
+        result = await self.client.table('messages')\
             .select('*')\
             .eq('id', message_id)\
             .limit(1)\
-            .execute()
+            .execute_async()
         return result.data[0] if result.data else None
     
     async def create_message(self, message_data: Dict[str, Any]) -> Dict[str, Any]:
         """创建消息"""
-        result = self.client.table('messages')\
+        result = await self.client.table('messages')\
             .insert(message_data)\
-            .execute()
+            .execute_async()
         if not result.data:
             raise ValueError("Failed to create message: no data returned")
         return result.data[0]
     
     async def update_message(self, message_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
         """更新消息"""
-        result = self.client.table('messages')\
+        result = await self.client.table('messages')\
             .update(update_data)\
             .eq('id', message_id)\
-            .execute()
+            .execute_async()
         if not result.data:
             raise ValueError(f"Failed to update message {message_id}: no data returned")
         return result.data[0]
 
     async def delete_message(self, message_id: str) -> bool:
         """删除消息（硬删除）"""
-        self.client.table('messages')\
+        await self.client.table('messages')\
             .delete()\
             .eq('id', message_id)\
-            .execute()
+            .execute_async()
         return True
     
     async def get_member_name(self, member_id: str) -> Optional[str]:
         """获取会员公司名称"""
         if not member_id:
             return None
-        result = self.client.table('members').select('company_name').eq('id', member_id).execute()
+        result = await self.client.table('members').select('company_name').eq('id', member_id).execute_async()
         return result.data[0]['company_name'] if result.data else None
     
     async def get_member_names_batch(self, member_ids: List[str]) -> Dict[str, str]:
@@ -64,14 +75,14 @@ class MessageService(SupabaseService):
         unique_ids = list(set(mid for mid in member_ids if mid))
         if not unique_ids:
             return {}
-        result = self.client.table('members').select('id, company_name').in_('id', unique_ids).execute()
+        result = await self.client.table('members').select('id, company_name').in_('id', unique_ids).execute_async()
         return {m['id']: m['company_name'] for m in (result.data or [])}
     
     async def get_admin_name(self, admin_id: str) -> Optional[str]:
         """获取管理员名称"""
         if not admin_id:
             return "System Admin"
-        result = self.client.table('admins').select('full_name').eq('id', admin_id).execute()
+        result = await self.client.table('admins').select('full_name').eq('id', admin_id).execute_async()
         return result.data[0]['full_name'] if result.data else "System Admin"
     
     async def get_admin_names_batch(self, admin_ids: List[str]) -> Dict[str, str]:
@@ -81,70 +92,39 @@ class MessageService(SupabaseService):
         unique_ids = list(set(aid for aid in admin_ids if aid))
         if not unique_ids:
             return {}
-        result = self.client.table('admins').select('id, full_name').in_('id', unique_ids).execute()
+        result = await self.client.table('admins').select('id, full_name').in_('id', unique_ids).execute_async()
         return {a['id']: a['full_name'] for a in (result.data or [])}
     
     async def is_admin(self, user_id: str) -> bool:
         """检查用户是否是管理员"""
         if not user_id:
             return False
-        result = self.client.table('admins').select('id').eq('id', user_id).execute()
+        result = await self.client.table('admins').select('id').eq('id', user_id).execute_async()
         return len(result.data) > 0
     
     async def get_unread_count(self, user_id: str, is_admin: bool = False) -> int:
-        """获取未读消息数量（线程内的消息 + 直接消息）"""
-        if is_admin:
-            # 管理员：统计线程内会员发送的未读消息 + 直接消息（系统通知）
-            total_count = 0
-            
-            # 1. 线程内会员发送的未读消息
-            thread_query = self.client.table('messages').select('id', count='exact')
-            thread_query = thread_query.not_.is_('thread_id', 'null')
-            thread_query = thread_query.eq('sender_type', self.SENDER_MEMBER)
-            thread_query = thread_query.eq('is_read', False)
-            thread_result = thread_query.execute()
-            total_count += thread_result.count or 0
-            
-            # 2. 直接消息（发送给管理员的系统通知）
-            direct_query = self.client.table('messages').select('id', count='exact')
-            direct_query = direct_query.eq('message_type', self.TYPE_DIRECT)
-            direct_query = direct_query.eq('recipient_id', user_id)
-            direct_query = direct_query.eq('is_read', False)
-            direct_result = direct_query.execute()
-            total_count += direct_result.count or 0
-            
-            return total_count
-        else:
-            # 会员：统计线程内管理员回复 + 系统直接消息
-            # 需要先获取该会员的所有线程ID
-            threads_query = self.client.table('messages').select('id')
-            threads_query = threads_query.eq('message_type', self.TYPE_THREAD)
-            threads_query = threads_query.is_('thread_id', 'null')
-            threads_query = threads_query.eq('sender_id', user_id)
-            threads_result = threads_query.execute()
-            thread_ids = [t['id'] for t in (threads_result.data or [])]
-            
-            # 统计未读消息
-            total_count = 0
-            
-            # 1. 线程内管理员发送的未读消息
-            if thread_ids:
-                thread_query = self.client.table('messages').select('id', count='exact')
-                thread_query = thread_query.in_('thread_id', thread_ids)
-                thread_query = thread_query.eq('sender_type', self.SENDER_ADMIN)
-                thread_query = thread_query.eq('is_read', False)
-                thread_result = thread_query.execute()
-                total_count += thread_result.count or 0
-            
-            # 2. 直接消息（系统通知）
-            direct_query = self.client.table('messages').select('id', count='exact')
-            direct_query = direct_query.eq('message_type', self.TYPE_DIRECT)
-            direct_query = direct_query.eq('recipient_id', user_id)
-            direct_query = direct_query.eq('is_read', False)
-            direct_result = direct_query.execute()
-            total_count += direct_result.count or 0
-            
-            return total_count
+        """获取未读消息数量（线程内的消息 + 直接消息）
+
+        读取 messages 触发器维护的 message_unread_counts，一次主键查询：
+        - 会员：发给自己的直接消息 + 自己发起线程中管理员的回复
+        - 管理员：发给自己的直接消息 + 所有线程中会员发送的消息（共享计数行）
+        """
+        keys = [user_id, self.ADMIN_THREADS_UNREAD_KEY] if is_admin else [user_id]
+        result = await self.client.table('message_unread_counts')\
+            .select('unread_count')\
+            .in_('owner_key', keys)\
+            .execute_async()
+        total = sum(row['unread_count'] for row in (result.data or []))
+        if total < 0:
+            # 触发器不截断计数，负数说明计数漂移
+            logger.warning(f"message_unread_counts drift for {keys}: {total}, run refresh_message_unread_counts()")
+            return 0
+        return total
+    
+    async def refresh_unread_counts(self) -> int:
+        """按消息表重算 message_unread_counts（修复/回填），返回被修正的行数"""
+        result = await self.client.rpc('refresh_message_unread_counts', {}).execute_async()
+        return result.data or 0
     
     async def get_threads_paginated(
         self,
@@ -162,7 +142,7 @@ class MessageService(SupabaseService):
         if sender_id:
             query = query.eq('sender_id', sender_id)
         
-        count_result = query.execute()
+        count_result = await query.execute_async()
         total_count = count_result.count or 0
         
         offset = (page - 1) * page_size
@@ -177,7 +157,7 @@ class MessageService(SupabaseService):
         threads_query = threads_query.order('created_at', desc=True)
         threads_query = threads_query.range(offset, offset + page_size - 1)
         
-        result = threads_query.execute()
+        result = await threads_query.execute_async()
         return result.data or [], total_count
     
     async def get_thread_stats_batch(self, thread_ids: List[str], for_admin: bool = False) -> Dict[str, Dict[str, int]]:
@@ -187,7 +167,7 @@ class MessageService(SupabaseService):
         
         query = self.client.table('messages').select('thread_id, sender_type, is_read')
         query = query.in_('thread_id', thread_ids)
-        result = query.execute()
+        result = await query.execute_async()
         
         stats = {tid: {'message_count': 0, 'unread_count': 0} for tid in thread_ids}
         
@@ -205,21 +185,21 @@ class MessageService(SupabaseService):
 
     async def get_thread_by_id(self, thread_id: str) -> Optional[Dict[str, Any]]:
         """获取单个 thread"""
-        result = self.client.table('messages')\
+        result = await self.client.table('messages')\
             .select('*')\
             .eq('id', thread_id)\
             .eq('message_type', self.TYPE_THREAD)\
             .is_('thread_id', 'null')\
-            .execute()
+            .execute_async()
         return result.data[0] if result.data else None
     
     async def get_thread_messages_list(self, thread_id: str) -> List[Dict[str, Any]]:
         """获取 thread 下的所有消息（包含附件）"""
-        result = self.client.table('messages')\
+        result = await self.client.table('messages')\
             .select('*')\
             .eq('thread_id', thread_id)\
             .order('created_at', desc=False)\
-            .execute()
+            .execute_async()
         
         messages = result.data or []
         if not messages:
@@ -241,7 +221,7 @@ class MessageService(SupabaseService):
         """标记 thread 中的消息为已读"""
         sender_type = self.SENDER_MEMBER if reader_type == 'admin' else self.SENDER_ADMIN
         
-        result = self.client.table('messages')\
+        result = await self.client.table('messages')\
             .update({
                 'is_read': True,
                 'read_at': now_iso()
@@ -249,7 +229,7 @@ class MessageService(SupabaseService):
             .eq('thread_id', thread_id)\
             .eq('sender_type', sender_type)\
             .eq('is_read', False)\
-            .execute()
+            .execute_async()
         
         return len(result.data) if result.data else 0
     
@@ -306,7 +286,7 @@ class MessageService(SupabaseService):
         query = query.order('created_at', desc=True)\
                     .range(offset, offset + limit - 1)
         
-        result = query.execute()
+        result = await query.execute_async()
         return result.data or [], total
     
     async def mark_message_as_read(self, message_id: str, user_id: str) -> Dict[str, Any]:
@@ -380,7 +360,7 @@ class MessageService(SupabaseService):
         query = query.order('created_at', desc=False)\
                     .range(offset, offset + limit - 1)
         
-        result = query.execute()
+        result = await query.execute_async()
         return result.data or [], total
     
     async def create_broadcast_message(
@@ -413,40 +393,75 @@ class MessageService(SupabaseService):
     async def send_broadcast_to_recipients(
         self,
         broadcast_template_id: str,
-        recipient_ids: List[str]
-    ) -> List[Dict[str, Any]]:
-        """向多个接收者发送广播消息"""
+        recipient_ids: List[str],
+        chunk_size: int = BROADCAST_CHUNK_SIZE,
+        on_progress: Optional[Callable[[int], None]] = None,
+        start: int = 0
+    ) -> int:
+        """向多个接收者发送广播消息，返回发送数量
+
+        每 chunk_size 个接收者一次批量插入（不回读插入的行），每批完成后
+        调用 on_progress(已完成的偏移量)，全部完成后更新模板的 broadcast_count。
+
+        每批是单条 INSERT，要么全部写入要么全部失败；失败后从最后完成的偏移量
+        start 继续即可。续发的第一批先排除已有消息的接收者（请求报错但实际已提交时），
+        避免重复投递。
+        """
         template = await self.get_message_by_id(broadcast_template_id)
         if not template or template.get("message_type") != "broadcast":
             raise ValueError("Invalid broadcast template")
         
-        created_messages = []
-        for recipient_id in recipient_ids:
-            message_data = {
-                "message_type": "broadcast",
-                "thread_id": broadcast_template_id,
-                "sender_id": template["sender_id"],
-                "sender_type": template["sender_type"],
-                "recipient_id": recipient_id,
-                "subject": template["subject"],
-                "content": template["content"],
-                "category": template["category"],
-                "priority": template["priority"],
-                "status": "sent",
-                "is_read": False,
-                "is_important": template["is_important"],
-                "is_broadcast": True,
-                "sent_at": now_iso(),
-            }
-            
-            created_message = await self.create_message(message_data)
-            created_messages.append(created_message)
+        sent_at = now_iso()
+        sent = start
+        for offset in range(start, len(recipient_ids), chunk_size):
+            chunk = recipient_ids[offset:offset + chunk_size]
+            if offset == start and start > 0:
+                delivered = await self.get_broadcast_recipient_ids(broadcast_template_id, chunk)
+                chunk = [rid for rid in chunk if rid not in delivered]
+            await self.insert_messages_batch([
+                {
+                    "message_type": "broadcast",
+                    "thread_id": broadcast_template_id,
+                    "sender_id": template["sender_id"],
+                    "sender_type": template["sender_type"],
+                    "recipient_id": recipient_id,
+                    "subject": template["subject"],
+                    "content": template["content"],
+                    "category": template["category"],
+                    "priority": template["priority"],
+                    "status": "sent",
+                    "is_read": False,
+                    "is_important": template["is_important"],
+                    "is_broadcast": True,
+                    "sent_at": sent_at,
+                }
+                for recipient_id in chunk
+            ], returning_rows=False)
+            sent = min(offset + chunk_size, len(recipient_ids))
+            if on_progress:
+                on_progress(sent)
         
         await self.update_message(broadcast_template_id, {
-            "broadcast_count": len(recipient_ids)
+            "broadcast_count": sent
         })
         
-        return created_messages
+        return sent
+    
+    async def get_broadcast_recipient_ids(
+        self, broadcast_template_id: str, recipient_ids: List[str]
+    ) -> Set[str]:
+        """查询 recipient_ids 中已收到该广播的接收者（分批查询，避免 in_ 过滤导致 URL 过长）"""
+        delivered: Set[str] = set()
+        for offset in range(0, len(recipient_ids), self.BROADCAST_LOOKUP_BATCH_SIZE):
+            batch = recipient_ids[offset:offset + self.BROADCAST_LOOKUP_BATCH_SIZE]
+            result = await self.client.table('messages')\
+                .select('recipient_id')\
+                .eq('thread_id', broadcast_template_id)\
+                .eq('message_type', 'broadcast')\
+                .in_('recipient_id', batch)\
+                .execute_async()
+            delivered.update(row['recipient_id'] for row in result.data or [])
+        return delivered
     
     async def get_broadcast_messages(
         self,
@@ -461,7 +476,7 @@ class MessageService(SupabaseService):
         if category:
             query = query.eq('category', category)
         
-        count_result = query.execute()
+        count_result = await query.execute_async()
         total = count_result.count or 0
         
         data_query = self.client.table('messages').select('*')
@@ -472,7 +487,7 @@ class MessageService(SupabaseService):
         
         data_query = data_query.order('created_at', desc=True).range(offset, offset + limit - 1)
         
-        result = data_query.execute()
+        result = await data_query.execute_async()
         return result.data or [], total
 
     async def get_messages_paginated(
@@ -484,69 +499,49 @@ class MessageService(SupabaseService):
         is_important: Optional[bool] = None,
         is_read: Optional[bool] = None,
         message_type: Optional[str] = None,
-        is_admin: bool = False
+        is_admin: bool = False,
+        cursor: Optional[str] = None
     ) -> Tuple[List[Dict[str, Any]], int, int]:
-        """获取用户消息列表（分页）"""
-        query = self.client.table('messages').select('*', count='exact')
-        
-        if is_admin:
-            query = query.eq('message_type', 'direct')
-            query = query.eq('recipient_id', user_id)
-        else:
+        """获取用户消息列表（分页）
+
+        传入 cursor 时使用 (created_at, id) 游标分页（忽略 page），
+        适用于无限滚动：只查询当前页，不统计总数和未读数（返回 0），
+        翻页深度不影响查询耗时。
+        页码模式下总数随当前页查询一并返回，未读数只取计数不下载行。
+        """
+        def apply_filters(query, include_is_read: bool = True):
+            if is_admin:
+                query = query.eq('message_type', 'direct')
             query = query.eq('recipient_id', user_id)
-        
-        if message_type:
-            query = query.eq('message_type', message_type)
-        if category:
-            query = query.eq('category', category)
-        if is_important is not None:
-            query = query.eq('is_important', is_important)
-        if is_read is not None:
-            query = query.eq('is_read', is_read)
-        
-        count_result = query.execute()
-        total_count = count_result.count or 0
-        
-        unread_query = self.client.table('messages').select('id', count='exact')
-        if is_admin:
-            unread_query = unread_query.eq('message_type', 'direct').eq('is_read', False)
-            unread_query = unread_query.eq('recipient_id', user_id)
-        else:
-            unread_query = unread_query.eq('recipient_id', user_id).eq('is_read', False)
-        
-        if message_type:
-            unread_query = unread_query.eq('message_type', message_type)
-        if category:
-            unread_query = unread_query.eq('category', category)
-        if is_important is not None:
-            unread_query = unread_query.eq('is_important', is_important)
-        
-        unread_result = unread_query.execute()
+            if message_type:
+                query = query.eq('message_type', message_type)
+            if category:
+                query = query.eq('category', category)
+            if is_important is not None:
+                query = query.eq('is_important', is_important)
+            if include_is_read and is_read is not None:
+                query = query.eq('is_read', is_read)
+            return query
+        
+        if cursor:
+            messages_query = apply_filters(self.client.table('messages').select('*'))
+            messages_query = self._apply_seek(messages_query, cursor).limit(page_size)
+            result = await messages_query.execute_async()
+            return result.data or [], 0, 0
+        
+        unread_query = apply_filters(
+            self.client.table('messages').select('id', count='exact'), include_is_read=False
+        )
+        unread_result = await unread_query.eq('is_read', False).limit(1).execute_async()
         unread_count = unread_result.count or 0
         
         offset = (page - 1) * page_size
-        messages_query = self.client.table('messages').select('*')
-        
-        if is_admin:
-            messages_query = messages_query.eq('message_type', 'direct')
-            messages_query = messages_query.eq('recipient_id', user_id)
-        else:
-            messages_query = messages_query.eq('recipient_id', user_id)
-        
-        if message_type:
-            messages_query = messages_query.eq('message_type', message_type)
-        if category:
-            messages_query = messages_query.eq('category', category)
-        if is_important is not None:
-            messages_query = messages_query.eq('is_important', is_important)
-        if is_read is not None:
-            messages_query = messages_query.eq('is_read', is_read)
-        
-        messages_query = messages_query.order('created_at', desc=True)
+        messages_query = apply_filters(self.client.table('messages').select('*', count='exact'))
+        messages_query = messages_query.order('created_at', desc=True).order('id', desc=True)
         messages_query = messages_query.range(offset, offset + page_size - 1)
         
-        result = messages_query.execute()
-        return result.data or [], total_count, unread_count
+        result = await messages_query.execute_async()
+        return result.data or [], result.count or 0, unread_count
     
     async def get_message_with_access_check(
         self,
@@ -554,7 +549,7 @@ class MessageService(SupabaseService):
         user_id: str
     ) -> Optional[Dict[str, Any]]:
         """获取消息并检查访问权限"""
-        result = self.client.table('messages').select('*').eq('id', message_id).execute()
+        result = await self.client.table('messages').select('*').eq('id', message_id).execute_async()
         
         if not result.data:
             return None
@@ -572,41 +567,46 @@ class MessageService(SupabaseService):
             'is_read': True,
             'read_at': now_iso()
         }
-        result = self.client.table('messages').update(update_data).eq('id', message_id).execute()
+        result = await self.client.table('messages').update(update_data).eq('id', message_id).execute_async()
         return result.data[0] if result.data else {}
     
     async def soft_delete_message(self, message_id: str) -> bool:
         """软删除消息"""
-        self.client.table('messages')\
+        await self.client.table('messages')\
             .update({'deleted_at': now_iso()})\
             .eq('id', message_id)\
-            .execute()
+            .execute_async()
         return True
     
     async def insert_message(self, message_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """插入消息"""
-        result = self.client.table('messages').insert(message_data).execute()
+        result = await self.client.table('messages').insert(message_data).execute_async()
         return result.data[0] if result.data else None
     
-    async def insert_messages_batch(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """批量插入消息"""
+    async def insert_messages_batch(
+        self, messages: List[Dict[str, Any]], returning_rows: bool = True
+    ) -> List[Dict[str, Any]]:
+        """批量插入消息（returning_rows=False 时不回读，返回空列表）"""
         if not messages:
             return []
-        result = self.client.table('messages').insert(messages).execute()
+        if not returning_rows:
+            await self.client.table('messages').insert(messages, returning='minimal').execute_async()
+            return []
+        result = await self.client.table('messages').insert(messages).execute_async()
         return result.data or []
     
     async def update_thread_status(self, thread_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """更新 thread 状态"""
-        result = self.client.table('messages')\
+        result = await self.client.table('messages')\
             .update(update_data)\
             .eq('id', thread_id)\
             .eq('message_type', self.TYPE_THREAD)\
-            .execute()
+            .execute_async()
         return result.data[0] if result.data else None
     
     async def get_active_member_ids(self) -> List[str]:
         """获取所有活跃会员ID"""
-        result = self.client.table('members').select('id').eq('status', 'active').execute()
+        result = await self.client.table('members').select('id').eq('status', 'active').execute_async()
         return [m['id'] for m in (result.data or [])]
     
     async def get_analytics_data(self, start_date: Optional[str] = None) -> Dict[str, Any]:
@@ -616,12 +616,12 @@ class MessageService(SupabaseService):
         total_query = self.client.table('messages').select('id', count='exact')
         if start_date:
             total_query = total_query.gte('created_at', start_date)
-        total_result = total_query.execute()
+        total_result = await total_query.execute_async()
         
         unread_query = self.client.table('messages').select('id', count='exact').eq('is_read', False)
         if start_date:
             unread_query = unread_query.gte('created_at', start_date)
-        unread_result = unread_query.execute()
+        unread_result = await unread_query.execute_async()
         
         messages_by_day = []
         messages_by_category = []
@@ -631,7 +631,7 @@ class MessageService(SupabaseService):
         messages_query = self.client.table('messages').select('created_at, category, thread_id, sender_type')
         if start_date:
             messages_query = messages_query.gte('created_at', start_date)
-        messages_result = messages_query.execute()
+        messages_result = await messages_query.execute_async()
         
         if messages_result.data:
             day_counts = {}
@@ -1,8 +1,9 @@
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
 from supabase import Client
 from .client import get_supabase_client, get_unified_supabase_client
+from ...utils.pagination import decode_cursor, build_next_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -10,24 +11,27 @@ logger = logging.getLogger(__name__)
 class SupabaseService:
     """统一的 Supabase 服务类，提供通用数据库操作方法"""
     
+    # PostgREST 单次请求最多返回的行数（max-rows）
+    MAX_ROWS_PER_REQUEST = 1000
+    
     def __init__(self):
         self.client = get_unified_supabase_client()
         self._raw_client: Client = get_supabase_client()
 
     async def get_by_id(self, table: str, id: str) -> Optional[Dict[str, Any]]:
         """根据 ID 获取单条记录"""
-        result = self.client.table(table)\
+        result = await self.client.table(table)\
             .select('*')\
             .eq('id', id)\
-            .execute()
+            .execute_async()
         
         return result.data[0] if result.data else None
 
     async def create_record(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """创建新记录"""
-        result = self.client.table(table)\
+        result = await self.client.table(table)\
             .insert(data)\
-            .execute()
+            .execute_async()
         
         if not result.data:
             raise ValueError(f"Failed to create record in {table}")
@@ -35,10 +39,10 @@ class SupabaseService:
 
     async def update_record(self, table: str, id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """更新记录"""
-        result = self.client.table(table)\
+        result = await self.client.table(table)\
             .update(data)\
             .eq('id', id)\
-            .execute()
+            .execute_async()
         
         if not result.data:
             raise ValueError(f"Failed to update record {id} in {table}")
@@ -46,19 +50,19 @@ class SupabaseService:
 
     async def delete_record(self, table: str, id: str) -> bool:
         """软删除记录（设置 deleted_at）"""
-        result = self.client.table(table)\
+        result = await self.client.table(table)\
             .update({'deleted_at': datetime.now(timezone.utc).isoformat()})\
             .eq('id', id)\
-            .execute()
+            .execute_async()
         
         return bool(result.data)
 
     async def hard_delete_record(self, table: str, id: str) -> bool:
         """硬删除记录"""
-        self.client.table(table)\
+        await self.client.table(table)\
             .delete()\
             .eq('id', id)\
-            .execute()
+            .execute_async()
         
         return True
 
@@ -72,14 +76,12 @@ class SupabaseService:
         order_desc: bool = True,
         exclude_deleted: bool = True
     ) -> Tuple[List[Dict[str, Any]], int]:
-        """分页查询记录列表"""
-        count_filters = filters.copy() if filters else {}
-        if exclude_deleted:
-            count_filters['deleted_at'] = None
-        
-        total = await self.count_records(table, count_filters)
-        
-        query = self.client.table(table).select('*')
+        """分页查询记录列表
+
+        数据和总数在同一个请求中返回（count='exact' + range）。
+        projects 表的 applications_count 是由触发器维护的列，随行一起返回。
+        """
+        query = self.client.table(table).select('*', count='exact')
         
         if filters:
             for key, value in filters.items():
@@ -89,24 +91,62 @@ class SupabaseService:
         if exclude_deleted:
             query = query.is_('deleted_at', 'null')
         
+        # id 作为第二排序键，保证分页稳定
         query = query.order(order_by, desc=order_desc)
+        if order_by != 'id':
+            query = query.order('id')
         
         offset = (page - 1) * page_size
         query = query.range(offset, offset + page_size - 1)
         
-        result = query.execute()
-        records = result.data or []
+        result = await query.execute_async()
+        
+        return result.data or [], result.count or 0
+
+    def _apply_seek(self, query, cursor: Optional[str]):
+        """应用 (created_at, id) 游标条件，并按 created_at DESC, id DESC 排序
+
+        created_at <= 游标 单独作为一个条件，使查询可以走 created_at 索引定位。
+        """
+        if cursor:
+            created_at, record_id = decode_cursor(cursor)
+            query = query.lte('created_at', created_at)\
+                .or_(f'created_at.lt."{created_at}",id.lt.{record_id}')
+        return query.order('created_at', desc=True).order('id', desc=True)
+
+    async def list_with_cursor(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        page_size: int = 20,
+        exclude_deleted: bool = True
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """游标分页查询（按 created_at DESC, id DESC）
+
+        list_with_pagination 的 keyset 版本，适用于 app_logs、messages、
+        project_applications 等数据量大的表：任意深度的翻页都只需定位到游标位置，
+        不需要 OFFSET 扫描，也不统计总数。
+
+        Returns:
+            (当前页记录, next_cursor)；next_cursor 为 None 表示没有更多数据
+        """
+        query = self.client.table(table).select('*')
         
-        if table == 'projects':
-            for record in records:
-                app_count_result = self.client.table('project_applications')\
-                    .select('*', count='exact')\
-                    .eq('project_id', record['id'])\
-                    .is_('deleted_at', 'null')\
-                    .execute()
-                record['applications_count'] = app_count_result.count or 0
+        if filters:
+            for key, value in filters.items():
+                if value is not None:
+                    query = query.eq(key, value)
         
-        return records, total
+        if exclude_deleted:
+            query = query.is_('deleted_at', 'null')
+        
+        query = self._apply_seek(query, cursor).limit(page_size)
+        
+        result = await query.execute_async()
+        records = result.data or []
+        
+        return records, build_next_cursor(records, page_size)
 
     async def count_records(self, table: str, filters: Optional[Dict[str, Any]] = None) -> int:
         """统计记录数量"""
@@ -120,7 +160,7 @@ class SupabaseService:
                     else:
                         query = query.eq(key, value)
         
-        result = query.execute()
+        result = await query.execute_async()
         return result.count or 0
 
     async def exists(self, table: str, filters: Dict[str, Any]) -> bool:
@@ -132,7 +172,7 @@ class SupabaseService:
                 query = query.eq(key, value)
         
         query = query.limit(1)
-        result = query.execute()
+        result = await query.execute_async()
         
         return bool(result.data)
 
@@ -140,31 +180,31 @@ class SupabaseService:
         """根据事业者登录번호获取会员"""
         normalized_number = business_number.replace('-', '').replace(' ', '')
         
-        result = self.client.table('members')\
+        result = await self.client.table('members')\
             .select('*')\
             .eq('business_number', normalized_number)\
             .is_('deleted_at', 'null')\
-            .execute()
+            .execute_async()
         
         return result.data[0] if result.data else None
 
     async def get_member_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """根据邮箱获取会员"""
-        result = self.client.table('members')\
+        result = await self.client.table('members')\
             .select('*')\
             .eq('email', email)\
             .is_('deleted_at', 'null')\
-            .execute()
+            .execute_async()
         
         return result.data[0] if result.data else None
 
     async def get_member_by_reset_token(self, token: str) -> Optional[Dict[str, Any]]:
         """根据重置令牌获取会员"""
-        result = self.client.table('members')\
+        result = await self.client.table('members')\
             .select('*')\
             .eq('reset_token', token)\
             .is_('deleted_at', 'null')\
-            .execute()
+            .execute_async()
         
         return result.data[0] if result.data else None
 
@@ -178,25 +218,30 @@ class SupabaseService:
         if exclude_member_id:
             query = query.neq('id', exclude_member_id)
         
-        result = query.execute()
+        result = await query.execute_async()
         return len(result.data) == 0
 
     async def get_approved_members_count(self) -> int:
-        """获取已批准会员总数"""
-        result = self.client.table('members')\
-            .select('*', count='exact')\
-            .eq('approval_status', 'approved')\
-            .is_('deleted_at', 'null')\
-            .execute()
-        
-        return result.count or 0
+        """获取已批准会员总数（缓存，会员审批状态变化时失效）"""
+        from ..cache import cache_service
+
+        async def load() -> int:
+            result = await self.client.table('members')\
+                .select('id', count='exact')\
+                .eq('approval_status', 'approved')\
+                .is_('deleted_at', 'null')\
+                .limit(1)\
+                .execute_async()
+            return result.count or 0
+
+        return await cache_service.get_or_load('members', 'approved_count', load)
 
     async def get_admin_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """根据邮箱获取管理员"""
-        result = self.client.table('admins')\
+        result = await self.client.table('admins')\
             .select('*')\
             .eq('email', email)\
-            .execute()
+            .execute_async()
         
         return result.data[0] if result.data else None
 
@@ -224,131 +269,129 @@ class SupabaseService:
         """更新会员档案信息（member_profiles 表已合并到 members 表）"""
         update_data = {k: v for k, v in profile_data.items() if k != 'member_id'}
         
-        result = self.client.table('members')\
+        result = await self.client.table('members')\
             .update(update_data)\
             .eq('id', member_id)\
-            .execute()
+            .execute_async()
         
         return result.data[0] if result.data else None
 
+    async def _fetch_page(
+        self,
+        build_query: Callable[[], Any],
+        page: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """执行分页查询，返回 (当前页记录, 总数)
+
+        build_query 每次调用返回一个新的查询（select 需带 count='exact'），
+        数据和总数在同一个请求中返回。指定 page_size 时只读取对应页；
+        未指定时按 PostgREST max-rows 分批读取全部记录（仅供导出等内部调用）。
+        """
+        if page_size:
+            offset = (max(page or 1, 1) - 1) * page_size
+            result = await build_query().range(offset, offset + page_size - 1).execute_async()
+            return result.data or [], result.count or 0
+        
+        records: List[Dict[str, Any]] = []
+        total = 0
+        offset = 0
+        while True:
+            result = await build_query()\
+                .range(offset, offset + self.MAX_ROWS_PER_REQUEST - 1)\
+                .execute_async()
+            batch = result.data or []
+            records.extend(batch)
+            total = result.count or len(records)
+            if len(batch) < self.MAX_ROWS_PER_REQUEST:
+                break
+            offset += self.MAX_ROWS_PER_REQUEST
+        
+        return records, total
+
     async def list_members_with_filters(self, **kwargs) -> Tuple[List[Dict[str, Any]], int]:
-        """查询会员列表（支持高级过滤和搜索）"""
+        """查询会员列表（支持高级过滤、搜索和分页）
+
+        传入 page/page_size 时在数据库层分页；总数与筛选条件一致。
+        """
         search = kwargs.get('search')
         approval_status = kwargs.get('approval_status')
         region = kwargs.get('region')
         sort_by = kwargs.get('sort_by', 'created_at')
         sort_order = kwargs.get('sort_order', 'desc')
         
-        query = self.client.table('members').select('*')
-        
-        if approval_status:
-            query = query.eq('approval_status', approval_status)
-        if region:
-            query = query.eq('region', region)
-        
-        if search:
-            query = query.or_(f'company_name.ilike.%{search}%,business_number.ilike.%{search}%')
-        
-        query = query.is_('deleted_at', 'null')
-        
-        query = query.order(sort_by, desc=(sort_order == 'desc'))
-        
-        result = query.execute()
-        
-        count_result = self.client.table('members')\
-            .select('*', count='exact')\
-            .is_('deleted_at', 'null')\
-            .execute()
+        def build_query():
+            query = self.client.table('members').select('*', count='exact')
+            
+            if approval_status:
+                query = query.eq('approval_status', approval_status)
+            if region:
+                query = query.eq('region', region)
+            
+            if search:
+                query = query.or_(f'company_name.ilike.%{search}%,business_number.ilike.%{search}%')
+            
+            query = query.is_('deleted_at', 'null')
+            
+            # id 作为第二排序键，保证分页稳定
+            return query.order(sort_by, desc=(sort_order == 'desc')).order('id')
         
-        return result.data or [], count_result.count or 0
+        return await self._fetch_page(build_query, kwargs.get('page'), kwargs.get('page_size'))
 
     async def list_performance_records_with_filters(self, **kwargs) -> Tuple[List[Dict[str, Any]], int]:
-        """查询绩效记录列表（支持高级过滤）"""
+        """查询绩效记录列表（支持高级过滤和分页）"""
         sort_by = kwargs.get('sort_by', 'created_at')
         sort_order = kwargs.get('sort_order', 'desc')
         
-        query = self.client.table('performance_records')\
-            .select('*, members!performance_records_member_id_fkey(company_name, business_number)')\
-            .is_('deleted_at', 'null')\
-            .order(sort_by, desc=(sort_order == 'desc'))
+        def build_query():
+            return self.client.table('performance_records')\
+                .select('*, members!performance_records_member_id_fkey(company_name, business_number)', count='exact')\
+                .is_('deleted_at', 'null')\
+                .order(sort_by, desc=(sort_order == 'desc'))\
+                .order('id')
         
-        result = query.execute()
+        data, total = await self._fetch_page(build_query, kwargs.get('page'), kwargs.get('page_size'))
         
         records = []
-        for record in (result.data or []):
+        for record in data:
             member_info = record.pop('members', None) or {}
             record['member_company_name'] = member_info.get('company_name', '')
             record['member_business_number'] = member_info.get('business_number', '')
             records.append(record)
         
-        count_result = self.client.table('performance_records')\
-            .select('*', count='exact')\
-            .is_('deleted_at', 'null')\
-            .execute()
-        
-        return records, count_result.count or 0
+        return records, total
 
     async def list_projects_with_filters(self, **kwargs) -> Tuple[List[Dict[str, Any]], int]:
-        """查询项目列表（支持高级过滤）"""
+        """查询项目列表（支持高级过滤和分页）"""
         sort_by = kwargs.get('sort_by', 'created_at')
         sort_order = kwargs.get('sort_order', 'desc')
         
-        query = self.client.table('projects')\
-            .select('*')\
-            .is_('deleted_at', 'null')\
-            .order(sort_by, desc=(sort_order == 'desc'))
-        
-        result = query.execute()
-        projects = result.data or []
-        
-        if projects:
-            project_ids = [p['id'] for p in projects]
-            app_counts_result = self.client.table('project_applications')\
-                .select('project_id')\
-                .in_('project_id', project_ids)\
+        def build_query():
+            return self.client.table('projects')\
+                .select('*', count='exact')\
                 .is_('deleted_at', 'null')\
-                .execute()
-            
-            app_counts = {}
-            for app in (app_counts_result.data or []):
-                pid = app['project_id']
-                app_counts[pid] = app_counts.get(pid, 0) + 1
-            
-            for project in projects:
-                project['applications_count'] = app_counts.get(project['id'], 0)
+                .order(sort_by, desc=(sort_order == 'desc'))\
+                .order('id')
         
-        count_result = self.client.table('projects')\
-            .select('*', count='exact')\
-            .is_('deleted_at', 'null')\
-            .execute()
-        
-        return projects, count_result.count or 0
+        # applications_count 由 project_applications 触发器维护，直接随项目返回
+        return await self._fetch_page(build_query, kwargs.get('page'), kwargs.get('page_size'))
 
     async def list_project_applications_with_filters(self, **kwargs) -> Tuple[List[Dict[str, Any]], int]:
-        """查询项目申请列表（支持高级过滤）"""
+        """查询项目申请列表（支持高级过滤和分页）"""
         sort_by = kwargs.get('sort_by', 'submitted_at')
         sort_order = kwargs.get('sort_order', 'desc')
         project_id = kwargs.get('project_id')
         
-        query = self.client.table('project_applications')\
-            .select('*, projects(title), members(company_name, business_number)')
-        
-        if project_id:
-            query = query.eq('project_id', project_id)
-        
-        query = query.order(sort_by, desc=(sort_order == 'desc'))
-        
-        result = query.execute()
-        
-        count_query = self.client.table('project_applications')\
-            .select('*', count='exact')
-        
-        if project_id:
-            count_query = count_query.eq('project_id', project_id)
-        
-        count_result = count_query.execute()
+        def build_query():
+            query = self.client.table('project_applications')\
+                .select('*, projects(title), members(company_name, business_number)', count='exact')
+            
+            if project_id:
+                query = query.eq('project_id', project_id)
+            
+            return query.order(sort_by, desc=(sort_order == 'desc')).order('id')
         
-        return result.data or [], count_result.count or 0
+        return await self._fetch_page(build_query, kwargs.get('page'), kwargs.get('page_size'))
 
     async def list_member_applications_with_filters(self, **kwargs) -> Tuple[List[Dict[str, Any]], int]:
         """查询会员的项目申请列表（支持搜索）"""
@@ -366,7 +409,7 @@ class SupabaseService:
         
         query = query.order(sort_by, desc=(sort_order == 'desc'))
         
-        result = query.execute()
+        result = await query.execute_async()
         
         data = result.data or []
         if search:
@@ -378,39 +421,22 @@ class SupabaseService:
         
         return data, len(data)
 
-    async def get_performance_records(self, **kwargs) -> List[Dict[str, Any]]:
-        """获取绩效记录（用于仪表板）"""
-        year = kwargs.get('year')
-        quarter = kwargs.get('quarter')
-        status = kwargs.get('status', 'approved')
-        
-        query = self.client.table('performance_records')\
-            .select('*')\
-            .eq('status', status)\
-            .is_('deleted_at', 'null')
-        
-        if year:
-            query = query.eq('year', year)
-        if quarter:
-            query = query.eq('quarter', quarter)
-        
-        result = query.execute()
-        return result.data or []
+    async def refresh_project_applications_count(self, project_id: Optional[str] = None) -> int:
+        """重算 projects.applications_count（修复/回填），返回被修正的项目数"""
+        params = {'p_project_id': project_id} if project_id else {}
+        result = await self.client.rpc('refresh_project_applications_count', params).execute_async()
+        return result.data or 0
 
-    async def get_performance_records_for_chart(self, **kwargs) -> List[Dict[str, Any]]:
-        """获取绩效记录（用于图表数据生成）"""
-        year_filter = kwargs.get('year_filter')
+    async def get_dashboard_performance_stats(
+        self, year: Optional[int] = None, quarter: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """仪表板业绩汇总（数据库聚合，只返回合计值和按年度/季度的序列）"""
+        result = await self.client.rpc(
+            'get_dashboard_performance_stats',
+            {'p_year': year, 'p_quarter': quarter}
+        ).execute_async()
         
-        query = self.client.table('performance_records')\
-            .select('*')\
-            .eq('status', 'approved')\
-            .is_('deleted_at', 'null')
-        
-        if year_filter:
-            query = query.eq('year', year_filter)
-        
-        result = query.execute()
-        return result.data or []
+        return result.data or {}
 
     async def export_performance_records(self, **kwargs) -> List[Dict[str, Any]]:
         """导出绩效记录"""
@@ -436,7 +462,7 @@ class SupabaseService:
         if type_filter:
             query = query.eq('type', type_filter)
         
-        result = query.execute()
+        result = await query.execute_async()
         return result.data or []
 
     async def export_projects(self, **kwargs) -> List[Dict[str, Any]]:
@@ -454,7 +480,7 @@ class SupabaseService:
         if search:
             query = query.ilike('title', f'%{search}%')
         
-        result = query.execute()
+        result = await query.execute_async()
         return result.data or []
 
     async def export_project_applications(self, **kwargs) -> List[Dict[str, Any]]:
@@ -472,7 +498,7 @@ class SupabaseService:
         if status:
             query = query.eq('status', status)
         
-        result = query.execute()
+        result = await query.execute_async()
         return result.data or []
 
 
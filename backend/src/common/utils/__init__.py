@@ -32,6 +32,12 @@ from .converters import (
     sanitize_dict,
 )
 
+from .pagination import (
+    encode_cursor,
+    decode_cursor,
+    build_next_cursor,
+)
+
 __all__ = [
     # Formatters
     "parse_datetime",
@@ -56,4 +62,9 @@ __all__ = [
     "dict_to_model",
     "model_to_dict",
     "sanitize_dict",
+    
+    # Pagination
+    "encode_cursor",
+    "decode_cursor",
+    "build_next_cursor",
 ]
\ No newline at end of file
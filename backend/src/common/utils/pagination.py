@@ -0,0 +1,94 @@
+"""
+Cursor pagination utilities.
+
+Keyset (seek) pagination on ``(created_at, id)`` for high-volume tables.
+Unlike OFFSET pagination, the cost of fetching a page does not grow with
+page depth: each page seeks directly to ``created_at <= cursor`` using the
+existing ``created_at`` indexes, with ``id`` as the tie-breaker.
+"""
+import base64
+import json
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+
+# id 只允许 UUID / 整数等安全字符
+_SAFE_ID_PATTERN = re.compile(r"^[A-Za-z0-9-]{1,64}$")
+
+
+def encode_cursor(created_at: Any, record_id: Any) -> str:
+    """
+    Encode the sort key of the last row on a page into an opaque cursor.
+
+    Args:
+        created_at: created_at of the last row (datetime or ISO string)
+        record_id: id of the last row
+
+    Returns:
+        URL-safe cursor string
+    """
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    payload = json.dumps([str(created_at), str(record_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, uuid_id: bool = False) -> Tuple[str, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string
+        uuid_id: Require the id to be a UUID (for callers that build UUID values from it)
+
+    Returns:
+        Tuple of (created_at ISO string, id)
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, record_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        # 校验格式，避免把任意字符串拼进查询条件
+        datetime.fromisoformat(created_at)
+        record_id = str(record_id)
+        if not _SAFE_ID_PATTERN.match(record_id):
+            raise ValueError("invalid cursor id")
+        if uuid_id:
+            record_id = str(UUID(record_id))
+        return created_at, record_id
+    except Exception as e:
+        # 延迟导入，避免与 exception 模块循环依赖
+        from ..modules.exception import ValidationError
+        raise ValidationError(
+            message="Invalid pagination cursor",
+            field_errors={"cursor": "Malformed cursor"},
+            original_exception=e,
+        )
+
+
+def build_next_cursor(
+    records: List[Any],
+    page_size: int,
+    key: Optional[Callable[[Any], Tuple[Any, Any]]] = None,
+) -> Optional[str]:
+    """
+    Build the cursor for the page after ``records``.
+
+    Args:
+        records: Rows of the current page, ordered by (created_at, id) DESC
+        page_size: Requested page size
+        key: Returns (created_at, id) of a row; defaults to dict access
+
+    Returns:
+        Cursor string, or None when the page is not full (no more rows)
+    """
+    if not records or len(records) < page_size:
+        return None
+    last = records[-1]
+    if key is not None:
+        return encode_cursor(*key(last))
+    return encode_cursor(last["created_at"], last["id"])
@@ -47,6 +47,13 @@ async def lifespan(app: FastAPI):
         logger.info("File log writer closed")
     except Exception as e:
         logger.warning(f"Error closing file log writer: {e}")
+    
+    # Shut down the database executor after log writers have flushed
+    from .common.modules.interceptor import shutdown_db_executor
+    shutdown_db_executor(wait=False)
+
+    from .modules.user.password import password_hasher
+    password_hasher.shutdown(wait=False)
 
 
 # Create FastAPI app
@@ -37,7 +37,7 @@ class ContentService:
             return None
         
         # Use direct client for simple lookup
-        result = supabase_service.client.table('members').select('company_name').eq('id', member_id).execute()
+        result = await supabase_service.client.table('members').select('company_name').eq('id', member_id).execute_async()
         return result.data[0]['company_name'] if result.data else None
 
     # ============================================================================
@@ -68,7 +68,7 @@ class ContentService:
                 .select('*', count='exact')\
                 .is_('deleted_at', 'null')\
                 .ilike('title', f'%{search}%')
-            count_result = count_query.execute()
+            count_result = await count_query.execute_async()
             total = count_result.count or 0
             
             # Get paginated results
@@ -79,7 +79,7 @@ class ContentService:
                 .order('created_at', desc=True)\
                 .range((page - 1) * page_size, page * page_size - 1)
             
-            result = query.execute()
+            result = await query.execute_async()
             return result.data or [], total
         else:
             # Simple pagination - use helper method
@@ -99,12 +99,12 @@ class ContentService:
         Returns:
             List of latest 5 notices
         """
-        result = supabase_service.client.table('notices')\
+        result = await supabase_service.client.table('notices')\
             .select('*')\
             .is_('deleted_at', 'null')\
             .order('created_at', desc=True)\
             .limit(5)\
-            .execute()
+            .execute_async()
         
         return result.data or []
 
@@ -127,10 +127,10 @@ class ContentService:
             raise NotFoundError(resource_type="Notice")
         
         # Increment view count - use direct client for atomic operation
-        supabase_service.client.table('notices')\
+        await supabase_service.client.table('notices')\
             .update({'view_count': (notice.get('view_count', 0) + 1)})\
             .eq('id', str(notice_id))\
-            .execute()
+            .execute_async()
         
         # Return updated notice
         notice['view_count'] = notice.get('view_count', 0) + 1
@@ -250,13 +250,13 @@ class ContentService:
             Latest project or None
         """
         # Query from projects table with status filter
-        result = supabase_service.client.table('projects')\
+        result = await supabase_service.client.table('projects')\
             .select('*')\
             .is_('deleted_at', 'null')\
             .eq('status', 'active')\
             .order('created_at', desc=True)\
             .limit(1)\
-            .execute()
+            .execute_async()
         
         return result.data[0] if result.data else None
 
@@ -308,7 +308,7 @@ class ContentService:
                     .order('updated_at', desc=True)\
                     .order('created_at', desc=True)
         
-        result = query.execute()
+        result = await query.execute_async()
         return result.data or []
 
     async def get_all_banners(self) -> List[Dict[str, Any]]:
@@ -319,12 +319,12 @@ class ContentService:
             List of all banners
         """
         # Simple query - use direct client
-        result = supabase_service.client.table('banners')\
+        result = await supabase_service.client.table('banners')\
             .select('*')\
             .order('display_order', desc=False)\
             .order('updated_at', desc=True)\
             .order('created_at', desc=True)\
-            .execute()
+            .execute_async()
         
         return result.data or []
 
@@ -339,7 +339,7 @@ class ContentService:
             Banner dictionary or None
         """
         # Try to get active banner first
-        result = supabase_service.client.table('banners')\
+        result = await supabase_service.client.table('banners')\
             .select('*')\
             .eq('banner_type', banner_type)\
             .eq('is_active', 'true')\
@@ -347,20 +347,20 @@ class ContentService:
             .order('updated_at', desc=True)\
             .order('created_at', desc=True)\
             .limit(1)\
-            .execute()
+            .execute_async()
         
         if result.data:
             return result.data[0]
         
         # Fallback to any banner of this type
-        result = supabase_service.client.table('banners')\
+        result = await supabase_service.client.table('banners')\
             .select('*')\
             .eq('banner_type', banner_type)\
             .order('display_order', desc=False)\
             .order('updated_at', desc=True)\
             .order('created_at', desc=True)\
             .limit(1)\
-            .execute()
+            .execute_async()
         
         return result.data[0] if result.data else None
 
@@ -478,11 +478,11 @@ class ContentService:
             SystemInfo dictionary with updater_name or None if not set
         """
         # Simple query - use direct client
-        result = supabase_service.client.table('system_info')\
+        result = await supabase_service.client.table('system_info')\
             .select('*')\
             .order('updated_at', desc=True)\
             .limit(1)\
-            .execute()
+            .execute_async()
         
         if result.data:
             system_info = result.data[0]
@@ -504,7 +504,7 @@ class ContentService:
             Updated or created SystemInfo dictionary
         """
         # Check if updated_by is a member (admins are not in members table)
-        member_result = supabase_service.client.table('members').select('id').eq('id', str(updated_by)).execute()
+        member_result = await supabase_service.client.table('members').select('id').eq('id', str(updated_by)).execute_async()
         member_id = str(updated_by) if member_result.data else None
 
         # Try to get existing system info
@@ -539,11 +539,11 @@ class ContentService:
         Returns:
             LegalContent dictionary or None if not set
         """
-        result = supabase_service.client.table('legal_content')\
+        result = await supabase_service.client.table('legal_content')\
             .select('*')\
             .eq('content_type', content_type)\
             .limit(1)\
-            .execute()
+            .execute_async()
         
         if result.data:
             return result.data[0]
@@ -7,6 +7,11 @@ from typing import Optional
 from decimal import Decimal
 
 from ...common.modules.supabase.service import supabase_service
+from ...common.modules.cache import cache_service
+
+# Cache namespace for dashboard aggregates; invalidated when members or
+# performance records change
+DASHBOARD_CACHE_NAMESPACE = "dashboard"
 
 
 class DashboardService:
@@ -27,6 +32,19 @@ class DashboardService:
         Returns:
             Dictionary with stats and chartData
         """
+        cache_key = f"{year or 'all'}:{quarter or 'all'}"
+        return await cache_service.get_or_load(
+            DASHBOARD_CACHE_NAMESPACE,
+            cache_key,
+            lambda: self._load_dashboard_stats(year, quarter),
+        )
+
+    async def _load_dashboard_stats(
+        self,
+        year: Optional[str],
+        quarter: Optional[str],
+    ) -> dict:
+        """Aggregate dashboard statistics from the database (uncached)."""
         # Parse year and quarter
         year_int = None
         if year and year != "all":
@@ -46,176 +64,57 @@ class DashboardService:
         # 1. Get total approved members count
         total_members = await supabase_service.get_approved_members_count()
 
-        # 2. Get performance records with filters
-        # Only count approved records
-        performance_records = await supabase_service.get_performance_records(
+        # 2. Aggregate approved performance records in the database
+        # Totals and the per-(year, quarter) series come back from a single RPC,
+        # so only a few dozen numbers cross the wire regardless of data volume
+        aggregates = await supabase_service.get_dashboard_performance_stats(
             year=year_int,
             quarter=quarter_int,
-            status="approved"
         )
 
-        # 3. Aggregate statistics from performance records
-        total_sales = Decimal("0")
-        total_employment = 0
-        total_ip = 0
-
-        for record in performance_records:
-            data_json = record.get("data_json") or {}
-
-            # Aggregate sales from 'sales' type records
-            if record.get("type") == "sales":
-                # Try different possible field names for sales revenue
-                sales_value = (
-                    data_json.get("salesRevenue")
-                    or data_json.get("revenue")
-                    or data_json.get("totalSales")
-                    or data_json.get("sales")
-                    or 0
-                )
-                if isinstance(sales_value, (int, float)):
-                    total_sales += Decimal(str(sales_value))
-
-            # Aggregate employment from 'support' type records
-            if record.get("type") == "support":
-                # Try different possible field names for employment
-                employment_value = (
-                    data_json.get("newHires")
-                    or data_json.get("employment")
-                    or data_json.get("employeeCount")
-                    or data_json.get("newEmployees")
-                    or 0
-                )
-                if isinstance(employment_value, (int, float)):
-                    total_employment += int(employment_value)
-
-            # Aggregate IP from 'ip' type records
-            if record.get("type") == "ip":
-                ip_data = data_json.get("intellectualProperty") or data_json.get("ip") or []
-                if isinstance(ip_data, list):
-                    total_ip += len(ip_data)
-                elif isinstance(ip_data, (int, float)):
-                    total_ip += int(ip_data)
-
-        # 4. Generate chart data
-        chart_data = await self._generate_chart_data(
-            year_int, quarter_int
-        )
+        # 3. Generate chart data
+        chart_data = self._generate_chart_data(aggregates.get("series") or [])
 
         return {
             "stats": {
                 "totalMembers": total_members,
-                "totalSales": total_sales,
-                "totalEmployment": total_employment,
-                "totalIntellectualProperty": total_ip,
+                "totalSales": Decimal(str(aggregates.get("total_sales") or 0)),
+                "totalEmployment": int(aggregates.get("total_employment") or 0),
+                "totalIntellectualProperty": int(aggregates.get("total_ip") or 0),
             },
             "chartData": chart_data,
         }
 
-    async def _generate_chart_data(
-        self,
-        year_filter: Optional[int],
-        quarter_filter: Optional[int],
-    ) -> dict:
+    def _generate_chart_data(self, series: list[dict]) -> dict:
         """
         Generate chart data for dashboard.
 
         Args:
-            year_filter: Year to filter by (None for all)
-            quarter_filter: Quarter to filter by (None for all)
+            series: Per-(year, quarter) aggregates, already sorted by year and quarter
 
         Returns:
             Dictionary with members and salesEmployment chart data
         """
-        # Get all approved performance records for chart data
-        # We need to show trends, so we get records even if they don't match the filter
-        # but we'll group them by period
-        performance_records = await supabase_service.get_performance_records_for_chart(
-            year_filter=year_filter
-        )
-
-        # Group by period (year-quarter)
-        period_data = {}
+        members_chart = []
+        sales_employment_chart = []
 
-        for record in performance_records:
-            # Skip if quarter filter is specified and doesn't match
-            if quarter_filter and record.get("quarter") != quarter_filter:
-                continue
-
-            period_key = f"{record.get('year')}-{record.get('quarter') or 'A'}"
-            if period_key not in period_data:
-                period_data[period_key] = {
-                    "year": record.get("year"),
-                    "quarter": record.get("quarter"),
-                    "sales": Decimal("0"),
-                    "employment": 0,
-                    "members": set(),
-                }
-
-            period_data[period_key]["members"].add(record.get("member_id"))
-
-            data_json = record.get("data_json") or {}
-
-            # Aggregate sales
-            if record.get("type") == "sales":
-                sales_value = (
-                    data_json.get("salesRevenue")
-                    or data_json.get("revenue")
-                    or data_json.get("totalSales")
-                    or data_json.get("sales")
-                    or 0
-                )
-                if isinstance(sales_value, (int, float)):
-                    period_data[period_key]["sales"] += Decimal(str(sales_value))
-
-            # Aggregate employment
-            if record.get("type") == "support":
-                employment_value = (
-                    data_json.get("newHires")
-                    or data_json.get("employment")
-                    or data_json.get("employeeCount")
-                    or data_json.get("newEmployees")
-                    or 0
-                )
-                if isinstance(employment_value, (int, float)):
-                    period_data[period_key]["employment"] += int(employment_value)
-
-        # Convert to sorted list
-        chart_items = []
-        for key, data in period_data.items():
+        for item in series:
             period_label = (
-                f"{data['year']} Q{data['quarter']}"
-                if data["quarter"]
-                else f"{data['year']} Annual"
+                f"{item['year']} Q{item['quarter']}"
+                if item.get("quarter")
+                else f"{item['year']} Annual"
+            )
+            members_chart.append(
+                {"period": period_label, "value": float(item.get("members") or 0)}
             )
-            chart_items.append(
+            sales_employment_chart.append(
                 {
                     "period": period_label,
-                    "year": data["year"],
-                    "quarter": data["quarter"],
-                    "members": len(data["members"]),
-                    "sales": data["sales"],
-                    "employment": data["employment"],
+                    "sales": Decimal(str(item.get("sales") or 0)),
+                    "employment": int(item.get("employment") or 0),
                 }
             )
 
-        # Sort by year and quarter
-        chart_items.sort(key=lambda x: (x["year"], x["quarter"] or 999))
-
-        # Format for response
-        members_chart = [
-            {"period": item["period"], "value": float(item["members"])}
-            for item in chart_items
-        ]
-
-        sales_employment_chart = [
-            {
-                "period": item["period"],
-                "sales": item["sales"],
-                "employment": item["employment"],
-            }
-            for item in chart_items
-        ]
-
         return {
             "members": members_chart,
             "salesEmployment": sales_employment_chart,
@@ -5,6 +5,7 @@ API endpoints for member management.
 """
 from fastapi import APIRouter, Depends, Query, Response, status
 from typing import Optional
+from math import ceil
 from datetime import datetime
 from uuid import UUID
 
@@ -90,9 +91,9 @@ async def list_members(
     return MemberListResponsePaginated(
         items=[MemberListItem.from_db_dict(m, include_admin_fields=True) for m in members],
         total=total,
-        page=1,
-        page_size=total if total > 0 else 1,
-        total_pages=1,
+        page=page,
+        page_size=page_size,
+        total_pages=ceil(total / page_size) if total > 0 else 0,
     )
 
 
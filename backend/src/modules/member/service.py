@@ -11,6 +11,7 @@ import json
 from ...common.modules.db.models import Member  # Member table now includes profile fields
 from ...common.modules.exception import NotFoundError, ValidationError, ConflictError, CMessageTemplate
 from ...common.modules.supabase.service import supabase_service
+from ...common.modules.cache import cache_service
 from ...common.modules.integrations.nice_dnb.schemas import NiceDnBResponse
 from .schemas import MemberProfileUpdate, MemberListQuery, MemberProfileResponse
 
@@ -18,6 +19,16 @@ from .schemas import MemberProfileUpdate, MemberListQuery, MemberProfileResponse
 class MemberService:
     """Member service class - using supabase_service helper methods and direct client."""
 
+    async def _invalidate_member_caches(self, member_id: UUID) -> None:
+        """Drop the member's cached principal, member counts and dashboard aggregates after an approval change."""
+        from ..dashboard.service import DASHBOARD_CACHE_NAMESPACE
+        from ..statistics.service import service as statistics_service
+        from ..user.dependencies import invalidate_principal
+
+        await invalidate_principal(member_id)
+        await cache_service.invalidate("members", DASHBOARD_CACHE_NAMESPACE)
+        await statistics_service.invalidate_query_cache()
+
     async def get_member_profile(
         self, member_id: UUID
     ) -> tuple[dict, Optional[dict]]:
@@ -217,6 +228,10 @@ class MemberService:
             if updated_member:
                 member = updated_member
 
+            # company_name / email are part of the cached principal
+            from ..user.dependencies import invalidate_principal
+            await invalidate_principal(member_id)
+
         # Prepare profile update data
         profile_update = {}
         if data.industry is not None:
@@ -307,6 +322,11 @@ class MemberService:
             if updated_profile:
                 profile = updated_profile
 
+        if member_update or profile_update:
+            # Profile fields (region, industry, tags, ...) drive the statistics filters
+            from ..statistics.service import service as statistics_service
+            await statistics_service.invalidate_query_cache()
+
         return member, profile
 
     async def list_members(
@@ -328,6 +348,8 @@ class MemberService:
             region=query.region,
             sort_by="created_at",
             sort_order="desc",
+            page=query.page,
+            page_size=query.page_size,
         )
         
         return members, total
@@ -359,6 +381,7 @@ class MemberService:
                 'status': 'active'
             }
         )
+        await self._invalidate_member_caches(member_id)
 
         # Send approval notification email in background (non-blocking)
         from ...common.modules.email import email_service
@@ -427,6 +450,7 @@ class MemberService:
                 'status': 'suspended'
             }
         )
+        await self._invalidate_member_caches(member_id)
 
         # Send rejection notification email in background (non-blocking)
         from ...common.modules.email import email_service
@@ -492,6 +516,7 @@ class MemberService:
                 'status': 'pending'
             }
         )
+        await self._invalidate_member_caches(member_id)
 
         return updated_member
 
@@ -513,6 +538,7 @@ class MemberService:
             raise NotFoundError(resource_type="Member")
 
         await supabase_service.hard_delete_record('members', str(member_id))
+        await self._invalidate_member_caches(member_id)
         return True
 
     async def export_members_data(
@@ -646,23 +672,23 @@ class MemberService:
             db_data["emp_cnt"] = latest_financial.employees
         
         # Check if record exists - use direct client for complex query
-        existing = supabase_service.client.table("nice_dnb_company_info")\
+        existing = await supabase_service.client.table("nice_dnb_company_info")\
             .select("biz_no")\
             .eq("biz_no", business_number)\
             .limit(1)\
-            .execute()
+            .execute_async()
         
         if existing.data:
             # Update existing record - use direct client
-            supabase_service.client.table("nice_dnb_company_info")\
+            await supabase_service.client.table("nice_dnb_company_info")\
                 .update(db_data)\
                 .eq("biz_no", business_number)\
-                .execute()
+                .execute_async()
         else:
             # Insert new record - use direct client
-            supabase_service.client.table("nice_dnb_company_info")\
+            await supabase_service.client.table("nice_dnb_company_info")\
                 .insert(db_data)\
-                .execute()
+                .execute_async()
 
 # Service instance
 member_service = MemberService()
\ No newline at end of file
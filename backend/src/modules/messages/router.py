@@ -12,6 +12,7 @@ from fastapi import Request
 
 from ...common.modules.db.models import Member
 from ...common.modules.audit import audit_log
+from ...common.utils import build_next_cursor
 from ..user.dependencies import get_current_admin_user, get_current_member_user
 from .service import MessageService
 from .schemas import (
@@ -29,6 +30,7 @@ from .schemas import (
     ThreadListResponse,
     BroadcastCreate,
     BroadcastResponse,
+    BroadcastJobResponse,
     MessageAnalyticsResponse,
 )
 
@@ -50,6 +52,7 @@ async def get_messages(
     is_read: Optional[bool] = Query(None, description="Filter by read status"),
     is_important: Optional[bool] = Query(None, description="Filter by important status"),
     message_type: Optional[str] = Query(None, description="Filter by message type (direct, thread, broadcast)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor (keyset pagination, page is ignored)"),
     current_user = Depends(get_current_admin_user),
 ):
     """
@@ -60,6 +63,7 @@ async def get_messages(
     - **is_read**: Filter by read status (optional)
     - **is_important**: Filter by important status (optional)
     - **message_type**: Filter by message type (optional)
+    - **cursor**: next_cursor of the previous page for infinite scroll (optional; total and unread_count are not computed and return 0)
     """
     messages, total, unread_count = await service.get_messages(
         current_user["id"],
@@ -69,6 +73,7 @@ async def get_messages(
         is_important=is_important,
         message_type=message_type,
         is_admin=True,
+        cursor=cursor,
     )
     
     return MessageListResponse(
@@ -78,6 +83,7 @@ async def get_messages(
         page_size=page_size,
         total_pages=ceil(total / page_size) if total > 0 else 0,
         unread_count=unread_count,
+        next_cursor=build_next_cursor(messages, page_size),
     )
 
 
@@ -229,6 +235,7 @@ async def get_member_messages(
     is_read: Optional[bool] = Query(None, description="Filter by read status"),
     is_important: Optional[bool] = Query(None, description="Filter by important status"),
     message_type: Optional[str] = Query(None, description="Filter by message type (direct, thread, broadcast)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor (keyset pagination, page is ignored)"),
     current_user: Member = Depends(get_current_member_user),
 ):
     """
@@ -239,6 +246,7 @@ async def get_member_messages(
     - **is_read**: Filter by read status (optional)
     - **is_important**: Filter by important status (optional)
     - **message_type**: Filter by message type (optional)
+    - **cursor**: next_cursor of the previous page for infinite scroll (optional; total and unread_count are not computed and return 0)
     """
     messages, total, unread_count = await service.get_messages(
         current_user.id,
@@ -247,6 +255,7 @@ async def get_member_messages(
         is_read=is_read,
         is_important=is_important,
         message_type=message_type,
+        cursor=cursor,
     )
     
     return MessageListResponse(
@@ -256,6 +265,7 @@ async def get_member_messages(
         page_size=page_size,
         total_pages=ceil(total / page_size) if total > 0 else 0,
         unread_count=unread_count,
+        next_cursor=build_next_cursor(messages, page_size),
     )
 
 
@@ -494,7 +504,7 @@ async def update_thread(
 @router.post(
     "/api/admin/messages/broadcast",
     response_model=BroadcastResponse,
-    status_code=status.HTTP_201_CREATED,
+    status_code=status.HTTP_202_ACCEPTED,
     tags=["messages", "broadcast", "admin"],
     summary="Send broadcast message (admin)",
 )
@@ -504,10 +514,51 @@ async def create_broadcast(
     request: Request,
     current_user = Depends(get_current_admin_user),
 ):
-    """Send a broadcast message to multiple members (admin only)."""
+    """Send a broadcast message to multiple members (admin only).
+
+    Returns immediately with a job_id; messages are inserted in the
+    background. Poll GET /api/admin/messages/broadcast/{job_id} for progress.
+    """
     broadcast = await service.create_broadcast(data, current_user["id"])
     return BroadcastResponse(**broadcast)
 
 
+@router.get(
+    "/api/admin/messages/broadcast/{job_id}",
+    response_model=BroadcastJobResponse,
+    tags=["messages", "broadcast", "admin"],
+    summary="Get broadcast fan-out progress (admin)",
+)
+async def get_broadcast_job(
+    job_id: UUID,
+    current_user = Depends(get_current_admin_user),
+):
+    """Get progress of a broadcast fan-out job (admin only)."""
+    job = await service.get_broadcast_job(str(job_id))
+    return BroadcastJobResponse(**job)
+
+
+@router.post(
+    "/api/admin/messages/broadcast/{job_id}/resume",
+    response_model=BroadcastJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["messages", "broadcast", "admin"],
+    summary="Resume a failed broadcast fan-out (admin)",
+)
+@audit_log(action="broadcast", resource_type="message")
+async def resume_broadcast_job(
+    job_id: UUID,
+    request: Request,
+    current_user = Depends(get_current_admin_user),
+):
+    """Resume a failed broadcast from its last completed chunk (admin only).
+
+    Recipients that already received the broadcast are skipped. Only the
+    process that ran the job can resume it.
+    """
+    job = await service.resume_broadcast_job(str(job_id))
+    return BroadcastJobResponse(**job)
+
+
 # Analytics endpoint moved above to fix route ordering issue
 
@@ -67,6 +67,7 @@ class MessageListResponse(BaseModel):
     page_size: int
     total_pages: int
     unread_count: int = Field(default=0, description="Total unread messages count")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor for the next page (None when there are no more messages)")
 
 
 class UnreadCountResponse(BaseModel):
@@ -204,6 +205,8 @@ class BroadcastResponse(BaseModel):
     sent_at: Optional[datetime] = None
     created_at: Optional[datetime] = None
     messages: Optional[List[dict]] = None
+    job_id: Optional[str] = None
+    status: Optional[str] = None
     
     # 格式化后的显示字段
     sent_at_display: Optional[str] = None
@@ -217,6 +220,20 @@ class BroadcastResponse(BaseModel):
         self.created_at_display = format_kst_display(self.created_at)
 
 
+class BroadcastJobResponse(BaseModel):
+    """Broadcast fan-out job progress schema."""
+    
+    job_id: str
+    broadcast_id: str
+    status: str = Field(..., description="queued, running, completed, failed or unknown")
+    total: int = 0
+    sent: int = 0
+    progress: float = Field(default=0.0, description="Fraction of recipients sent (0-1)")
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
 # Analytics schemas
 
 class MessageAnalyticsResponse(BaseModel):
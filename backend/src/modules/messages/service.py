@@ -1,4 +1,7 @@
-from typing import List, Tuple, Optional
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Optional
 from uuid import UUID, uuid4
 from datetime import datetime, timezone, timedelta
 
@@ -6,11 +9,22 @@ from ...common.modules.exception import NotFoundError, ValidationError, CMessage
 from ...common.modules.supabase.message_service import message_db_service
 from ...common.modules.supabase.service import supabase_service
 from ...common.modules.email.service import EmailService
+from ...common.modules.cache import cache_service
 from .schemas import (
     MessageCreate, MessageUpdate, ThreadCreate, ThreadMessageCreate,
     ThreadUpdate, BroadcastCreate
 )
 
+logger = logging.getLogger(__name__)
+
+# 广播分发任务 {job_id: job}，进程内共享；只保留最近 MAX_BROADCAST_JOBS 个
+_broadcast_jobs: "OrderedDict[str, dict]" = OrderedDict()
+# 运行中的任务引用，防止被垃圾回收
+_broadcast_tasks: Dict[str, asyncio.Task] = {}
+# 未完成任务的接收者列表（失败后续发用），完成或被淘汰时删除
+_broadcast_recipients: Dict[str, List[str]] = {}
+MAX_BROADCAST_JOBS = 100
+
 
 class MessageService:
     """消息业务逻辑服务类，所有数据库操作通过 message_db_service 执行"""
@@ -23,6 +37,9 @@ class MessageService:
     SENDER_MEMBER = "member"
     SENDER_SYSTEM = "system"
 
+    # 消息分析缓存命名空间（消息新增、已读状态变化时失效）
+    ANALYTICS_CACHE_NAMESPACE = "message_analytics"
+
     def __init__(self):
         self.email_service = EmailService()
         self.db = message_db_service
@@ -36,6 +53,9 @@ class MessageService:
     async def _is_admin(self, user_id: str) -> bool:
         return await self.db.is_admin(user_id)
 
+    async def _invalidate_analytics(self) -> None:
+        await cache_service.invalidate(self.ANALYTICS_CACHE_NAMESPACE)
+
     async def _enrich_message_with_sender(self, message: dict) -> dict:
         """根据发送者类型添加发送者名称"""
         sender_type = message.get('sender_type')
@@ -96,8 +116,9 @@ class MessageService:
         is_read: Optional[bool] = None,
         message_type: Optional[str] = None,
         is_admin: bool = False,
+        cursor: Optional[str] = None,
     ) -> Tuple[List[dict], int, int]:
-        """获取用户的分页消息列表"""
+        """获取用户的分页消息列表（传入 cursor 时使用游标分页）"""
         messages, total_count, unread_count = await self.db.get_messages_paginated(
             user_id=str(user_id),
             page=page,
@@ -106,7 +127,8 @@ class MessageService:
             is_important=is_important,
             is_read=is_read,
             message_type=message_type,
-            is_admin=is_admin
+            is_admin=is_admin,
+            cursor=cursor
         )
 
         for message in messages:
@@ -152,6 +174,7 @@ class MessageService:
                 CMessageTemplate.VALIDATION_OPERATION_FAILED.format(operation="create message")
             )
 
+        await self._invalidate_analytics()
         await self._enrich_message_with_sender(message)
         return message
 
@@ -174,6 +197,7 @@ class MessageService:
             return message
 
         updated = await self.db.update_message(str(message_id), update_data)
+        await self._invalidate_analytics()
         return updated
 
     async def delete_message(self, message_id: UUID, user_id: UUID, is_admin: bool = False) -> None:
@@ -191,6 +215,7 @@ class MessageService:
 
         # 使用硬删除
         await self.db.delete_message(str(message_id))
+        await self._invalidate_analytics()
 
     async def get_unread_count_unified(self, user_id: UUID, is_admin: bool = False) -> dict:
         """获取用户未读消息数量"""
@@ -201,6 +226,10 @@ class MessageService:
             "thread_count": 0,
         }
 
+    async def rebuild_unread_counts(self) -> int:
+        """按消息表重算未读计数（运维修复用，计数平时由数据库触发器维护），返回被修正的行数"""
+        return await self.db.refresh_unread_counts()
+
     async def create_direct_message(
         self,
         sender_id: Optional[UUID],
@@ -226,7 +255,9 @@ class MessageService:
             "is_important": getattr(data, 'is_important', False),
             "created_at": datetime.now(timezone.utc).isoformat(),
         }
-        return await self.db.insert_message(message_data)
+        message = await self.db.insert_message(message_data)
+        await self._invalidate_analytics()
+        return message
 
     async def mark_as_read_unified(self, message_id: UUID, user_id: UUID) -> dict:
         """标记消息为已读"""
@@ -235,6 +266,7 @@ class MessageService:
             raise NotFoundError(resource_type="Message")
 
         await self.db.mark_as_read(str(message_id))
+        await self._invalidate_analytics()
         message['is_read'] = True
         message['read_at'] = datetime.now(timezone.utc).isoformat()
         return message
@@ -327,6 +359,7 @@ class MessageService:
         }
 
         thread = await self.db.insert_message(thread_data)
+        await self._invalidate_analytics()
 
         if thread and hasattr(data, 'content') and data.content:
             first_message_data = ThreadMessageCreate(
@@ -376,6 +409,7 @@ class MessageService:
         await self.db.update_thread_status(str(thread_id), {
             "updated_at": now.isoformat()
         })
+        await self._invalidate_analytics()
         
         return message
 
@@ -404,6 +438,7 @@ class MessageService:
 
         reader_type = 'admin' if is_admin else 'member'
         await self.db.mark_thread_messages_as_read(str(thread_id), reader_type)
+        await self._invalidate_analytics()
 
         await self._enrich_messages_with_senders_batch(messages)
 
@@ -440,7 +475,11 @@ class MessageService:
         return updated if updated else thread
 
     async def create_broadcast(self, data: BroadcastCreate, sender_id: UUID) -> dict:
-        """创建并发送广播消息"""
+        """创建广播并在后台分发
+
+        请求内只做校验、查询接收者和创建广播模板，分批插入在后台任务中执行，
+        立即返回 job_id（即广播模板 ID），进度通过 get_broadcast_job 查询。
+        """
         is_admin = await self._is_admin(str(sender_id))
         if not is_admin:
             raise ValidationError(CMessageTemplate.MESSAGE_BROADCAST_ADMIN_ONLY)
@@ -453,39 +492,141 @@ class MessageService:
         if not recipient_ids:
             raise ValidationError(CMessageTemplate.MESSAGE_NO_RECIPIENTS)
 
-        messages_to_insert = []
-        broadcast_id = str(uuid4())
-
-        for recipient_id in recipient_ids:
-            messages_to_insert.append({
-                "id": str(uuid4()),
-                "message_type": self.TYPE_BROADCAST,
-                "thread_id": broadcast_id,
-                "sender_id": str(sender_id),
-                "sender_type": self.SENDER_ADMIN,
-                "recipient_id": recipient_id,
-                "subject": data.subject,
-                "content": data.content,
-                "category": getattr(data, 'category', "announcement"),
-                "is_important": getattr(data, 'is_important', False),
-                "is_broadcast": True,
-                "created_at": datetime.now(timezone.utc).isoformat(),
-            })
-
-        result = await self.db.insert_messages_batch(messages_to_insert)
-        if not result:
+        template = await self.db.create_broadcast_message(
+            sender_id=str(sender_id),
+            subject=data.subject,
+            content=data.content,
+            category=getattr(data, 'category', "announcement"),
+            priority="high" if getattr(data, 'is_important', False) else "normal",
+            sender_type=self.SENDER_ADMIN,
+        )
+        if not template:
             raise ValidationError(
                 CMessageTemplate.VALIDATION_OPERATION_FAILED.format(operation="create broadcast")
             )
 
+        job = self._start_broadcast_job(template["id"], recipient_ids)
         return {
-            "broadcast_id": broadcast_id,
+            **template,
+            "broadcast_id": template["id"],
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "send_to_all": data.send_to_all,
             "recipient_count": len(recipient_ids),
-            "messages": result
+        }
+
+    def _start_broadcast_job(self, broadcast_id: str, recipient_ids: List[str]) -> dict:
+        """登记分发任务并创建后台任务"""
+        job = {
+            "job_id": broadcast_id,
+            "broadcast_id": broadcast_id,
+            "status": "queued",
+            "total": len(recipient_ids),
+            "sent": 0,
+            "error": None,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "finished_at": None,
+        }
+        _broadcast_jobs[broadcast_id] = job
+        _broadcast_recipients[broadcast_id] = recipient_ids
+        while len(_broadcast_jobs) > MAX_BROADCAST_JOBS:
+            oldest_id, oldest = next(iter(_broadcast_jobs.items()))
+            if oldest["status"] in ("queued", "running"):
+                break
+            _broadcast_jobs.pop(oldest_id)
+            _broadcast_recipients.pop(oldest_id, None)
+
+        self._spawn_broadcast_task(job)
+        return job
+
+    def _spawn_broadcast_task(self, job: dict) -> None:
+        """从 job["sent"]（最后完成的批次偏移量）开始创建后台分发任务"""
+        broadcast_id = job["broadcast_id"]
+        task = asyncio.create_task(
+            self._run_broadcast_job(job, _broadcast_recipients[broadcast_id], start=job["sent"])
+        )
+        _broadcast_tasks[broadcast_id] = task
+        task.add_done_callback(lambda _: _broadcast_tasks.pop(broadcast_id, None))
+
+    async def _run_broadcast_job(self, job: dict, recipient_ids: List[str], start: int = 0) -> None:
+        """后台分批插入广播消息并更新进度
+
+        job["sent"] 只在每批插入成功后前进，失败时即为续发的起始偏移量。
+        """
+        job["status"] = "running"
+
+        def on_progress(sent: int) -> None:
+            job["sent"] = sent
+
+        try:
+            await self.db.send_broadcast_to_recipients(
+                job["broadcast_id"], recipient_ids, on_progress=on_progress, start=start
+            )
+            job["status"] = "completed"
+            _broadcast_recipients.pop(job["broadcast_id"], None)
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+            logger.error(f"Broadcast job {job['job_id']} failed after {job['sent']} messages: {e}", exc_info=True)
+        finally:
+            job["finished_at"] = datetime.now(timezone.utc).isoformat()
+            await self._invalidate_analytics()
+
+    async def resume_broadcast_job(self, job_id: str) -> dict:
+        """从最后完成的批次继续失败的广播分发
+
+        只能在运行该任务的进程内续发（接收者列表只保存在进程内）。
+        """
+        job = _broadcast_jobs.get(job_id)
+        if job is None:
+            raise NotFoundError(resource_type="Broadcast job")
+        if job["status"] != "failed" or job_id in _broadcast_tasks or job_id not in _broadcast_recipients:
+            raise ValidationError(
+                CMessageTemplate.MESSAGE_BROADCAST_NOT_RESUMABLE.format(status=job["status"])
+            )
+
+        logger.info(f"Resuming broadcast job {job_id} from offset {job['sent']}/{job['total']}")
+        job.update({"status": "queued", "error": None, "finished_at": None})
+        self._spawn_broadcast_task(job)
+        return await self.get_broadcast_job(job_id)
+
+    async def get_broadcast_job(self, job_id: str) -> dict:
+        """获取广播分发进度
+
+        任务只登记在创建它的进程内；其他进程或重启后按广播模板的
+        broadcast_count（分发完成时写入）返回结果。
+        """
+        job = _broadcast_jobs.get(job_id)
+        if job is None:
+            template = await self.db.get_message_by_id(job_id)
+            if not template or template.get("message_type") != self.TYPE_BROADCAST or template.get("recipient_id"):
+                raise NotFoundError(resource_type="Broadcast job")
+            sent = template.get("broadcast_count") or 0
+            job = {
+                "job_id": job_id,
+                "broadcast_id": job_id,
+                "status": "completed" if sent else "unknown",
+                "total": sent,
+                "sent": sent,
+                "error": None,
+                "started_at": template.get("created_at"),
+                "finished_at": None,
+            }
+        return {
+            **job,
+            "progress": round(job["sent"] / job["total"], 4) if job["total"] else 0.0,
         }
 
     async def get_analytics(self, time_range: str = "7d") -> dict:
-        """获取消息分析数据"""
+        """获取消息分析数据（缓存，消息变化时失效）"""
+        return await cache_service.get_or_load(
+            self.ANALYTICS_CACHE_NAMESPACE,
+            time_range,
+            lambda: self._load_analytics(time_range),
+        )
+
+    async def _load_analytics(self, time_range: str) -> dict:
+        """从数据库聚合消息分析数据"""
         now = datetime.now(timezone.utc)
 
         if time_range == "7d":
@@ -8,6 +8,7 @@ from datetime import datetime
 import json
 
 from ...common.modules.supabase.service import supabase_service
+from ...common.modules.cache import cache_service
 from ...common.modules.exception import NotFoundError, ValidationError, AuthorizationError, CMessageTemplate
 from .schemas import PerformanceRecordCreate, PerformanceRecordUpdate, PerformanceListQuery
 
@@ -42,7 +43,7 @@ class PerformanceService:
         offset = (page - 1) * page_size
         db_query = db_query.range(offset, offset + page_size - 1)
         
-        result = db_query.execute()
+        result = await db_query.execute_async()
         records = result.data or []
         total = result.count or 0
         
@@ -68,6 +69,20 @@ class PerformanceService:
 
         return record
 
+    async def _refresh_performance_summary(self, member_id) -> None:
+        """业绩记录变更后刷新会员业绩聚合（失败不影响主流程）"""
+        try:
+            from ..statistics.service import service as statistics_service
+            await statistics_service.refresh_member_performance_summary(str(member_id))
+        except Exception as e:
+            import logging
+            logging.getLogger(__name__).warning(f"Failed to refresh performance summary for member {member_id}: {e}")
+
+    async def _invalidate_dashboard_cache(self) -> None:
+        """已批准业绩集合变化后使仪表盘聚合缓存失效"""
+        from ..dashboard.service import DASHBOARD_CACHE_NAMESPACE
+        await cache_service.invalidate(DASHBOARD_CACHE_NAMESPACE)
+
     async def create_performance(
         self, member_id: UUID, data: PerformanceRecordCreate
     ) -> dict:
@@ -131,6 +146,9 @@ class PerformanceService:
         
         logger.warning(f"Updated record: {updated}")
         
+        await self._refresh_performance_summary(member_id)
+        await self._invalidate_dashboard_cache()
+        
         return updated
 
     async def delete_performance(
@@ -145,6 +163,7 @@ class PerformanceService:
             )
 
         await supabase_service.delete_record('performance_records', str(performance_id))
+        await self._refresh_performance_summary(member_id)
 
     async def submit_performance(
         self, performance_id: UUID, member_id: UUID
@@ -162,6 +181,7 @@ class PerformanceService:
             "submitted_at": datetime.utcnow().isoformat(),
         }
         updated = await supabase_service.update_record('performance_records', str(performance_id), update_data)
+        await self._refresh_performance_summary(member_id)
         
         # Send notification to all admins about new performance submission
         try:
@@ -173,7 +193,7 @@ class PerformanceService:
             company_name = member.get('company_name', '알 수 없음') if member else '알 수 없음'
             
             # Get all active admins
-            admins_result = supabase_service.client.table('admins').select('id').eq('is_active', 'true').execute()
+            admins_result = await supabase_service.client.table('admins').select('id').eq('is_active', 'true').execute_async()
             admin_ids = [admin['id'] for admin in (admins_result.data or [])]
             
             # Send notification to each admin
@@ -210,6 +230,8 @@ class PerformanceService:
         records, total = await supabase_service.list_performance_records_with_filters(
             sort_by="updated_at",
             sort_order="desc",
+            page=query.page,
+            page_size=query.page_size,
         )
         
         return records, total
@@ -306,6 +328,8 @@ class PerformanceService:
             "reviewed_at": datetime.utcnow().isoformat(),
         }
         await supabase_service.update_record('performance_records', str(performance_id), update_data)
+        await self._refresh_performance_summary(record["member_id"])
+        await self._invalidate_dashboard_cache()
 
         updated_record = await supabase_service.get_by_id('performance_records', str(performance_id))
 
@@ -438,6 +462,8 @@ class PerformanceService:
             "reviewed_at": None,
         }
         await supabase_service.update_record('performance_records', str(performance_id), update_data)
+        if record["status"] == "approved":
+            await self._invalidate_dashboard_cache()
 
         updated_record = await supabase_service.get_by_id('performance_records', str(performance_id))
 
@@ -513,7 +539,7 @@ class PerformanceService:
         if year:
             query = query.eq('year', year)
 
-        result = query.execute()
+        result = await query.execute_async()
         records = result.data or []
 
         # Aggregate investment data by institution
@@ -249,9 +249,9 @@ async def list_projects_admin(
     return ProjectListResponsePaginated(
         items=[ProjectListItem.from_db_dict(p, include_admin_fields=True) for p in projects],
         total=total,
-        page=1,
-        page_size=total if total > 0 else 1,
-        total_pages=1,
+        page=query.page,
+        page_size=query.page_size,
+        total_pages=ceil(total / query.page_size) if total > 0 else 0,
     )
 
 
@@ -394,9 +394,9 @@ async def list_all_applications(
     return ApplicationListResponsePaginated(
         items=[ProjectApplicationListItem.model_validate(a) for a in applications],
         total=total,
-        page=1,
-        page_size=total if total > 0 else 1,
-        total_pages=1,
+        page=query.page or 1,
+        page_size=query.page_size or 10,
+        total_pages=ceil(total / (query.page_size or 10)) if total > 0 else 0,
     )
 
 
@@ -422,9 +422,9 @@ async def list_project_applications(
     return ApplicationListResponsePaginated(
         items=[ProjectApplicationListItem.model_validate(a) for a in applications],
         total=total,
-        page=1,
-        page_size=total if total > 0 else 1,
-        total_pages=1,
+        page=query.page or 1,
+        page_size=query.page_size or 10,
+        total_pages=ceil(total / (query.page_size or 10)) if total > 0 else 0,
     )
 
 
@@ -206,6 +206,8 @@ class ProjectListQuery(BaseModel):
     """Query parameters for listing projects."""
     status: Optional[ProjectStatus] = Field(None, description="Filter by status")
     search: Optional[str] = Field(None, description="Search in title and description")
+    page: int = Field(1, ge=1, description="Page number")
+    page_size: int = Field(20, ge=1, le=1000, description="Items per page")
 
 
 class ProjectListResponsePaginated(BaseModel):
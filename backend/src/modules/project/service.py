@@ -41,6 +41,8 @@ class ProjectService:
         projects, total = await supabase_service.list_projects_with_filters(
             sort_by="created_at",
             sort_order="desc",
+            page=query.page,
+            page_size=query.page_size,
         )
         return projects, total
     
@@ -75,12 +77,12 @@ class ProjectService:
         Returns:
             Latest project dict or None
         """
-        result = supabase_service.client.table('projects')\
+        result = await supabase_service.client.table('projects')\
             .select('*')\
             .is_('deleted_at', 'null')\
             .order('created_at', desc=True)\
             .limit(1)\
-            .execute()
+            .execute_async()
         
         return result.data[0] if result.data else None
     
@@ -100,6 +102,8 @@ class ProjectService:
         projects, total = await supabase_service.list_projects_with_filters(
             sort_by="created_at",
             sort_order="desc",
+            page=query.page,
+            page_size=query.page_size,
         )
         return projects, total
 
@@ -168,14 +172,14 @@ class ProjectService:
 
         # Check for duplicate application - only block if there's an active application
         # Allow reapplication if previous application was cancelled or rejected
-        existing_app = supabase_service.client.table('project_applications')\
+        existing_app = await supabase_service.client.table('project_applications')\
             .select('id, status')\
             .eq('member_id', str(member_id))\
             .eq('project_id', str(project_id))\
             .is_('deleted_at', 'null')\
             .not_.in_('status', ['cancelled', 'rejected'])\
             .limit(1)\
-            .execute()
+            .execute_async()
         
         if existing_app.data:
             raise ValidationError(
@@ -206,7 +210,7 @@ class ProjectService:
             company_name = member.get('company_name', '알 수 없음') if member else '알 수 없음'
             
             # Get all active admins
-            admins_result = supabase_service.client.table('admins').select('id').eq('is_active', 'true').execute()
+            admins_result = await supabase_service.client.table('admins').select('id').eq('is_active', 'true').execute_async()
             admin_ids = [admin['id'] for admin in (admins_result.data or [])]
             
             # Send notification to each admin
@@ -457,6 +461,8 @@ class ProjectService:
             project_id=str(project_id),
             sort_by="submitted_at",
             sort_order="desc",
+            page=query.page,
+            page_size=query.page_size,
         )
         
         # Flatten nested data for schema compatibility
@@ -498,8 +504,11 @@ class ProjectService:
             Tuple of (applications list, total count)
         """
         applications, total = await supabase_service.list_project_applications_with_filters(
+            project_id=str(project_id) if project_id else None,
             sort_by="submitted_at",
             sort_order="desc",
+            page=query.page,
+            page_size=query.page_size,
         )
         return applications, total
 
@@ -711,7 +720,7 @@ class ProjectService:
             project = await supabase_service.get_by_id('projects', str(application.get('project_id')))
             project_title = project.get('title', '알 수 없음') if project else '알 수 없음'
 
-            admins_result = supabase_service.client.table('admins').select('id').eq('is_active', 'true').execute()
+            admins_result = await supabase_service.client.table('admins').select('id').eq('is_active', 'true').execute_async()
             admin_ids = [admin['id'] for admin in (admins_result.data or [])]
 
             notification_data = {
@@ -740,6 +749,18 @@ class ProjectService:
 
         return updated
 
+    async def rebuild_applications_count(self) -> int:
+        """
+        Recompute projects.applications_count from project_applications (admin/maintenance).
+
+        The counter is maintained by a database trigger; this is the repair and
+        backfill path for drift or data imported with triggers disabled.
+
+        Returns:
+            Number of projects whose counter was corrected
+        """
+        return await supabase_service.refresh_project_applications_count()
+
     async def export_projects_data(
         self, query: ProjectListQuery
     ) -> list[dict]:
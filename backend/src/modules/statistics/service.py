@@ -1,15 +1,22 @@
 from typing import List, Tuple, Dict, Any, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, date, timedelta
 import calendar
 import json
 import re
 
 from ...common.modules.supabase.service import supabase_service
+from ...common.modules.cache import cache_service
+from ...common.utils.formatters import now_iso
 from .schemas import StatisticsQuery, StatisticsItem, Gender
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 统计报告总数的缓存命名空间（会员资料、审批状态或业绩数据变更时失效）
+STATISTICS_CACHE_NAMESPACE = "statistics"
+
 
 def calculate_age(birth_date: Optional[date]) -> Optional[int]:
     """计算年龄"""
@@ -33,38 +40,6 @@ def calculate_work_years(founding_date: Optional[date]) -> Optional[int]:
     return max(0, years)  # 确保不返回负数
 
 
-def ensure_list(value) -> List[str]:
-    """确保返回值是列表格式
-
-    处理数据库中可能的多种格式:
-    - None -> []
-    - [] -> []
-    - ["A", "B"] -> ["A", "B"]
-    - "A" -> ["A"]
-    - "A,B" -> ["A", "B"]
-    - '["A", "B"]' (JSON string) -> ["A", "B"]
-    """
-    if value is None:
-        return []
-    if isinstance(value, list):
-        return value
-    if isinstance(value, str):
-        # 尝试解析 JSON 字符串
-        if value.startswith('['):
-            try:
-                parsed = json.loads(value)
-                if isinstance(parsed, list):
-                    return parsed
-            except json.JSONDecodeError:
-                pass
-        # 处理逗号分隔的字符串
-        if ',' in value:
-            return [v.strip() for v in value.split(',') if v.strip()]
-        # 单个字符串
-        return [value] if value.strip() else []
-    return []
-
-
 def ensure_float(value, default: float = 0.0) -> float:
     """确保返回值是 float 格式"""
     if value is None:
@@ -90,262 +65,455 @@ def sanitize_search_query(query: str) -> str:
     return re.sub(r'[,.()\{\}]', '', query).strip()
 
 
-# 企业统计与报告服务类
-class StatisticsService:
-    def _aggregate_performance_data(self, member_id: str) -> Dict[str, Any]:
-        """聚合会员的业绩数据（同步方法）"""
-        try:
-            # 查询该会员的所有已提交的业绩记录（排除草稿状态）
-            result = supabase_service.client.table("performance_records")\
-                .select("data_json, year, type, status")\
-                .eq("member_id", member_id)\
-                .neq("status", "draft")\
-                .is_("deleted_at", "null")\
-                .order("year", desc=True)\
-                .execute()
-        except Exception as e:
-            logger.error(f"Error fetching performance data for member {member_id}: {e}")
-            return {
-                "export_amount": 0.0,
-                "total_investment": 0.0,
-                "patent_count": 0,
-                "latest_revenue": 0.0
-            }
-        
-        total_export = 0.0
-        total_investment = 0.0
-        patent_count = 0
-        latest_revenue = 0.0
-        
-        if result.data:
-            # 获取最新年份
-            latest_year = result.data[0].get("year") if result.data else None
-            
-            for record in result.data:
-                data_json = record.get("data_json", {})
-                record_type = record.get("type")
-                record_year = record.get("year")
-                
-                # 处理销售类型记录（sales）
-                if record_type == "sales":
-                    sales_employment = data_json.get("salesEmployment", {})
-                    
-                    # 聚合出口额（只取最新年份）
-                    if record_year == latest_year:
-                        export_data = sales_employment.get("export", {})
-                        current_export = export_data.get("currentYear", 0)
-                        if current_export:
-                            try:
-                                total_export += float(current_export)
-                            except (ValueError, TypeError):
-                                pass
-                        
-                        # 获取销售额（只取最新年份）
-                        sales_data = sales_employment.get("sales", {})
-                        current_revenue = sales_data.get("currentYear", 0)
-                        if current_revenue:
+# =============================================================================
+# 查询计划（报表与导出共用）
+# =============================================================================
+
+# 不影响筛选结果的字段（不参与 filter_key）
+_NON_FILTER_FIELDS = {"page", "page_size", "sort_by", "sort_order"}
+
+# 排序字段 -> member_statistics 视图列
+_SORT_COLUMNS = {
+    "enterprise_name": "company_name",
+    "annual_revenue": "revenue",
+    "patent_count": "patent_count",
+    "total_investment": "total_investment",
+}
+
+
+@dataclass(frozen=True)
+class StatisticsQueryPlan:
+    """由 StatisticsQuery 编译得到的查询计划
+
+    filters 是按顺序应用到 PostgREST 查询上的 (方法名, 参数) 列表，
+    报表、Excel 导出和 CSV 导出共用同一份计划。
+    """
+    filter_key: str
+    filters: Tuple[Tuple[str, Tuple[Any, ...]], ...]
+    order_column: str
+    order_desc: bool
+
+    def apply_filters(self, sb_query):
+        """应用所有筛选条件"""
+        for method, args in self.filters:
+            sb_query = getattr(sb_query, method)(*args)
+        return sb_query
+
+    def apply_order(self, sb_query):
+        """应用排序（id 作为第二排序键，保证分页稳定）"""
+        return sb_query.order(self.order_column, desc=self.order_desc).order("id")
+
+
+def normalize_query_key(query: StatisticsQuery) -> str:
+    """生成筛选条件的规范化 key（忽略分页/排序和列表顺序）
+
+    年龄、业历筛选依赖当天日期，因此 key 中包含日期。
+    """
+    data = query.model_dump(mode="json", exclude=_NON_FILTER_FIELDS)
+    normalized = {}
+    for name, value in data.items():
+        if value is None or value == []:
+            continue
+        if isinstance(value, list):
+            value = sorted(set(value))
+        elif isinstance(value, str):
+            value = value.strip()
+        normalized[name] = value
+    normalized["_date"] = date.today().isoformat()
+    return json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+
+
+def _compile_filters(query: StatisticsQuery) -> List[Tuple[str, Tuple[Any, ...]]]:
+    """将 StatisticsQuery 编译为 PostgREST 筛选操作列表"""
+    filters: List[Tuple[str, Tuple[Any, ...]]] = []
+
+    # 1. 关键词搜索（企业名称或事业者编号）
+    if query.search_query:
+        safe_query = sanitize_search_query(query.search_query)
+        if safe_query:
+            filters.append(("or_", (
+                f"company_name.ilike.%{safe_query}%,"
+                f"business_number.ilike.%{safe_query}%",
+            )))
+
+    # 2. 时间筛选（年度/季度/月份）
+    if query.year:
+        if query.month:
+            # 精确到月份
+            start_date = f"{query.year}-{query.month:02d}-01"
+            if query.month == 12:
+                end_date = f"{query.year}-12-31"
+            else:
+                end_date = f"{query.year}-{query.month+1:02d}-01"
+            filters.append(("gte", ("founding_date", start_date)))
+            filters.append(("lt", ("founding_date", end_date)))
+        elif query.quarter:
+            # 精确到季度
+            quarter_months = {1: (1, 3), 2: (4, 6), 3: (7, 9), 4: (10, 12)}
+            start_month, end_month = quarter_months[query.quarter]
+            start_date = f"{query.year}-{start_month:02d}-01"
+            last_day = calendar.monthrange(query.year, end_month)[1]
+            end_date = f"{query.year}-{end_month:02d}-{last_day:02d}"
+            filters.append(("gte", ("founding_date", start_date)))
+            filters.append(("lte", ("founding_date", end_date)))
+        else:
+            # 只筛选年度
+            filters.append(("gte", ("founding_date", f"{query.year}-01-01")))
+            filters.append(("lte", ("founding_date", f"{query.year}-12-31")))
+
+    # 3. 产业筛选 - 标准产业分类
+    if query.major_industry_codes:
+        filters.append(("in_", ("ksic_major", query.major_industry_codes)))
+
+    if query.sub_industry_codes:
+        filters.append(("in_", ("ksic_sub", query.sub_industry_codes)))
+
+    # 产业筛选 - 江原道主导产业
+    if query.gangwon_industry_codes:
+        filters.append(("in_", ("main_industry_ksic_major", query.gangwon_industry_codes)))
+
+    if query.gangwon_industry_sub_codes:
+        # 使用 text[] 生成列的数组重叠操作符（任意一个代码匹配即可，走 GIN 索引）
+        filters.append(("ov", ("main_industry_ksic_codes_tags", query.gangwon_industry_sub_codes)))
+
+    # 产业筛选 - 江原道7大未来产业
+    if query.gangwon_future_industries:
+        filters.append(("in_", ("gangwon_industry", query.gangwon_future_industries)))
+
+    # 产业筛选 - 未来有望新技术
+    if query.future_technologies:
+        filters.append(("in_", ("future_tech", query.future_technologies)))
+
+    # 企业分类
+    if query.startup_types:
+        filters.append(("in_", ("startup_type", query.startup_types)))
+
+    if query.business_fields:
+        filters.append(("in_", ("business_field", query.business_fields)))
+
+    if query.cooperation_fields:
+        filters.append(("ov", ("cooperation_fields_tags", query.cooperation_fields)))
+
+    # 4. 政策关联筛选（OR 逻辑：任意一个标签匹配即可）
+    if query.policy_tags:
+        filters.append(("ov", ("participation_programs_tags", query.policy_tags)))
+
+    # 5. 企业属性筛选（创业阶段）
+    if query.startup_stages:
+        filters.append(("in_", ("startup_stage", query.startup_stages)))
+
+    # 6. 业历工龄筛选
+    current_year = datetime.now().year
+    if query.min_work_years is not None:
+        filters.append(("lte", ("founding_date", f"{current_year - query.min_work_years}-12-31")))
+    if query.max_work_years is not None:
+        filters.append(("gte", ("founding_date", f"{current_year - query.max_work_years}-01-01")))
+
+    # 7. 代表者特征筛选
+    if query.gender:
+        filters.append(("eq", ("representative_gender", query.gender.value)))
+
+    # 年龄筛选：将年龄转换为出生日期范围，下推到数据库层
+    today = date.today()
+    if query.min_age is not None:
+        # 最小年龄 N 岁 → 出生日期 <= today - N 年（即至少 N 岁）
+        max_birth = date(today.year - query.min_age, today.month, today.day)
+        filters.append(("lte", ("representative_birth_date", max_birth.isoformat())))
+    if query.max_age is not None:
+        # 最大年龄 N 岁 → 出生日期 >= today - (N+1) 年 + 1 天（即不超过 N 岁）
+        min_birth = date(today.year - query.max_age - 1, today.month, today.day) + timedelta(days=1)
+        filters.append(("gte", ("representative_birth_date", min_birth.isoformat())))
+
+    # 8. 营收和员工数筛选
+    if query.min_revenue is not None:
+        filters.append(("gte", ("revenue", query.min_revenue)))
+    if query.max_revenue is not None:
+        filters.append(("lte", ("revenue", query.max_revenue)))
+
+    if query.min_employees is not None:
+        filters.append(("gte", ("employee_count", query.min_employees)))
+    if query.max_employees is not None:
+        filters.append(("lte", ("employee_count", query.max_employees)))
+
+    # 9. 所在地筛选
+    if query.region:
+        filters.append(("eq", ("region", query.region)))
+
+    # 10. 投资和专利筛选（业绩聚合字段，来自 member_performance_summary）
+    if query.has_investment is not None:
+        if query.has_investment:
+            filters.append(("gt", ("total_investment", 0)))
+        else:
+            filters.append(("lte", ("total_investment", 0)))
+    if query.min_investment is not None:
+        filters.append(("gte", ("total_investment", query.min_investment)))
+    if query.max_investment is not None:
+        filters.append(("lte", ("total_investment", query.max_investment)))
+
+    if query.min_patents is not None:
+        filters.append(("gte", ("patent_count", query.min_patents)))
+    if query.max_patents is not None:
+        filters.append(("lte", ("patent_count", query.max_patents)))
+
+    return filters
+
+
+# 查询计划 LRU 缓存：(filter_key, 排序) -> StatisticsQueryPlan
+_PLAN_CACHE_MAX_SIZE = 256
+_plan_cache: "OrderedDict[Tuple[str, str, str], StatisticsQueryPlan]" = OrderedDict()
+
+
+def compile_query_plan(query: StatisticsQuery) -> StatisticsQueryPlan:
+    """编译（或从缓存获取）StatisticsQuery 对应的查询计划"""
+    filter_key = normalize_query_key(query)
+    cache_key = (filter_key, query.sort_by.value, query.sort_order.value)
+
+    plan = _plan_cache.get(cache_key)
+    if plan is not None:
+        _plan_cache.move_to_end(cache_key)
+        return plan
+
+    plan = StatisticsQueryPlan(
+        filter_key=filter_key,
+        filters=tuple(_compile_filters(query)),
+        order_column=_SORT_COLUMNS.get(query.sort_by.value, "company_name"),
+        order_desc=(query.sort_order.value == "desc"),
+    )
+    _plan_cache[cache_key] = plan
+    if len(_plan_cache) > _PLAN_CACHE_MAX_SIZE:
+        _plan_cache.popitem(last=False)
+    return plan
+
+
+def empty_performance_summary() -> Dict[str, Any]:
+    """没有业绩记录时的聚合结果"""
+    return {
+        "export_amount": 0.0,
+        "total_investment": 0.0,
+        "patent_count": 0,
+        "latest_revenue": 0.0
+    }
+
+
+def aggregate_performance_records(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """聚合单个会员的业绩记录（records 需按 year 倒序）"""
+    total_export = 0.0
+    total_investment = 0.0
+    patent_count = 0
+    latest_revenue = 0.0
+
+    if records:
+        # 获取最新年份（记录已按年份倒序）
+        latest_year = records[0].get("year")
+
+        for record in records:
+            data_json = record.get("data_json", {})
+            record_type = record.get("type")
+            record_year = record.get("year")
+
+            # 处理销售类型记录（sales）
+            if record_type == "sales":
+                sales_employment = data_json.get("salesEmployment", {})
+
+                # 聚合出口额（只取最新年份）
+                if record_year == latest_year:
+                    export_data = sales_employment.get("export", {})
+                    current_export = export_data.get("currentYear", 0)
+                    if current_export:
+                        try:
+                            total_export += float(current_export)
+                        except (ValueError, TypeError):
+                            pass
+
+                    # 获取销售额（只取最新年份）
+                    sales_data = sales_employment.get("sales", {})
+                    current_revenue = sales_data.get("currentYear", 0)
+                    if current_revenue:
+                        try:
+                            latest_revenue = float(current_revenue)
+                        except (ValueError, TypeError):
+                            pass
+
+            # 处理政府支持类型记录（support）
+            elif record_type == "support":
+                gov_support = data_json.get("governmentSupport", [])
+                if isinstance(gov_support, list):
+                    for support in gov_support:
+                        amount = support.get("supportAmount", 0)
+                        if amount:
                             try:
-                                latest_revenue = float(current_revenue)
+                                # 金额单位是千元，转换为元
+                                total_investment += float(amount) * 1000
                             except (ValueError, TypeError):
                                 pass
-                
-                # 处理政府支持类型记录（support）
-                elif record_type == "support":
-                    gov_support = data_json.get("governmentSupport", [])
-                    if isinstance(gov_support, list):
-                        for support in gov_support:
-                            amount = support.get("supportAmount", 0)
-                            if amount:
-                                try:
-                                    # 金额单位是千元，转换为元
-                                    total_investment += float(amount) * 1000
-                                except (ValueError, TypeError):
-                                    pass
-                
-                # 处理知识产权类型记录（ip）
-                elif record_type == "ip":
-                    ip_data = data_json.get("intellectualProperty", [])
-                    if isinstance(ip_data, list):
-                        patent_count += len(ip_data)
-        
+
+            # 处理知识产权类型记录（ip）
+            elif record_type == "ip":
+                ip_data = data_json.get("intellectualProperty", [])
+                if isinstance(ip_data, list):
+                    patent_count += len(ip_data)
+
+    return {
+        "export_amount": total_export,
+        "total_investment": total_investment,
+        "patent_count": patent_count,
+        "latest_revenue": latest_revenue
+    }
+
+
+# 企业统计与报告服务类
+class StatisticsService:
+    # 会员业绩聚合表（PerformanceService 写入时增量刷新）
+    SUMMARY_TABLE = "member_performance_summary"
+    # 企业统计视图（members LEFT JOIN member_performance_summary）
+    STATISTICS_VIEW = "member_statistics"
+    # 相同筛选条件的总数缓存时间（秒）
+    COUNT_CACHE_TTL = 60
+    # performance_records 批量查询时每批的会员数（避免 in_ 过滤导致 URL 过长）
+    PERFORMANCE_BATCH_SIZE = 200
+    # 单次请求返回的最大行数（PostgREST max-rows 默认 1000）
+    PERFORMANCE_PAGE_SIZE = 1000
+
+    async def _aggregate_performance_data_batch(
+        self, member_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """批量聚合多个会员的业绩数据
+
+        使用 in_('member_id', ids) 一次取回整页会员的业绩记录，
+        替代逐个会员查询（N+1）。
+
+        Returns:
+            member_id -> 聚合结果；没有业绩记录的会员不在结果中
+        """
+        unique_ids = list(dict.fromkeys(mid for mid in member_ids if mid))
+        records_by_member: Dict[str, List[Dict[str, Any]]] = {}
+
+        for i in range(0, len(unique_ids), self.PERFORMANCE_BATCH_SIZE):
+            chunk = unique_ids[i:i + self.PERFORMANCE_BATCH_SIZE]
+            offset = 0
+            while True:
+                try:
+                    # 查询这些会员所有已提交的业绩记录（排除草稿状态）
+                    result = await supabase_service.client.table("performance_records")\
+                        .select("id, member_id, data_json, year, type, status")\
+                        .in_("member_id", chunk)\
+                        .neq("status", "draft")\
+                        .is_("deleted_at", "null")\
+                        .order("year", desc=True)\
+                        .order("id")\
+                        .range(offset, offset + self.PERFORMANCE_PAGE_SIZE - 1)\
+                        .execute_async()
+                except Exception as e:
+                    logger.error(f"Error fetching performance data for {len(chunk)} members: {e}")
+                    break
+
+                rows = result.data or []
+                for record in rows:
+                    records_by_member.setdefault(str(record.get("member_id")), []).append(record)
+
+                if len(rows) < self.PERFORMANCE_PAGE_SIZE:
+                    break
+                offset += self.PERFORMANCE_PAGE_SIZE
+
         return {
-            "export_amount": total_export,
-            "total_investment": total_investment,
-            "patent_count": patent_count,
-            "latest_revenue": latest_revenue
+            member_id: aggregate_performance_records(records)
+            for member_id, records in records_by_member.items()
         }
 
+    async def invalidate_query_cache(self) -> None:
+        """失效总数缓存（会员资料、审批状态或业绩数据变更后调用）"""
+        await cache_service.invalidate(STATISTICS_CACHE_NAMESPACE)
+
+    async def refresh_member_performance_summary(self, member_id: str) -> Dict[str, Any]:
+        """重新计算并保存单个会员的业绩聚合（业绩记录变更后调用）"""
+        member_id = str(member_id)
+        summaries = await self._aggregate_performance_data_batch([member_id])
+        summary = summaries.get(member_id) or empty_performance_summary()
+
+        await supabase_service.client.table(self.SUMMARY_TABLE)\
+            .upsert({"member_id": member_id, **summary, "updated_at": now_iso()})\
+            .execute_async()
+        await self.invalidate_query_cache()
+
+        return summary
+
+    async def rebuild_member_performance_summaries(self) -> int:
+        """全量重建业绩聚合表（初始化或修复数据时使用）
+
+        Returns:
+            已写入的会员数
+        """
+        rebuilt = 0
+        offset = 0
+        while True:
+            result = await supabase_service.client.table("members")\
+                .select("id")\
+                .order("id")\
+                .range(offset, offset + self.PERFORMANCE_PAGE_SIZE - 1)\
+                .execute_async()
+            member_ids = [str(row["id"]) for row in (result.data or [])]
+            if not member_ids:
+                break
+
+            summaries = await self._aggregate_performance_data_batch(member_ids)
+            timestamp = now_iso()
+            rows = [
+                {
+                    "member_id": member_id,
+                    **(summaries.get(member_id) or empty_performance_summary()),
+                    "updated_at": timestamp,
+                }
+                for member_id in member_ids
+            ]
+            await supabase_service.client.table(self.SUMMARY_TABLE)\
+                .upsert(rows)\
+                .execute_async()
+            rebuilt += len(rows)
+
+            if len(member_ids) < self.PERFORMANCE_PAGE_SIZE:
+                break
+            offset += self.PERFORMANCE_PAGE_SIZE
+
+        await self.invalidate_query_cache()
+        logger.info(f"Rebuilt performance summaries for {rebuilt} members")
+        return rebuilt
+
     async def get_statistics_report(
         self, query: StatisticsQuery
     ) -> Tuple[List[Dict[str, Any]], int]:
-        """获取并筛选企业统计报告"""
-        sb_query = supabase_service.client.table("members").select("*", count="exact")
-
-        # 1. 关键词搜索（企业名称或事业者编号）
-        if query.search_query:
-            safe_query = sanitize_search_query(query.search_query)
-            if safe_query:
-                sb_query = sb_query.or_(
-                    f"company_name.ilike.%{safe_query}%,"
-                    f"business_number.ilike.%{safe_query}%"
-                )
-
-        # 2. 时间筛选（年度/季度/月份）
-        if query.year:
-            if query.month:
-                # 精确到月份
-                start_date = f"{query.year}-{query.month:02d}-01"
-                if query.month == 12:
-                    end_date = f"{query.year}-12-31"
-                else:
-                    end_date = f"{query.year}-{query.month+1:02d}-01"
-                sb_query = sb_query.gte("founding_date", start_date).lt("founding_date", end_date)
-            elif query.quarter:
-                # 精确到季度
-                quarter_months = {1: (1, 3), 2: (4, 6), 3: (7, 9), 4: (10, 12)}
-                start_month, end_month = quarter_months[query.quarter]
-                start_date = f"{query.year}-{start_month:02d}-01"
-                last_day = calendar.monthrange(query.year, end_month)[1]
-                end_date = f"{query.year}-{end_month:02d}-{last_day:02d}"
-                sb_query = sb_query.gte("founding_date", start_date).lte("founding_date", end_date)
-            else:
-                # 只筛选年度
-                sb_query = sb_query.gte("founding_date", f"{query.year}-01-01")\
-                                 .lte("founding_date", f"{query.year}-12-31")
-
-        # 3. 产业筛选 - 标准产业分类
-        if query.major_industry_codes:
-            sb_query = sb_query.in_("ksic_major", query.major_industry_codes)
-        
-        if query.sub_industry_codes:
-            sb_query = sb_query.in_("ksic_sub", query.sub_industry_codes)
-        
-        # 产业筛选 - 江原道主导产业
-        if query.gangwon_industry_codes:
-            sb_query = sb_query.in_("main_industry_ksic_major", query.gangwon_industry_codes)
-        
-        if query.gangwon_industry_sub_codes:
-            # main_industry_ksic_codes 是 text 类型（存储 JSON 数组字符串），使用 like 匹配
-            sub_conditions = []
-            for code in query.gangwon_industry_sub_codes:
-                sub_conditions.append(f'main_industry_ksic_codes.like.*{code}*')
-            if sub_conditions:
-                sb_query = sb_query.or_(",".join(sub_conditions))
-
-        # 产业筛选 - 江原道7大未来产业
-        if query.gangwon_future_industries:
-            sb_query = sb_query.in_("gangwon_industry", query.gangwon_future_industries)
-
-        # 产业筛选 - 未来有望新技术
-        if query.future_technologies:
-            sb_query = sb_query.in_("future_tech", query.future_technologies)
-
-        # 企业分类
-        if query.startup_types:
-            sb_query = sb_query.in_("startup_type", query.startup_types)
-
-        if query.business_fields:
-            sb_query = sb_query.in_("business_field", query.business_fields)
-
-        if query.cooperation_fields:
-            # cooperation_fields 是 text 类型（存储 JSON 数组字符串），使用 like 匹配
-            coop_conditions = []
-            for field in query.cooperation_fields:
-                coop_conditions.append(f'cooperation_fields.like.*{field}*')
-            if coop_conditions:
-                sb_query = sb_query.or_(",".join(coop_conditions))
-
-        # 4. 政策关联筛选（OR 逻辑）
-        if query.policy_tags:
-            # 构建 OR 条件：任意一个标签匹配即可
-            # participation_programs 是 text 类型（存储 JSON 数组字符串），
-            # 不能使用 cd/cs 等数组操作符，改用 like 进行文本匹配
-            policy_conditions = []
-            for tag in query.policy_tags:
-                policy_conditions.append(f'participation_programs.like.*{tag}*')
-
-            if policy_conditions:
-                sb_query = sb_query.or_(",".join(policy_conditions))
-
-        # 5. 企业属性筛选（创业阶段）
-        if query.startup_stages:
-            sb_query = sb_query.in_("startup_stage", query.startup_stages)
-
-        # 6. 业历工龄筛选
-        current_year = datetime.now().year
-        if query.min_work_years is not None:
-            founding_before = f"{current_year - query.min_work_years}-12-31"
-            sb_query = sb_query.lte("founding_date", founding_before)
-        if query.max_work_years is not None:
-            founding_after = f"{current_year - query.max_work_years}-01-01"
-            sb_query = sb_query.gte("founding_date", founding_after)
-
-        # 7. 代表者特征筛选
-        if query.gender:
-            sb_query = sb_query.eq("representative_gender", query.gender.value)
-
-        # 年龄筛选：将年龄转换为出生日期范围，下推到数据库层
-        today = date.today()
-        if query.min_age is not None:
-            # 最小年龄 N 岁 → 出生日期 <= today - N 年（即至少 N 岁）
-            max_birth = date(today.year - query.min_age, today.month, today.day)
-            sb_query = sb_query.lte("representative_birth_date", max_birth.isoformat())
-        if query.max_age is not None:
-            # 最大年龄 N 岁 → 出生日期 >= today - (N+1) 年 + 1 天（即不超过 N 岁）
-            min_birth = date(today.year - query.max_age - 1, today.month, today.day) + timedelta(days=1)
-            sb_query = sb_query.gte("representative_birth_date", min_birth.isoformat())
-
-        # 8. 营收和员工数筛选
-        if query.min_revenue is not None:
-            sb_query = sb_query.gte("revenue", query.min_revenue)
-        if query.max_revenue is not None:
-            sb_query = sb_query.lte("revenue", query.max_revenue)
-        
-        if query.min_employees is not None:
-            sb_query = sb_query.gte("employee_count", query.min_employees)
-        if query.max_employees is not None:
-            sb_query = sb_query.lte("employee_count", query.max_employees)
-
-        # 9. 所在地筛选
-        if query.region:
-            sb_query = sb_query.eq("region", query.region)
-
-        # 排序
-        # 注意：patent_count 和 total_investment 不在 members 表中，需要在应用层排序
-        order_field = query.sort_by.value
-        if order_field in ["patent_count", "total_investment"]:
-            # 这些字段需要在应用层排序，数据库层使用 company_name 排序
-            sb_column = "company_name"
-            need_app_sort = True
-        else:
-            field_map = {
-                "enterprise_name": "company_name",
-                "annual_revenue": "revenue"
-            }
-            sb_column = field_map.get(order_field, "company_name")
-            need_app_sort = False
-        
-        sb_query = sb_query.order(sb_column, desc=(query.sort_order.value == "desc"))
-
-        # 分页：如果有投资或专利筛选，需要先获取所有数据再过滤，所以暂时不分页
-        has_app_filter = (
-            query.has_investment is not None or 
-            query.min_investment is not None or 
-            query.max_investment is not None or 
-            query.min_patents is not None or 
-            query.max_patents is not None
+        """获取并筛选企业统计报告
+
+        查询 member_statistics 视图（members + 业绩聚合），所有筛选、排序和
+        分页都在数据库层完成，每次请求只返回一页数据。相同筛选条件的总数
+        通过 cache_service 在 COUNT_CACHE_TTL 内复用，翻页和刷新时不再重复执行 count；
+        未命中时总数随当前页查询一起取回。
+        """
+        plan = compile_query_plan(query)
+        offset = (query.page - 1) * query.page_size
+
+        def page_query(with_count: bool):
+            table = supabase_service.client.table(self.STATISTICS_VIEW)
+            sb_query = table.select("*", count="exact") if with_count else table.select("*")
+            sb_query = plan.apply_order(plan.apply_filters(sb_query))
+            return sb_query.range(offset, offset + query.page_size - 1)
+
+        result = None
+
+        async def load_total() -> int:
+            nonlocal result
+            result = await page_query(with_count=True).execute_async()
+            return result.count or 0
+
+        total_count = await cache_service.get_or_load(
+            STATISTICS_CACHE_NAMESPACE,
+            plan.filter_key,
+            load_total,
+            ttl=self.COUNT_CACHE_TTL,
+            stale_ttl=0,
         )
-        
-        if not has_app_filter:
-            # 没有应用层筛选，可以直接在数据库层分页
-            offset = (query.page - 1) * query.page_size
-            sb_query = sb_query.range(offset, offset + query.page_size - 1)
-        else:
-            # 有应用层筛选，需要获取更多数据（最多1000条）
-            sb_query = sb_query.limit(1000)
-
-        # 执行查询
-        result = sb_query.execute()
+        # 总数来自缓存（或其他请求正在加载）时单独查询当前页
+        if result is None:
+            result = await page_query(with_count=False).execute_async()
         
         # 处理结果
         items = []
@@ -360,14 +528,11 @@ class StatisticsService:
                 except (ValueError, TypeError):
                     pass
             
-            # 聚合业绩数据
-            member_id = str(row.get("id"))
-            perf_data = self._aggregate_performance_data(member_id)
-            
             # 使用 members 表的 revenue，如果没有则使用业绩数据的最新销售额
             annual_revenue = ensure_float(row.get("revenue"))
-            if annual_revenue == 0 and perf_data["latest_revenue"] > 0:
-                annual_revenue = perf_data["latest_revenue"]
+            latest_revenue = ensure_float(row.get("latest_revenue"))
+            if annual_revenue == 0 and latest_revenue > 0:
+                annual_revenue = latest_revenue
             
             # 计算代表者年龄
             representative_age = None
@@ -404,7 +569,7 @@ class StatisticsService:
                 "enterprise_name": row.get("company_name"),
                 
                 # 快速筛选组
-                "policy_tags": ensure_list(row.get("participation_programs")),
+                "policy_tags": row.get("participation_programs_tags") or [],
                 
                 # 企业特征组
                 "ksic_major": row.get("ksic_major"),
@@ -418,206 +583,31 @@ class StatisticsService:
                 "region": row.get("region"),
                 
                 # 经营指标组
-                "total_investment": perf_data["total_investment"],
+                "total_investment": ensure_float(row.get("total_investment")),
                 "annual_revenue": annual_revenue,
-                "export_amount": perf_data["export_amount"],
+                "export_amount": ensure_float(row.get("export_amount")),
                 "employee_count": ensure_int(row.get("employee_count")),
-                "patent_count": perf_data["patent_count"],
+                "patent_count": ensure_int(row.get("patent_count")),
                 
                 # 代表者信息组
                 "representative_gender": row.get("representative_gender"),
                 "representative_age": representative_age,
             })
 
-        # 应用层过滤：投资和专利筛选（因为这些字段不在 members 表中）
-        filtered_items = []
-        for item in items:
-            # 投资情况筛选
-            if query.has_investment is not None:
-                if query.has_investment and item["total_investment"] <= 0:
-                    continue
-                if not query.has_investment and item["total_investment"] > 0:
-                    continue
-            
-            if query.min_investment is not None and item["total_investment"] < query.min_investment:
-                continue
-            if query.max_investment is not None and item["total_investment"] > query.max_investment:
-                continue
-            
-            # 专利筛选
-            if query.min_patents is not None and item["patent_count"] < query.min_patents:
-                continue
-            if query.max_patents is not None and item["patent_count"] > query.max_patents:
-                continue
-            
-            filtered_items.append(item)
-        
-        # 应用层排序：如果按 patent_count 或 total_investment 排序
-        if need_app_sort:
-            sort_key = query.sort_by.value
-            reverse = (query.sort_order.value == "desc")
-            filtered_items.sort(key=lambda x: x.get(sort_key, 0), reverse=reverse)
-        
-        # 计算总数
-        if has_app_filter:
-            # 有应用层过滤，使用过滤后的数量
-            total_count = len(filtered_items)
-            # 应用层分页
-            offset = (query.page - 1) * query.page_size
-            filtered_items = filtered_items[offset:offset + query.page_size]
-        else:
-            # 没有应用层过滤，使用数据库返回的总数
-            total_count = result.count or 0
-
-        return filtered_items, total_count
+        return items, total_count
 
     async def get_export_data(self, query: StatisticsQuery) -> List[Dict[str, Any]]:
-        """获取所有 member 字段的导出数据"""
-        # 直接查询数据库获取所有字段
-        sb_query = supabase_service.client.table("members").select("*", count="exact")
-
-        # 应用所有筛选条件（复用查询逻辑）
-        # 1. 关键词搜索
-        if query.search_query:
-            safe_query = sanitize_search_query(query.search_query)
-            if safe_query:
-                sb_query = sb_query.or_(
-                    f"company_name.ilike.%{safe_query}%,"
-                    f"business_number.ilike.%{safe_query}%"
-                )
-
-        # 2. 时间筛选
-        if query.year:
-            if query.month:
-                start_date = f"{query.year}-{query.month:02d}-01"
-                if query.month == 12:
-                    end_date = f"{query.year}-12-31"
-                else:
-                    end_date = f"{query.year}-{query.month+1:02d}-01"
-                sb_query = sb_query.gte("founding_date", start_date).lt("founding_date", end_date)
-            elif query.quarter:
-                quarter_months = {1: (1, 3), 2: (4, 6), 3: (7, 9), 4: (10, 12)}
-                start_month, end_month = quarter_months[query.quarter]
-                start_date = f"{query.year}-{start_month:02d}-01"
-                last_day = calendar.monthrange(query.year, end_month)[1]
-                end_date = f"{query.year}-{end_month:02d}-{last_day:02d}"
-                sb_query = sb_query.gte("founding_date", start_date).lte("founding_date", end_date)
-            else:
-                sb_query = sb_query.gte("founding_date", f"{query.year}-01-01")\
-                                 .lte("founding_date", f"{query.year}-12-31")
+        """获取所有 member 字段的导出数据（与报表共用查询计划）"""
+        plan = compile_query_plan(query)
 
-        # 3. 产业筛选 - 标准产业分类
-        if query.major_industry_codes:
-            sb_query = sb_query.in_("ksic_major", query.major_industry_codes)
-        
-        if query.sub_industry_codes:
-            sb_query = sb_query.in_("ksic_sub", query.sub_industry_codes)
-        
-        # 产业筛选 - 江原道主导产业
-        if query.gangwon_industry_codes:
-            sb_query = sb_query.in_("main_industry_ksic_major", query.gangwon_industry_codes)
-        
-        if query.gangwon_industry_sub_codes:
-            # main_industry_ksic_codes 是 text 类型（存储 JSON 数组字符串），使用 like 匹配
-            sub_conditions = []
-            for code in query.gangwon_industry_sub_codes:
-                sub_conditions.append(f'main_industry_ksic_codes.like.*{code}*')
-            if sub_conditions:
-                sb_query = sb_query.or_(",".join(sub_conditions))
-
-        # 产业筛选 - 江原道7大未来产业
-        if query.gangwon_future_industries:
-            sb_query = sb_query.in_("gangwon_industry", query.gangwon_future_industries)
-
-        # 产业筛选 - 未来有望新技术
-        if query.future_technologies:
-            sb_query = sb_query.in_("future_tech", query.future_technologies)
-
-        # 企业分类
-        if query.startup_types:
-            sb_query = sb_query.in_("startup_type", query.startup_types)
-
-        if query.business_fields:
-            sb_query = sb_query.in_("business_field", query.business_fields)
-
-        if query.cooperation_fields:
-            # cooperation_fields 是 text 类型（存储 JSON 数组字符串），使用 like 匹配
-            coop_conditions = []
-            for field in query.cooperation_fields:
-                coop_conditions.append(f'cooperation_fields.like.*{field}*')
-            if coop_conditions:
-                sb_query = sb_query.or_(",".join(coop_conditions))
-
-        # 4. 政策关联筛选
-        if query.policy_tags:
-            # participation_programs 是 text 类型，使用 like 进行文本匹配
-            policy_conditions = []
-            for tag in query.policy_tags:
-                policy_conditions.append(f'participation_programs.like.*{tag}*')
-            if policy_conditions:
-                sb_query = sb_query.or_(",".join(policy_conditions))
-
-        # 5. 企业属性筛选（创业阶段）
-        if query.startup_stages:
-            sb_query = sb_query.in_("startup_stage", query.startup_stages)
-
-        # 6. 业历工龄筛选
-        current_year = datetime.now().year
-        if query.min_work_years is not None:
-            founding_before = f"{current_year - query.min_work_years}-12-31"
-            sb_query = sb_query.lte("founding_date", founding_before)
-        if query.max_work_years is not None:
-            founding_after = f"{current_year - query.max_work_years}-01-01"
-            sb_query = sb_query.gte("founding_date", founding_after)
-
-        # 7. 代表者特征筛选
-        if query.gender:
-            sb_query = sb_query.eq("representative_gender", query.gender.value)
-
-        # 年龄筛选：将年龄转换为出生日期范围，下推到数据库层
-        today = date.today()
-        if query.min_age is not None:
-            max_birth = date(today.year - query.min_age, today.month, today.day)
-            sb_query = sb_query.lte("representative_birth_date", max_birth.isoformat())
-        if query.max_age is not None:
-            min_birth = date(today.year - query.max_age - 1, today.month, today.day) + timedelta(days=1)
-            sb_query = sb_query.gte("representative_birth_date", min_birth.isoformat())
-
-        # 8. 营收和员工数筛选
-        if query.min_revenue is not None:
-            sb_query = sb_query.gte("revenue", query.min_revenue)
-        if query.max_revenue is not None:
-            sb_query = sb_query.lte("revenue", query.max_revenue)
-        
-        if query.min_employees is not None:
-            sb_query = sb_query.gte("employee_count", query.min_employees)
-        if query.max_employees is not None:
-            sb_query = sb_query.lte("employee_count", query.max_employees)
-
-        # 9. 所在地筛选
-        if query.region:
-            sb_query = sb_query.eq("region", query.region)
-
-        # 排序
-        # 注意：patent_count 和 total_investment 不在 members 表中
-        order_field = query.sort_by.value
-        if order_field in ["patent_count", "total_investment"]:
-            # 这些字段需要在应用层排序，数据库层使用 company_name 排序
-            sb_column = "company_name"
-        else:
-            field_map = {
-                "enterprise_name": "company_name",
-                "annual_revenue": "revenue"
-            }
-            sb_column = field_map.get(order_field, "company_name")
-        
-        sb_query = sb_query.order(sb_column, desc=(query.sort_order.value == "desc"))
+        sb_query = supabase_service.client.table(self.STATISTICS_VIEW).select("*")
+        sb_query = plan.apply_order(plan.apply_filters(sb_query))
 
         # 限制最大导出数量
         sb_query = sb_query.limit(5000)
 
         # 执行查询
-        result = sb_query.execute()
+        result = await sb_query.execute_async()
         
         # 处理结果 - 返回所有字段（年龄筛选已在数据库层完成）
         return result.data or []
@@ -38,7 +38,7 @@ class SupportService:
         
         query = query.order('display_order', desc=False).order('created_at', desc=False)
         
-        result = query.execute()
+        result = await query.execute_async()
         return result.data or []
 
     async def create_faq(self, data: FAQCreate) -> Dict[str, Any]:
@@ -184,6 +184,6 @@ class SupportService:
             offset = (page - 1) * page_size
             query = query.range(offset, offset + page_size - 1)
             
-            result = query.execute()
+            result = await query.execute_async()
             return result.data or [], total
 
@@ -3,10 +3,12 @@ Authentication dependencies.
 
 FastAPI dependencies for authentication and authorization.
 """
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 
+from ...common.modules.cache import CacheService, create_backend
+from ...common.modules.config import settings
 from ...common.modules.supabase.service import supabase_service
 from ...common.modules.exception import (
     AuthorizationError, 
@@ -24,20 +26,92 @@ from .service import AuthService
 # and handle the missing-credentials case ourselves by raising AuthenticationError.
 security = HTTPBearer(auto_error=False)
 
+PRINCIPAL_CACHE_NAMESPACE = "principal"
+
+# Principals get their own bounded cache: keys include the token iat, so many
+# concurrent sessions must not evict the dashboard/analytics aggregates held
+# by the shared cache_service.
+principal_cache = CacheService(
+    backend=create_backend(
+        settings.CACHE_BACKEND,
+        settings.CACHE_REDIS_URL,
+        settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+        key_prefix="gbp:principal:",
+    ),
+    default_ttl=settings.AUTH_PRINCIPAL_CACHE_TTL,
+    stale_ttl=0,
+    enabled=settings.CACHE_ENABLED,
+)
+
+# Only the columns authorization and the /me endpoints read; password hashes
+# and profile fields never enter the principal cache.
+PRINCIPAL_COLUMNS = {
+    "admins": "id, username, email, full_name, is_active, created_at",
+    "members": "id, business_number, company_name, email, status, approval_status, created_at",
+}
+
+
+def _decode_token(request: Request, token: str) -> dict:
+    """Decode a JWT, reusing the claims HTTPLoggingMiddleware already decoded for this request."""
+    if getattr(request.state, "token", None) == token:
+        claims = getattr(request.state, "token_claims", None)
+        if claims is not None:
+            return claims
+    return AuthService.decode_token(token)
+
+
+async def _load_principal(role: str, user_id: str, payload: dict) -> Optional[dict]:
+    """Load the user row behind a token, cached per (user_id, token iat).
+
+    Entries live for AUTH_PRINCIPAL_CACHE_TTL seconds and are never served
+    stale; status changes drop them through invalidate_principal.
+
+    Returns:
+        A copy of the user row with ``role`` set, or None if the user does not exist
+    """
+    table = "admins" if role == "admin" else "members"
+
+    async def load() -> Optional[dict]:
+        result = await supabase_service.client.table(table)\
+            .select(PRINCIPAL_COLUMNS[table])\
+            .eq('id', user_id)\
+            .limit(1)\
+            .execute_async()
+        return result.data[0] if result.data else None
+
+    ttl = settings.AUTH_PRINCIPAL_CACHE_TTL
+    if ttl <= 0:
+        user = await load()
+    else:
+        issued_at = payload.get("iat") or payload.get("exp")
+        user = await principal_cache.get_or_load(
+            PRINCIPAL_CACHE_NAMESPACE, f"{user_id}:{table}:{issued_at}", load, ttl=ttl, stale_ttl=0
+        )
+    if user is None:
+        return None
+    # The memory backend hands out the cached object itself
+    user = dict(user)
+    user["role"] = role
+    return user
+
+
+async def invalidate_principal(user_id) -> None:
+    """Drop cached principals of a user after a status, approval or password change."""
+    await principal_cache.invalidate_prefix(PRINCIPAL_CACHE_NAMESPACE, f"{user_id}:")
+
 
 async def get_current_user(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
 ) -> dict:
     """Get current authenticated user from JWT token."""
-    auth_service = AuthService()
-
     if credentials is None:
         raise AuthenticationError(CMessageTemplate.AUTH_NOT_AUTHENTICATED)
 
     token = credentials.credentials
 
     try:
-        payload = auth_service.decode_token(token)
+        payload = _decode_token(request, token)
         user_id: str = payload.get("sub")
         role: str = payload.get("role", "member")
         
@@ -47,15 +121,10 @@ async def get_current_user(
         raise AuthenticationError(CMessageTemplate.AUTH_CREDENTIAL_VALIDATION_FAILED.format(error=str(e)))
 
     try:
-        if role == "admin":
-            user = await supabase_service.get_by_id('admins', user_id)
-        else:
-            user = await supabase_service.get_by_id('members', user_id)
-        
+        user = await _load_principal(role, user_id, payload)
         if user is None:
             raise AuthenticationError(format_auth_user_not_found("User"))
         
-        user["role"] = role
         return user
     except ValueError:
         raise AuthenticationError(CMessageTemplate.AUTH_INVALID_ID_FORMAT.format(user_type="User"))
@@ -78,6 +147,7 @@ async def get_current_active_user(
 
 
 async def get_current_user_optional(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
 ) -> Optional[dict]:
     """Get current user if authenticated, otherwise return None.
@@ -88,27 +158,17 @@ async def get_current_user_optional(
     if credentials is None:
         return None
 
-    auth_service = AuthService()
     token = credentials.credentials
 
     try:
-        payload = auth_service.decode_token(token)
+        payload = _decode_token(request, token)
         user_id: str = payload.get("sub")
         role: str = payload.get("role", "member")
         
         if user_id is None:
             return None
             
-        if role == "admin":
-            user = await supabase_service.get_by_id('admins', user_id)
-        else:
-            user = await supabase_service.get_by_id('members', user_id)
-        
-        if user is None:
-            return None
-        
-        user["role"] = role
-        return user
+        return await _load_principal(role, user_id, payload)
     except Exception:
         # Token invalid or expired, return None instead of raising
         return None
@@ -165,18 +225,17 @@ async def get_current_active_user_compat(
 
 
 async def get_current_member_user(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
 ) -> MemberCompat:
     """Get current member user."""
-    auth_service = AuthService()
-
     if credentials is None:
         raise AuthenticationError(CMessageTemplate.AUTH_NOT_AUTHENTICATED)
 
     token = credentials.credentials
 
     try:
-        payload = auth_service.decode_token(token)
+        payload = _decode_token(request, token)
         user_id: str = payload.get("sub")
         role: str = payload.get("role", "member")
         
@@ -185,7 +244,7 @@ async def get_current_member_user(
         
         if role == "member" or role is None:
             try:
-                member = await supabase_service.get_by_id('members', user_id)
+                member = await _load_principal("member", user_id, payload)
                 if member is None:
                     raise AuthenticationError(format_auth_user_not_found("Member"))
                 
@@ -205,18 +264,17 @@ async def get_current_member_user(
 
 
 async def get_current_admin_user(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
 ) -> dict:
     """Get current admin user."""
-    auth_service = AuthService()
-
     if credentials is None:
         raise AuthenticationError(CMessageTemplate.AUTH_NOT_AUTHENTICATED)
 
     token = credentials.credentials
 
     try:
-        payload = auth_service.decode_token(token)
+        payload = _decode_token(request, token)
         user_id: str = payload.get("sub")
         role: str = payload.get("role", "member")
         
@@ -225,7 +283,7 @@ async def get_current_admin_user(
         
         if role == "admin":
             try:
-                admin = await supabase_service.get_by_id('admins', user_id)
+                admin = await _load_principal("admin", user_id, payload)
                 if admin is None:
                     raise AuthenticationError(format_auth_user_not_found("Admin"))
                 
@@ -0,0 +1,136 @@
+"""
+Password hashing pool.
+
+bcrypt hash/verify costs 100-300ms of CPU per call. Running it inline in
+async handlers blocks the event loop, so a burst of logins stalls every
+other request. PasswordHasher runs those calls on a small dedicated thread
+pool instead (bcrypt releases the GIL while hashing, so the event loop keeps
+serving other requests), bounds how many calls may wait for a worker, and
+keeps queue/latency counters for the metrics endpoint.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from ...common.modules.config import settings
+from ...common.modules.exception import RateLimitError, CMessageTemplate
+from ...common.modules.interceptor import register_stats_provider
+
+# Password hashing context
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class PasswordHasher:
+    """Bounded thread pool for bcrypt hash/verify with queue metrics."""
+
+    def __init__(self, workers: int = 2, max_queue: int = 64):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # Calls submitted and not finished yet (running + waiting for a worker).
+        # Released from the executor future's done-callback, which may run on a
+        # worker thread, hence the lock.
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._stats = {
+            "completed": 0,
+            "rejected": 0,
+            "max_queued": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+            "run_ms_total": 0.0,
+        }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="pwd-hash",
+                    )
+        return self._executor
+
+    async def hash(self, password: str) -> str:
+        """Hash a password off the event loop."""
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash off the event loop."""
+        return await self._run(pwd_context.verify, plain_password, hashed_password)
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        queued = max(0, self._pending - self.workers)
+        if queued >= self.max_queue:
+            self._stats["rejected"] += 1
+            raise RateLimitError(
+                CMessageTemplate.RATE_LIMIT_RETRY_AFTER.format(seconds=1),
+                retry_after=1,
+                limit_type="password_hash",
+            )
+
+        with self._pending_lock:
+            self._pending += 1
+            self._stats["max_queued"] = max(self._stats["max_queued"], self._pending - self.workers)
+        submitted = time.perf_counter()
+        future = self._get_executor().submit(_timed, func, args)
+        # A cancelled caller (client disconnect, timeout) does not stop a bcrypt
+        # call that is already running, so the slot is only released once the
+        # worker is actually done (or the call was dropped before it started).
+        future.add_done_callback(self._release)
+        result, started, finished = await asyncio.wrap_future(future)
+
+        wait_ms = (started - submitted) * 1000
+        self._stats["completed"] += 1
+        self._stats["wait_ms_total"] += wait_ms
+        self._stats["wait_ms_max"] = max(self._stats["wait_ms_max"], wait_ms)
+        self._stats["run_ms_total"] += (finished - started) * 1000
+        return result
+
+    def _release(self, _future: Future) -> None:
+        with self._pending_lock:
+            self._pending -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size, current queue depth and average wait/run times."""
+        completed = self._stats["completed"]
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": min(self._pending, self.workers),
+            "queued": max(0, self._pending - self.workers),
+            "max_queued": self._stats["max_queued"],
+            "completed": completed,
+            "rejected": self._stats["rejected"],
+            "avg_wait_ms": round(self._stats["wait_ms_total"] / completed, 2) if completed else 0.0,
+            "max_wait_ms": round(self._stats["wait_ms_max"], 2),
+            "avg_run_ms": round(self._stats["run_ms_total"] / completed, 2) if completed else 0.0,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut the pool down (called on application shutdown)."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+def _timed(func: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[Any, float, float]:
+    """Run func in a worker thread, returning its result with start/finish times."""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, started, time.perf_counter()
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+# Shown as "password_hash_pool" in /api/v1/logging/metrics
+register_stats_provider("password_hash_pool", password_hasher.get_stats)
@@ -6,7 +6,6 @@ Business logic for user authentication and authorization.
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from uuid import UUID, uuid4
 from fastapi import UploadFile
 
@@ -21,6 +20,7 @@ from ...common.modules.exception import (
     CMessageTemplate,
     format_operation_failed,
 )
+from .password import password_hasher, pwd_context
 from .schemas import MemberRegisterRequest
 from ..upload.service import UploadService
 
@@ -36,21 +36,17 @@ class UserStatus(str, Enum):
     PENDING_APPROVAL = "pending"
 
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
 class AuthService:
     """Authentication service class."""
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
-        """Verify a password against a hash."""
+        """Verify a password against a hash (blocking; async code uses password_hasher)."""
         return pwd_context.verify(plain_password, hashed_password)
 
     @staticmethod
     def get_password_hash(password: str) -> str:
-        """Hash a password."""
+        """Hash a password (blocking; async code uses password_hasher)."""
         return pwd_context.hash(password)
 
     @staticmethod
@@ -70,7 +66,8 @@ class AuthService:
             expire = datetime.utcnow() + expires_delta
         else:
             expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        to_encode.update({"exp": expire})
+        # iat keys the principal cache, so a re-issued token never sees an older cached row
+        to_encode.update({"exp": expire, "iat": datetime.utcnow()})
         encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
         return encoded_jwt
 
@@ -178,7 +175,7 @@ class AuthService:
             "business_number": data.business_number,
             "company_name": data.company_name,
             "email": data.email,
-            "password_hash": self.get_password_hash(data.password),
+            "password_hash": await password_hasher.hash(data.password),
             "status": "pending",
             "approval_status": "pending",
             # Profile fields (merged from member_profiles)
@@ -244,7 +241,7 @@ class AuthService:
             import json
             
             # Get all active admins
-            admins_result = supabase_service.client.table('admins').select('id').eq('is_active', 'true').execute()
+            admins_result = await supabase_service.client.table('admins').select('id').eq('is_active', 'true').execute_async()
             admin_ids = [admin['id'] for admin in (admins_result.data or [])]
             
             # Send notification to each admin
@@ -293,7 +290,7 @@ class AuthService:
         # Find member by business number (normalized comparison handled in service)
         member = await supabase_service.get_member_by_business_number(business_number)
 
-        if not member or not self.verify_password(password, member.get("password_hash", "")):
+        if not member or not await password_hasher.verify(password, member.get("password_hash", "")):
             raise AuthenticationError(CMessageTemplate.AUTH_INVALID_CREDENTIALS, context={"error_code": ErrorCode.INVALID_CREDENTIALS})
 
         if member.get("approval_status") == UserStatus.PENDING_APPROVAL.value:
@@ -361,7 +358,7 @@ class AuthService:
         # Find admin by email - use existing method
         admin = await supabase_service.get_admin_by_email(email)
 
-        if not admin or not self.verify_password(password, admin.get("password_hash", "")):
+        if not admin or not await password_hasher.verify(password, admin.get("password_hash", "")):
             raise AuthorizationError(CMessageTemplate.AUTH_INVALID_CREDENTIALS, context={"error_code": ErrorCode.INVALID_ADMIN_CREDENTIALS})
 
         if admin.get("is_active") in [UserStatus.SUSPENDED.value, UserStatus.DELETED.value]:
@@ -456,7 +453,7 @@ class AuthService:
 
         # Update password and clear reset token - use helper method
         update_data = {
-            "password_hash": self.get_password_hash(new_password),
+            "password_hash": await password_hasher.hash(new_password),
             "reset_token": None,
             "reset_token_expires": None,
             "updated_at": datetime.utcnow().isoformat(),
@@ -466,6 +463,9 @@ class AuthService:
         if not updated_member:
             raise ValidationError(format_operation_failed("update password"))
 
+        from .dependencies import invalidate_principal
+        await invalidate_principal(member["id"])
+
         return updated_member
 
     async def change_password(
@@ -486,13 +486,18 @@ class AuthService:
             UnauthorizedError: If current password is incorrect
             ValidationError: If new password is invalid
         """
+        # The authenticated principal carries no password hash, read it from the row
+        stored = await supabase_service.get_by_id('members', member["id"])
+        if not stored:
+            raise AuthorizationError(CMessageTemplate.USER_CURRENT_PASSWORD_INCORRECT)
+
         # Verify current password
-        if not self.verify_password(current_password, member.get("password_hash", "")):
+        if not await password_hasher.verify(current_password, stored.get("password_hash") or ""):
             raise AuthorizationError(CMessageTemplate.USER_CURRENT_PASSWORD_INCORRECT)
 
         # Update password - use helper method
         update_data = {
-            "password_hash": self.get_password_hash(new_password),
+            "password_hash": await password_hasher.hash(new_password),
             "updated_at": datetime.utcnow().isoformat(),
         }
         
@@ -500,6 +505,9 @@ class AuthService:
         if not updated_member:
             raise ValidationError(format_operation_failed("update password"))
 
+        from .dependencies import invalidate_principal
+        await invalidate_principal(member["id"])
+
         return updated_member
 
     async def check_business_number(self, business_number: str) -> dict: